@@ -1,12 +1,18 @@
 """
 Benchmark: compare original function vs class-based vs cached validators.
 
+``validate_query`` reuses a validator per table list, so repeated calls
+converge with the class. "Function (cold)" clears that registry before every
+call, which is what each call cost before; "Function (copy)" passes a fresh
+but equal list every time, as callers that re-read the table list do.
+
 Run with: python benchmarks/benchmark.py
 (Requires: pip install -e . from the project root first)
 """
 
 import time
 from sqldrift import validate_query, SchemaValidator, CachedSchemaValidator
+from sqldrift import validator as validator_module
 
 
 def bench(label: str, fn, iterations: int = 100) -> dict:
@@ -30,16 +36,23 @@ for scale in (100, 1_000, 4_000, 10_000):
     print(f"Scale: {scale:,} tables")
     print(f"{'='*70}")
 
+    def cold():
+        validator_module._registry.clear()
+        return validate_query(query, tables)
+
+    r0 = bench("Function (cold)", cold)
     r1 = bench("Function", lambda: validate_query(query, tables))
+    r1c = bench("Function (copy)", lambda: validate_query(query, list(tables)))
     validator = SchemaValidator(tables)
     r2 = bench("Class", lambda: validator.validate(query))
     cached = CachedSchemaValidator(tables, cache_size=128)
     r3 = bench("Cached", lambda: cached.validate(query))
 
-    print(f"  {'Method':<12} {'Avg (ms)':>10} {'Min (ms)':>10}")
-    print(f"  {'-'*34}")
-    for r in (r1, r2, r3):
-        print(f"  {r['label']:<12} {r['avg_ms']:>10.4f} {r['min_ms']:>10.4f}")
+    print(f"  {'Method':<16} {'Avg (ms)':>10} {'Min (ms)':>10}")
+    print(f"  {'-'*38}")
+    for r in (r0, r1, r1c, r2, r3):
+        print(f"  {r['label']:<16} {r['avg_ms']:>10.4f} {r['min_ms']:>10.4f}")
 
-    print(f"\n  Class speedup:  {r1['avg_ms']/r2['avg_ms']:.1f}x")
-    print(f"  Cached speedup: {r1['avg_ms']/r3['avg_ms']:.1f}x")
+    print(f"\n  Function vs class: {r1['avg_ms']/r2['avg_ms']:.2f}x the time")
+    print(f"  Class speedup:     {r0['avg_ms']/r2['avg_ms']:.1f}x vs cold function")
+    print(f"  Cached speedup:    {r0['avg_ms']/r3['avg_ms']:.1f}x vs cold function")
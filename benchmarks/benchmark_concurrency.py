@@ -0,0 +1,88 @@
+"""
+Benchmark: concurrent readers while a writer keeps refreshing the schema.
+
+Reader threads validate a query whose result depends on both the table map
+and the global column lookup while a writer flips the schema between two
+versions with ``update_schema`` and ``apply_changes``. Every result must
+match one of the two versions; a mix of both would be a torn read.
+
+Run with: python benchmarks/benchmark_concurrency.py [seconds] [num_tables]
+"""
+import sys
+import threading
+import time
+from sqldrift import ColumnValidator
+
+# ``hot.flag`` is checked against the table map, ``x_flag`` (no known FROM
+# table) against the global column lookup
+QUERY = "SELECT hot.flag, x_flag FROM nowhere"
+
+
+def generate_schema(num_tables, with_flags):
+    schema = {
+        f"table_{i}": {"columns": ["id", "name", f"col_{i}"]}
+        for i in range(num_tables)
+    }
+    columns = ["id", "flag", "x_flag"] if with_flags else ["id"]
+    schema["hot"] = {"columns": columns}
+    return schema
+
+
+def run(readers, seconds, num_tables):
+    schema_a = generate_schema(num_tables, True)
+    schema_b = generate_schema(num_tables, False)
+    validator = ColumnValidator(schema_a)
+    allowed = {
+        ColumnValidator(schema_a).validate(QUERY),
+        ColumnValidator(schema_b).validate(QUERY),
+    }
+
+    stop = threading.Event()
+    counts = [0] * readers
+    torn = [0] * readers
+    swaps = 0
+
+    def reader(slot):
+        while not stop.is_set():
+            if validator.validate(QUERY) not in allowed:
+                torn[slot] += 1
+            counts[slot] += 1
+
+    def writer():
+        nonlocal swaps
+        while not stop.is_set():
+            validator.apply_changes(dropped_columns={"hot": ["flag", "x_flag"]})
+            validator.apply_changes(
+                added_columns={"hot": {"columns": ["flag", "x_flag"]}}
+            )
+            validator.update_schema(schema_b)
+            validator.update_schema(schema_a)
+            swaps += 4
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    # With many threads the sleeper wakes late; use the real elapsed time
+    elapsed = time.perf_counter() - start
+    return sum(counts) / elapsed, swaps / elapsed, sum(torn)
+
+
+def run_benchmark():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    num_tables = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    print(f"Schema: {num_tables:,} tables, {seconds:.1f}s per run")
+    print("-" * 64)
+    print(f"  {'Readers':>8} {'Validations/s':>14} {'Swaps/s':>10} {'Torn reads':>11}")
+    for readers in (1, 8, 64):
+        rate, swap_rate, torn = run(readers, seconds, num_tables)
+        print(f"  {readers:>8} {rate:>14,.0f} {swap_rate:>10,.0f} {torn:>11}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
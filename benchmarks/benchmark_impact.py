@@ -0,0 +1,134 @@
+"""
+Benchmark: schema-change impact analysis over a logged query corpus.
+
+A query log of repeated warehouse-style queries (joins, CTEs, subqueries
+that differ only in their literals) is loaded into an ``ImpactIndex``. The
+benchmark reports the build cost, the file size and the latency of
+``impact_of`` for changes of increasing size. For comparison it times the
+alternative without an index: applying the change to a validator and
+re-validating every distinct query from compiled plans.
+
+Run with: python benchmarks/benchmark_impact.py [log_lines] [distinct_queries]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqldrift import ColumnValidator, ImpactIndex, compile
+
+
+TABLES = 2_000
+COLS = 25
+
+
+def generate_schema():
+    return {
+        f"table_{i}": {"columns": ["id"] + [f"col_{i}_{j}" for j in range(COLS - 1)]}
+        for i in range(TABLES)
+    }
+
+
+def generate_templates(num_templates, seed=5):
+    """Query templates with a ``{n}`` placeholder for their literal."""
+    rng = random.Random(seed)
+
+    def col(t):
+        return f"col_{t}_{rng.randrange(COLS - 1)}"
+
+    templates = []
+    for n in range(num_templates):
+        a, b, c = (rng.randrange(TABLES) for _ in range(3))
+        shape = n % 4
+        if shape == 0:
+            sql = f"SELECT id, {col(a)} FROM table_{a} WHERE {col(a)} > {{n}}"
+        elif shape == 1:
+            sql = (
+                f"SELECT x.{col(a)}, y.{col(b)} FROM table_{a} x "
+                f"JOIN table_{b} y ON x.id = y.id WHERE y.{col(b)} = '{{n}}'"
+            )
+        elif shape == 2:
+            sql = (
+                f"WITH recent AS (SELECT id, {col(a)} FROM table_{a} WHERE id > {{n}}) "
+                f"SELECT r.id, t.{col(b)} FROM recent r JOIN table_{b} t ON t.id = r.id"
+            )
+        else:
+            sql = (
+                f"SELECT {col(a)} FROM table_{a} WHERE id IN "
+                f"(SELECT id FROM table_{b} WHERE {col(b)} = {{n}}) "
+                f"AND {col(a)} IN (SELECT {col(c)} FROM table_{c})"
+            )
+        templates.append(sql)
+    return templates
+
+
+def generate_log(templates, num_lines, seed=7):
+    rng = random.Random(seed)
+    # Every query runs at least once; beyond that a few dashboard queries
+    # dominate, as in a real log
+    weights = [1 / (rank + 1) for rank in range(len(templates))]
+    drawn = rng.choices(templates, weights, k=max(num_lines - len(templates), 0))
+    for template in templates + drawn:
+        yield template.format(n=rng.randrange(1_000_000))
+
+
+def timed(fn, repeats=5):
+    """Best of ``repeats`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run_benchmark():
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    num_templates = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    templates = generate_templates(num_templates)
+    rng = random.Random(3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "impact.db")
+        index = ImpactIndex(path)
+        start = time.perf_counter()
+        index.add_many(generate_log(templates, num_lines))
+        build = time.perf_counter() - start
+        print(
+            f"Log: {num_lines:,} lines, {len(index):,} distinct queries, "
+            f"schema: {TABLES:,} tables x {COLS} columns"
+        )
+        print(
+            f"  build: {build:.1f}s ({build / num_lines * 1e6:.0f}µs per line), "
+            f"file: {os.path.getsize(path) / 1e6:.1f} MB"
+        )
+
+        # Without an index: re-validate every distinct query after the change
+        plans = [compile(sql.format(n=0)) for sql in templates]
+        schema = generate_schema()
+
+        print("-" * 72)
+        print(f"{'Change':<24} {'Affected':>9} {'impact_of':>12} {'Re-check plans':>15}")
+        for size in (1, 10, 100):
+            tables = rng.sample(range(TABLES), size)
+            dropped = {f"table_{t}": [f"col_{t}_{rng.randrange(COLS - 1)}"] for t in tables}
+            indexed_ms, hits = timed(lambda: index.impact_of(dropped_columns=dropped))
+
+            validator = ColumnValidator(schema)
+            validator.apply_changes(dropped_columns=dropped)
+            scan_ms, broken = timed(
+                lambda: [plan for plan in plans if not validator.is_valid(plan)]
+            )
+            # The index also reports queries whose unqualified references
+            # only might resolve to a dropped column
+            assert len(hits) >= len(broken)
+            print(
+                f"{f'drop {size} column(s)':<24} {len(hits):>9,} "
+                f"{indexed_ms:>10.2f}ms {scan_ms:>13.0f}ms"
+            )
+        index.close()
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,88 @@
+"""
+Benchmark: memory footprint of the default vs compact ColumnValidator backend.
+
+Measures the memory retained by a validator once the caller has dropped its
+own copy of the schema, plus lookup and validation latency for both backends.
+
+Run with: python benchmarks/benchmark_memory.py [num_tables] [cols_per_table]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from sqldrift import ColumnValidator
+
+
+def generate_schema(num_tables, cols_per_table):
+    common_cols = ["id", "created_at", "updated_at", "is_deleted", "name", "description"]
+    schema = {}
+    for i in range(num_tables):
+        columns = common_cols + [
+            f"col_{i}_{j}" for j in range(cols_per_table - len(common_cols))
+        ]
+        schema[f"table_{i}"] = {
+            "columns": columns,
+            "types": ["VARCHAR"] * len(columns),
+        }
+    return schema
+
+
+def retained_bytes(num_tables, cols_per_table, compact):
+    """Build a validator, drop the raw schema, and report what stays alive."""
+    # Build time is measured without tracemalloc, which slows allocation
+    schema = generate_schema(num_tables, cols_per_table)
+    start = time.perf_counter()
+    ColumnValidator(schema, compact=compact)
+    build = time.perf_counter() - start
+    del schema
+
+    gc.collect()
+    tracemalloc.start()
+    schema = generate_schema(num_tables, cols_per_table)
+    validator = ColumnValidator(schema, compact=compact)
+    del schema
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return validator, current, peak, build
+
+
+def run_benchmark():
+    num_tables = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    cols_per_table = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    print(f"Schema: {num_tables:,} tables x {cols_per_table} columns")
+    print("-" * 64)
+    print(f"  {'Backend':<10} {'Retained (MB)':>14} {'Peak (MB)':>10} {'Build (s)':>10}")
+
+    validators = {}
+    for label, compact in (("default", False), ("compact", True)):
+        validator, current, peak, build = retained_bytes(
+            num_tables, cols_per_table, compact
+        )
+        validators[label] = validator
+        print(
+            f"  {label:<10} {current / 2**20:>14.1f} {peak / 2**20:>10.1f} "
+            f"{build:>10.3f}"
+        )
+
+    print("-" * 64)
+    mid = num_tables // 2
+    query = f"SELECT t.id, t.col_{mid}_3 FROM table_{mid} t WHERE t.name = 'x'"
+    for label, validator in validators.items():
+        start = time.perf_counter()
+        for _ in range(10_000):
+            validator.column_exists(f"table_{mid}", f"col_{mid}_3")
+        exists_us = (time.perf_counter() - start) / 10_000 * 1e6
+
+        start = time.perf_counter()
+        for _ in range(200):
+            validator.validate(query)
+        validate_ms = (time.perf_counter() - start) / 200 * 1000
+        print(
+            f"  {label:<10} column_exists: {exists_us:.2f}us  "
+            f"validate: {validate_ms:.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
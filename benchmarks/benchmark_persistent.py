@@ -0,0 +1,75 @@
+"""
+Benchmark: cold start with and without the on-disk cache.
+
+Simulates a deploy: one process validates a working set of query shapes,
+then a fresh validator replays it -- once with an empty in-memory cache only,
+once backed by the SQLite file the first process filled.
+
+Run with: python benchmarks/benchmark_persistent.py [num_shapes]
+"""
+import os
+import sys
+import tempfile
+import time
+from sqldrift import CachedColumnValidator
+
+
+def generate_schema(num_tables=2000, cols_per_table=20):
+    return {
+        f"table_{i}": {"columns": ["id", "created_at"] + [
+            f"col_{i}_{j}" for j in range(cols_per_table - 2)
+        ]}
+        for i in range(num_tables)
+    }
+
+
+def generate_queries(num_shapes):
+    """Distinct query shapes, some of them with drift."""
+    queries = []
+    for i in range(num_shapes):
+        a, b = i % 2000, (i * 7) % 2000
+        col = f"col_{b}_{i % 18}" if i % 10 else f"colm_{b}_{i % 18}"
+        queries.append(
+            f"SELECT t1.id, t2.{col} FROM table_{a} t1 "
+            f"JOIN table_{b} t2 ON t1.id = t2.id WHERE t1.created_at > {i}"
+        )
+    return queries
+
+
+def replay(validator, queries):
+    """Return per-query latencies in microseconds."""
+    latencies = []
+    for sql in queries:
+        start = time.perf_counter()
+        validator.validate(sql)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return sorted(latencies)
+
+
+def run_benchmark():
+    num_shapes = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    schema = generate_schema()
+    queries = generate_queries(num_shapes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sqldrift-cache.db")
+        # The previous deploy fills the file
+        replay(CachedColumnValidator(schema, cache_path=path), queries)
+
+        print(f"Cold start over {num_shapes:,} query shapes")
+        print("-" * 56)
+        print(f"  {'Backend':<24} {'p50 (us)':>9} {'p99 (us)':>9} {'total (s)':>10}")
+        for label, validator in [
+            ("memory only", CachedColumnValidator(schema, cache_size=num_shapes)),
+            ("memory + disk", CachedColumnValidator(
+                schema, cache_size=num_shapes, cache_path=path
+            )),
+        ]:
+            latencies = replay(validator, queries)
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[int(len(latencies) * 0.99)]
+            print(f"  {label:<24} {p50:>9.0f} {p99:>9.0f} {sum(latencies) / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
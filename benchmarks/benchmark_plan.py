@@ -0,0 +1,120 @@
+"""
+Benchmark: re-validating a saved-query catalog after a schema refresh.
+
+A catalog of warehouse-style queries (joins, CTEs, subqueries) is validated
+against a schema, the schema changes, and the whole catalog is validated
+again. Re-validating the SQL parses every query again; re-validating plans
+compiled once with ``sqldrift.compile`` only checks their references.
+
+Reports the one-off compile cost, the pickled size of the plans, and the
+re-validation time of both approaches, extrapolated to a 300,000-query
+catalog.
+
+Run with: python benchmarks/benchmark_plan.py [num_queries] [num_tables]
+"""
+import pickle
+import random
+import sys
+import time
+
+from sqldrift import UnifiedValidator, compile
+
+
+COLS = 25
+CATALOG_SIZE = 300_000
+
+
+def generate_schema(num_tables):
+    return {
+        f"table_{i}": {"columns": ["id"] + [f"col_{i}_{j}" for j in range(COLS - 1)]}
+        for i in range(num_tables)
+    }
+
+
+def generate_catalog(num_queries, num_tables, seed=11):
+    rng = random.Random(seed)
+
+    def col(t):
+        return f"col_{t}_{rng.randrange(COLS - 1)}"
+
+    queries = []
+    for n in range(num_queries):
+        a, b, c = (rng.randrange(num_tables) for _ in range(3))
+        shape = n % 4
+        if shape == 0:
+            sql = f"SELECT id, {col(a)}, {col(a)} FROM table_{a} WHERE {col(a)} > {n}"
+        elif shape == 1:
+            sql = (
+                f"SELECT x.{col(a)}, y.{col(b)}, z.{col(c)} FROM table_{a} x "
+                f"JOIN table_{b} y ON x.id = y.id JOIN table_{c} z ON z.id = y.id "
+                f"WHERE y.{col(b)} = 'v{n}'"
+            )
+        elif shape == 2:
+            sql = (
+                f"WITH recent AS (SELECT id, {col(a)} FROM table_{a} WHERE id > {n}) "
+                f"SELECT r.id, t.{col(b)} FROM recent r JOIN table_{b} t ON t.id = r.id"
+            )
+        else:
+            sql = (
+                f"SELECT {col(a)} FROM table_{a} WHERE id IN "
+                f"(SELECT id FROM table_{b} WHERE {col(b)} IN "
+                f"(SELECT {col(c)} FROM table_{c}))"
+            )
+        queries.append(sql)
+    return queries
+
+
+def run_benchmark():
+    num_queries = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    num_tables = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    schema = generate_schema(num_tables)
+    catalog = generate_catalog(num_queries, num_tables)
+    validator = UnifiedValidator(schema)
+    print(
+        f"Catalog: {num_queries:,} queries, schema: {num_tables:,} tables x {COLS} columns"
+    )
+    print("-" * 72)
+
+    start = time.perf_counter()
+    plans = [compile(sql) for sql in catalog]
+    compile_time = time.perf_counter() - start
+    blob = pickle.dumps(plans)
+    print(f"  compile (once):       {compile_time:8.2f}s")
+    print(
+        f"  pickled plans:        {len(blob) / 1e6:8.2f} MB "
+        f"({len(blob) / num_queries:.0f} bytes/query)"
+    )
+    start = time.perf_counter()
+    plans = pickle.loads(blob)
+    print(f"  load plans:           {time.perf_counter() - start:8.2f}s")
+
+    # Schema refresh: drop a column from every tenth table
+    validator.apply_changes(
+        dropped_columns={
+            f"table_{i}": [f"col_{i}_0"] for i in range(0, num_tables, 10)
+        }
+    )
+
+    start = time.perf_counter()
+    by_sql = [validator.validate(sql) for sql in catalog]
+    sql_time = time.perf_counter() - start
+    start = time.perf_counter()
+    by_plan = [validator.validate(plan) for plan in plans]
+    plan_time = time.perf_counter() - start
+    assert by_sql == by_plan
+    broken = sum(1 for ok, _ in by_plan if not ok)
+
+    scale = CATALOG_SIZE / num_queries
+    print("-" * 72)
+    print(f"  Re-validation after the change ({broken:,} queries broken):")
+    print(f"  {'':<12} {'Catalog':>10} {'Per query':>12} {'300k queries':>14}")
+    for label, elapsed in (("SQL", sql_time), ("plans", plan_time)):
+        print(
+            f"  {label:<12} {elapsed:>9.2f}s {elapsed / num_queries * 1e6:>10.1f}µs "
+            f"{elapsed * scale:>13.1f}s"
+        )
+    print(f"  Speedup: {sql_time / plan_time:.0f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,105 @@
+"""
+Benchmark: cache hit rate of LRU vs W-TinyLFU under a Zipf-plus-scan trace.
+
+The trace mixes a skewed dashboard workload -- a few hundred query shapes
+drawn from a Zipf distribution -- with bursts of one-off exploration queries
+that are each seen once. Both policies replay the same trace through
+``ValidationCache``; a second pass replays a shorter trace through
+``CachedSchemaValidator`` to show the effect on wall time.
+
+Run with: python benchmarks/benchmark_policy.py [num_requests] [cache_size]
+"""
+import random
+import sys
+import time
+from sqldrift import CachedSchemaValidator
+from sqldrift.cache import ValidationCache
+from sqldrift.result import ValidationResult
+
+
+DASHBOARD_SHAPES = 500
+ZIPF_S = 1.0
+BURST_EVERY = 2_000      # requests between exploration bursts
+BURST_LENGTH = 600       # one-off queries per burst
+
+
+def dashboard_query(i):
+    return (
+        f"SELECT d{i}.id, d{i}.total FROM dash_{i} d{i} "
+        f"WHERE d{i}.day = 1 ORDER BY d{i}.total"
+    )
+
+
+def generate_trace(num_requests, seed=7):
+    """Return ``(sql, is_dashboard)`` pairs."""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** ZIPF_S) for rank in range(1, DASHBOARD_SHAPES + 1)]
+    dashboards = rng.choices(range(DASHBOARD_SHAPES), weights, k=num_requests)
+    trace = []
+    one_off = 0
+    for n, i in enumerate(dashboards):
+        if n and n % BURST_EVERY == 0:
+            for _ in range(BURST_LENGTH):
+                trace.append((f"SELECT col_{one_off} FROM explore_{one_off}", False))
+                one_off += 1
+        trace.append((dashboard_query(i), True))
+    return trace
+
+
+def replay(policy, trace, cache_size):
+    cache = ValidationCache(cache_size, use_fingerprint=False, policy=policy)
+    result = (ValidationResult(True, "Query is safe to execute."), None)
+    dashboard_hits = dashboard_total = 0
+    for sql, is_dashboard in trace:
+        before = cache.exact_hits + cache.fingerprint_hits
+        cache.get_or_compute(sql, None, lambda: result)
+        if is_dashboard:
+            dashboard_total += 1
+            dashboard_hits += cache.exact_hits + cache.fingerprint_hits - before
+    info = cache.info()
+    return info, dashboard_hits / dashboard_total
+
+
+def run_benchmark():
+    num_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cache_size = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    trace = generate_trace(num_requests)
+    scans = sum(1 for _, is_dashboard in trace if not is_dashboard)
+
+    print(
+        f"Trace: {len(trace):,} requests ({DASHBOARD_SHAPES} Zipf dashboard shapes, "
+        f"{scans:,} one-off queries), cache_size={cache_size}"
+    )
+    print("-" * 72)
+    print(
+        f"  {'Policy':<8} {'Hit rate':>9} {'Dashboard hits':>15} "
+        f"{'Admissions':>11} {'Rejections':>11} {'Time (ms)':>10}"
+    )
+    for policy in ("lru", "tinylfu"):
+        start = time.perf_counter()
+        info, dashboard_rate = replay(policy, trace, cache_size)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(
+            f"  {policy:<8} {info['hit_rate']:>9.1%} {dashboard_rate:>15.1%} "
+            f"{info['admissions']:>11,} {info['rejections']:>11,} {elapsed:>10.0f}"
+        )
+
+    # End to end: misses pay for parsing and validation
+    short = trace[:20_000]
+    tables = [f"dash_{i}" for i in range(DASHBOARD_SHAPES)]
+    print("-" * 72)
+    print(f"  CachedSchemaValidator over the first {len(short):,} requests:")
+    for policy in ("lru", "tinylfu"):
+        validator = CachedSchemaValidator(
+            tables, cache_size=cache_size, cache_policy=policy
+        )
+        start = time.perf_counter()
+        for sql, _ in short:
+            validator.validate(sql)
+        elapsed = time.perf_counter() - start
+        hit_rate = validator.get_cache_info()["hit_rate"]
+        print(f"  {policy:<8} {hit_rate:>9.1%} {elapsed:>10.2f}s")
+
+
+if __name__ == "__main__":
+    run_benchmark()
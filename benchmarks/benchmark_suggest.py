@@ -0,0 +1,153 @@
+"""
+Benchmark: "did you mean" suggestions on the failure path.
+
+Compares the trigram index behind ``SchemaValidator.suggest_tables`` and
+``ColumnValidator.suggest_alternatives`` with the linear scans they
+replaced, and times ``validate`` and the fail-fast ``is_valid`` for queries
+that reference hallucinated tables and columns.
+
+Run with: python benchmarks/benchmark_suggest.py [num_tables] [cols_per_table]
+"""
+import sys
+import time
+from sqldrift import ColumnValidator, SchemaValidator
+
+
+MISSING = ["stg_custmer_orders", "user_sessoins", "fct_invoice_line_items", "zzz_tmp"]
+
+
+PREFIXES = ["stg", "raw", "dim", "fct", "int", "rpt", "tmp", "src", "mart", "ods"]
+DOMAINS = ["customer", "user", "invoice", "product", "shipment", "payment",
+           "campaign", "account", "vendor", "ledger", "inventory", "session",
+           "contract", "ticket", "employee", "warehouse", "refund", "coupon",
+           "region", "device"]
+ENTITIES = ["orders", "sessions", "lines", "events", "history", "snapshots",
+            "methods", "items", "balances", "contacts", "logs", "metrics",
+            "targets", "mappings", "statuses", "details", "summaries",
+            "transfers", "audits", "attributes", "scores", "segments",
+            "notes", "rates", "limits"]
+
+
+def generate_tables(num_tables):
+    """Warehouse-style names: ``<layer>_<domain>_<entity>[_vN]``."""
+    names = []
+    version = 0
+    while len(names) < num_tables:
+        suffix = f"_v{version}" if version else ""
+        for layer in PREFIXES:
+            for domain in DOMAINS:
+                for entity in ENTITIES:
+                    names.append(f"{layer}_{domain}_{entity}{suffix}")
+        version += 1
+    return names[:num_tables]
+
+
+MISSING_COLUMNS = ["cust_name", "ordr_date", "shipment_stauts", "zzz_tmp"]
+ATTRIBUTES = ["customer", "order", "shipment", "invoice", "product", "account",
+              "region", "vendor", "payment", "session", "device", "campaign"]
+QUALIFIERS = ["id", "name", "date", "status", "amount", "code", "type",
+              "count", "created_at", "updated_at", "key", "total"]
+
+
+def generate_columns(num_tables, cols_per_table):
+    """Give each table a varying mix of ``<attribute>_<qualifier>`` columns."""
+    pool = [f"{a}_{q}" for a in ATTRIBUTES for q in QUALIFIERS]
+    pool += [f"{name}_{n}" for name in pool for n in range(1, 8)]
+    return {
+        table: {
+            "columns": [
+                pool[(i * 7919 + j * 104729) % len(pool)]
+                for j in range(cols_per_table)
+            ]
+        }
+        for i, table in enumerate(generate_tables(num_tables))
+    }
+
+
+def linear_column_scan(validator, column):
+    """The pre-index implementation: substring scan over every column."""
+    return [
+        f"{table}.{col}"
+        for table, col in validator._iter_raw_columns(validator._state)
+        if column in col.lower() or col.lower() in column
+    ]
+
+
+def linear_scan(name, candidates):
+    """The pre-index implementation: scan every table per missing name."""
+    suggestions = []
+    for candidate in candidates:
+        if name in candidate or candidate in name:
+            suggestions.append(candidate)
+        elif name[:3] == candidate[:3] and len(name) >= 3:
+            suggestions.append(candidate)
+    return suggestions[:5]
+
+
+def per_call_us(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run_benchmark():
+    num_tables = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    tables = generate_tables(num_tables)
+    validator = SchemaValidator(tables)
+
+    start = time.perf_counter()
+    validator._state.index()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Schema: {num_tables:,} tables (index built in {build_ms:.1f}ms)")
+    print("-" * 64)
+    print(f"  {'Missing name':<20} {'Scan (us)':>10} {'Index (us)':>11}  Top match")
+    for name in MISSING:
+        scan = per_call_us(lambda: linear_scan(name, sorted(tables)), 20)
+        index = per_call_us(lambda: validator.suggest_tables(name), 200)
+        top = (validator.suggest_tables(name) or ["-"])[0]
+        print(f"  {name:<20} {scan:>10.0f} {index:>11.0f}  {top}")
+
+    print("-" * 64)
+    hit = validator.validate(f"SELECT * FROM {tables[0]}")
+    assert hit[0]
+    valid = per_call_us(lambda: validator.validate(f"SELECT * FROM {tables[0]}"), 200)
+    drift = per_call_us(lambda: validator.validate("SELECT * FROM user_sessoins"), 200)
+    gate_valid = per_call_us(lambda: validator.is_valid(f"SELECT * FROM {tables[0]}"), 200)
+    gate_drift = per_call_us(lambda: validator.is_valid("SELECT * FROM user_sessoins"), 200)
+    print(f"  validate, table exists:  {valid:>8.0f}us")
+    print(f"  validate, table missing: {drift:>8.0f}us")
+    print(f"  is_valid, table exists:  {gate_valid:>8.0f}us")
+    print(f"  is_valid, table missing: {gate_drift:>8.0f}us")
+
+    cols_per_table = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    columns = ColumnValidator(generate_columns(num_tables, cols_per_table))
+    start = time.perf_counter()
+    columns._state.suggester()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print()
+    print(
+        f"Schema: {num_tables * cols_per_table:,} columns "
+        f"(index built in {build_ms:.1f}ms)"
+    )
+    print("-" * 64)
+    print(f"  {'Missing column':<20} {'Scan (us)':>10} {'Index (us)':>11}  Top match")
+    for name in MISSING_COLUMNS:
+        scan = per_call_us(lambda: linear_column_scan(columns, name), 5)
+        index = per_call_us(lambda: columns.suggest_alternatives(name), 50)
+        top = (columns.suggest_alternatives(name) or ["-"])[0]
+        print(f"  {name:<20} {scan:>10.0f} {index:>11.0f}  {top}")
+
+    print("-" * 64)
+    table = tables[0]
+    query = f"SELECT customer_nme, order_date FROM {table}"
+    drift = per_call_us(lambda: columns.validate(query), 50)
+    gate = per_call_us(lambda: columns.is_valid(query), 50)
+    print(f"  validate, column missing: {drift:>8.0f}us")
+    print(f"  is_valid, column missing: {gate:>8.0f}us")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,150 @@
+"""
+Benchmark: single-pass reference collection vs one ``find_all`` per kind.
+
+``ColumnValidator`` used to walk the parsed tree once with
+``find_all(exp.Table)`` and again with ``find_all(exp.Column)``, and
+``extract_columns`` repeated both walks after parsing the query a second
+time. ``sqldrift.references.collect_references`` visits every node once.
+
+Two query shapes stress the traversal: a 20-way join with qualified columns
+in the SELECT list and every ON clause, and subqueries nested 20 deep. For
+each, the benchmark times:
+
+- the traversal alone, on an already parsed expression;
+- collecting and resolving the references, as ``ColumnValidator`` did
+  before and does now;
+- validating a query and extracting its columns, the old way (``validate``
+  then ``extract_columns``, two parses and four walks) and the new way
+  (``validate_result(..., keep_ast=True)``, one parse and one walk).
+
+Run with: python benchmarks/benchmark_walk.py [iterations]
+"""
+import sys
+import time
+
+import sqlglot
+from sqlglot import exp
+from sqldrift import ColumnValidator
+from sqldrift.references import collect_references
+
+
+JOINS = 20
+DEPTH = 20
+
+
+def wide_join(n=JOINS):
+    select = ", ".join(f"t{i}.c{i}, t{i}.id" for i in range(n))
+    joins = " ".join(
+        f"JOIN table_{i} t{i} ON t{i}.id = t{i - 1}.id AND t{i}.c{i} > 0"
+        for i in range(1, n)
+    )
+    return f"SELECT {select} FROM table_0 t0 {joins} WHERE t0.c0 = 1"
+
+
+def nested(depth=DEPTH):
+    sql = "SELECT id, c0 FROM table_0 WHERE c0 > 0"
+    for i in range(depth):
+        sql = (
+            f"SELECT s{i}.id, s{i}.c0 FROM ({sql}) AS s{i} "
+            f"WHERE s{i}.id IN (SELECT id FROM table_{i % JOINS} WHERE c{i % JOINS} = 1)"
+        )
+    return sql
+
+
+def two_walks(expression):
+    """The traversal ``ColumnValidator`` used before."""
+    tables = [(t.name, t.alias) for t in expression.find_all(exp.Table)]
+    columns = [(c.table, c.name) for c in expression.find_all(exp.Column)]
+    return tables, columns
+
+
+def old_collect_refs(validator, expression):
+    """``ColumnValidator._collect_refs`` as it was, with one walk per kind."""
+    normalize = validator._normalize
+    alias_map, from_tables = {}, set()
+    for table in expression.find_all(exp.Table):
+        real_name = normalize(table.name)
+        if table.alias:
+            alias_map[normalize(table.alias)] = real_name
+        from_tables.add(real_name)
+    columns, seen = [], set()
+    for col in expression.find_all(exp.Column):
+        ref = col.table
+        if ref:
+            ref = alias_map.get(normalize(ref), normalize(ref))
+        key = (ref or None, normalize(col.name))
+        if key not in seen:
+            seen.add(key)
+            columns.append(key)
+    return from_tables, columns
+
+
+def old_validate_and_extract(validator, sql):
+    """``validate`` then ``extract_columns``: two parses, four walks."""
+    expression = sqlglot.parse_one(sql)
+    validator._check_columns(
+        *old_collect_refs(validator, expression), validator._state
+    )
+    return old_collect_refs(validator, sqlglot.parse_one(sql))[1]
+
+
+def timed(fn, iterations, repeats=5):
+    """Best average over ``repeats`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1000
+
+
+def run_benchmark():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    schema = {
+        f"table_{i}": {"columns": ["id"] + [f"c{j}" for j in range(JOINS)]}
+        for i in range(JOINS)
+    }
+    validator = ColumnValidator(schema)
+
+    print(
+        f"{'Query':<14} {'Nodes':>6} {'Step':<22} "
+        f"{'Before (ms)':>12} {'After (ms)':>11} {'Speedup':>8}"
+    )
+    print("-" * 78)
+    for label, sql in (("20-way join", wide_join()), ("20-deep nest", nested())):
+        expression = sqlglot.parse_one(sql)
+        nodes = sum(1 for _ in expression.walk())
+        assert validator.validate(sql)[0], label
+        assert old_collect_refs(validator, expression) == validator._collect_refs(
+            expression
+        ), label
+
+        rows = [
+            (
+                "traversal",
+                timed(lambda: two_walks(expression), iterations),
+                timed(lambda: collect_references(expression), iterations),
+            ),
+            (
+                "collect + resolve refs",
+                timed(lambda: old_collect_refs(validator, expression), iterations),
+                timed(lambda: validator._collect_refs(expression), iterations),
+            ),
+            (
+                "validate + extract",
+                timed(lambda: old_validate_and_extract(validator, sql), iterations),
+                timed(
+                    lambda: validator.validate_result(sql, keep_ast=True), iterations
+                ),
+            ),
+        ]
+        for step, before, after in rows:
+            print(
+                f"{label:<14} {nodes:>6} {step:<22} {before:>12.3f} "
+                f"{after:>11.3f} {before / after:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -10,6 +10,11 @@ __version__ = "0.1.5"
 from sqldrift.validator import validate_query
 from sqldrift.optimized import SchemaValidator, CachedSchemaValidator
 from sqldrift.column_validator import ColumnValidator, CachedColumnValidator
+from sqldrift.unified import UnifiedValidator
+from sqldrift.result import ValidationResult, MissingTable, MissingColumn
+from sqldrift.stream import iter_validate
+from sqldrift.plan import ReferencePlan, compile
+from sqldrift.impact import ImpactIndex
 
 __all__ = [
     "validate_query",
@@ -17,5 +22,13 @@ __all__ = [
     "CachedSchemaValidator",
     "ColumnValidator",
     "CachedColumnValidator",
+    "UnifiedValidator",
+    "ValidationResult",
+    "MissingTable",
+    "MissingColumn",
+    "iter_validate",
+    "ReferencePlan",
+    "compile",
+    "ImpactIndex",
 ]
 
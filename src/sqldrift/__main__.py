@@ -0,0 +1,7 @@
+"""Allow ``python -m sqldrift`` as an alias for the ``sqldrift`` command."""
+
+import sys
+
+from sqldrift.cli import main
+
+sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Batch validation over a process pool.
+
+``validate`` is bound by sqlglot parsing, which holds the GIL, so large
+re-validation jobs only scale across processes. ``validate_many`` collapses
+identical and fingerprint-equal queries first, then shards the distinct
+queries across a ``ProcessPoolExecutor``. The validator -- including its
+already-normalized lookups -- is pickled once per worker through the pool
+initializer rather than once per task. Column validators go further: their
+index is placed in shared memory once, and workers attach to that one copy
+instead of unpickling their own.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Hashable, Iterable, Iterator, Optional
+
+from sqldrift.cache import _is_shareable
+from sqldrift.fingerprint import fingerprint
+
+
+# Validator installed in each worker process by ``_init_worker``
+_worker_validator: Any = None
+
+
+def _init_worker(validator: Any) -> None:
+    """Pool initializer: keep the shipped validator for the worker's lifetime."""
+    global _worker_validator
+    _worker_validator = validator
+
+
+@contextmanager
+def _shipped(validator: Any) -> Iterator[Any]:
+    """
+    Yield the validator to hand to a pool initializer.
+
+    Validators with a ``_share`` method get their schema index placed in
+    shared memory for the lifetime of the block; the blocks are released on
+    exit. If shared memory is unavailable the validator is shipped as is.
+    """
+    share = getattr(validator, "_share", None)
+    blocks = []
+    shipped = validator
+    if share is not None:
+        try:
+            shipped, blocks = share()
+        except OSError:
+            shipped = validator
+    try:
+        yield shipped
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _validate_chunk(
+    chunk: list[str], dialect: Optional[str]
+) -> list[tuple[bool, str]]:
+    """Validate a chunk of queries with the worker's validator."""
+    return [_worker_validator.validate(sql, dialect=dialect) for sql in chunk]
+
+
+def _run(
+    validator: Any,
+    queries: list[str],
+    dialect: Optional[str],
+    workers: int,
+    chunksize: int,
+) -> list[tuple[bool, str]]:
+    """Validate distinct queries inline or across a process pool."""
+    if workers <= 1 or len(queries) <= 1:
+        return [validator.validate(sql, dialect=dialect) for sql in queries]
+
+    chunks = [
+        queries[i:i + chunksize] for i in range(0, len(queries), chunksize)
+    ]
+    results: list[tuple[bool, str]] = []
+    with _shipped(validator) as shipped, ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        initializer=_init_worker,
+        initargs=(shipped,),
+    ) as pool:
+        for chunk_results in pool.map(
+            _validate_chunk, chunks, [dialect] * len(chunks)
+        ):
+            results.extend(chunk_results)
+    return results
+
+
+def validate_many(
+    validator: Any,
+    queries: Iterable[str],
+    *,
+    dialect: Optional[str] = None,
+    workers: Optional[int] = 1,
+    chunksize: int = 256,
+) -> list[tuple[bool, str]]:
+    """
+    Validate many queries, returning results in input order.
+
+    Identical queries are validated once, as are queries with the same
+    literal-insensitive fingerprint. Parse errors quote the offending SQL,
+    so a fingerprint group whose representative fails to parse has its
+    remaining distinct queries validated individually.
+
+    Args:
+        validator: A ``SchemaValidator`` or ``ColumnValidator`` (or subclass).
+        queries: SQL query strings to validate.
+        dialect: Optional SQL dialect for parsing.
+        workers: Number of worker processes. ``1`` validates inline;
+            ``None`` uses ``os.cpu_count()``. Defaults to ``1``.
+        chunksize: Number of queries sent to a worker per task.
+            Defaults to ``256``.
+
+    Returns:
+        A list of ``(success, message)`` tuples, one per input query.
+    """
+    queries = list(queries)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # ----- Deduplicate: raw SQL first, then fingerprint -----
+    # Case is folded only for validators that ignore it
+    case_sensitive = getattr(validator, "case_sensitive", True)
+    group_of: dict[str, Hashable] = {}
+    members: dict[Hashable, list[str]] = {}
+    for sql in queries:
+        if sql in group_of:
+            continue
+        fp = fingerprint(sql, dialect, case_sensitive=case_sensitive)
+        key: Hashable = ("fp", fp) if fp is not None else ("sql", sql)
+        group_of[sql] = key
+        members.setdefault(key, []).append(sql)
+
+    representatives = [group[0] for group in members.values()]
+    by_sql: dict[str, tuple[bool, str]] = dict(
+        zip(
+            representatives,
+            _run(validator, representatives, dialect, workers, chunksize),
+        )
+    )
+
+    # ----- Parse errors are not shared across a fingerprint -----
+    retry: list[str] = []
+    for group in members.values():
+        if len(group) > 1 and not _is_shareable(by_sql[group[0]]):
+            retry.extend(group[1:])
+    if retry:
+        by_sql.update(
+            zip(retry, _run(validator, retry, dialect, workers, chunksize))
+        )
+
+    result_of_group = {
+        key: by_sql[group[0]] for key, group in members.items()
+    }
+    return [
+        by_sql.get(sql) or result_of_group[group_of[sql]] for sql in queries
+    ]
@@ -0,0 +1,451 @@
+"""
+Query-shape cache shared by the cached validators.
+
+Results are keyed on the query fingerprint (see ``sqldrift.fingerprint``)
+rather than the raw SQL string, so queries that differ only in literals,
+comments or whitespace share one entry. A small side table maps raw SQL
+strings to their fingerprint so that exact repeats skip tokenizing entirely.
+
+Each entry also records the tables and columns its result depends on, so a
+schema update only evicts the entries that touch a changed object instead of
+throwing the whole cache away.
+
+Which entries are kept is decided by a pluggable policy (see
+``sqldrift.policy``): plain LRU, or W-TinyLFU for workloads where bursts of
+one-off queries would otherwise flush the hot entries. An optional second
+level (see ``sqldrift.persistent``) is consulted on a miss, before the
+result is computed.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Optional, Union
+
+from sqldrift.fingerprint import fingerprint
+from sqldrift.policy import make_policy
+from sqldrift.result import ValidationResult
+
+if TYPE_CHECKING:
+    from sqldrift.persistent import PersistentCache
+
+
+# Tables and columns a cached result depends on, or ``None`` if it depends
+# on the whole schema (e.g. drift messages listing every available table).
+Dependencies = Optional[tuple[frozenset[str], frozenset[str]]]
+
+
+# Sentinel returned by ``ValidationCache._exact_hit`` when a query is not cached
+_MISSING = object()
+
+
+class _Flight:
+    """An in-progress computation other callers can wait on."""
+
+    __slots__ = ("sql_query", "future")
+
+    def __init__(self, sql_query: str):
+        self.sql_query = sql_query
+        self.future: Future = Future()
+
+
+def _is_shareable(result: Union[ValidationResult, tuple[bool, str]]) -> bool:
+    """
+    Return ``True`` if a result may be shared across a fingerprint.
+
+    Parse errors embed a snippet of the offending SQL in their message, so
+    they are only ever cached under the exact query text.
+    """
+    if isinstance(result, ValidationResult):
+        return result.shareable
+    success, message = result
+    return success or not message.startswith("Invalid SQL syntax")
+
+
+class ValidationCache:
+    """
+    Bounded cache of validation results keyed by query fingerprint.
+
+    Args:
+        maxsize: Maximum number of results to keep. ``None`` means
+            unbounded; ``0`` disables caching.
+        use_fingerprint: If ``False``, key on the raw SQL string only.
+            Defaults to ``True``.
+        case_sensitive: Whether the owning validator matches names
+            case-sensitively. A case-insensitive validator's queries that
+            differ only in case share a fingerprint. Defaults to ``True``.
+        policy: Eviction policy, ``"lru"`` or ``"tinylfu"``.
+            Defaults to ``"lru"``.
+        store: Optional on-disk cache consulted on a miss before computing,
+            and filled with computed results.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        *,
+        use_fingerprint: bool = True,
+        case_sensitive: bool = True,
+        store: Optional["PersistentCache"] = None,
+        policy: str = "lru",
+    ):
+        self.maxsize = maxsize
+        self.use_fingerprint = use_fingerprint
+        self.case_sensitive = case_sensitive
+        self.store = store
+        self.policy = policy
+        # Entry order and eviction are owned by the policy
+        self._entries: dict[Hashable, Any] = {}
+        self._policy = make_policy(policy, maxsize)
+        self._keys: OrderedDict[tuple[str, Optional[str]], Hashable] = OrderedDict()
+        # key -> raw SQL strings mapped to it, dropped with the entry so
+        # evicted one-off queries do not crowd out hot exact mappings
+        self._exact_of: dict[Hashable, dict[tuple[str, Optional[str]], None]] = {}
+        self._lock = threading.Lock()
+
+        # Reverse dependency index used for selective invalidation
+        self._deps: dict[Hashable, Dependencies] = {}
+        self._by_table: dict[str, set[Hashable]] = {}
+        self._by_column: dict[str, set[Hashable]] = {}
+        self._schema_wide: set[Hashable] = set()
+        # Bumped on invalidation so results computed against an older
+        # schema are not stored after the fact
+        self._generation = 0
+
+        # In-flight computations for single-flight coalescing
+        self._pending: dict[Hashable, _Flight] = {}
+        self._async_pending: dict[Hashable, Any] = {}
+
+        self.exact_hits = 0
+        self.fingerprint_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.coalesced = 0
+
+    def __getstate__(self) -> dict:
+        # Entries and the lock stay behind; a pickled cache (e.g. one shipped
+        # to a worker process) starts empty with the same configuration.
+        return {
+            "maxsize": self.maxsize,
+            "use_fingerprint": self.use_fingerprint,
+            "case_sensitive": self.case_sensitive,
+            "store": self.store,
+            "policy": self.policy,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(
+            state["maxsize"],
+            use_fingerprint=state["use_fingerprint"],
+            case_sensitive=state["case_sensitive"],
+            store=state["store"],
+            policy=state["policy"],
+        )
+
+    def get_or_compute(
+        self,
+        sql_query: str,
+        dialect: Optional[str],
+        compute: Callable[[], tuple[Any, Dependencies]],
+    ) -> Any:
+        """
+        Return the cached result for a query, computing it on a miss.
+
+        Args:
+            sql_query: The raw SQL query string.
+            dialect: SQL dialect the query is parsed with.
+            compute: Zero-argument callable returning ``(result, deps)`` on
+                a miss, where ``deps`` is a ``(tables, columns)`` pair of
+                frozensets or ``None`` for a schema-wide dependency.
+        """
+        exact = (sql_query, dialect)
+
+        with self._lock:
+            hit = self._exact_hit(exact)
+        if hit is not _MISSING:
+            return hit
+
+        key = self._key_for(sql_query, dialect)
+
+        with self._lock:
+            if key in self._entries:
+                self._policy.touch(key)
+                self._remember(exact, key)
+                self.fingerprint_hits += 1
+                return self._entries[key]
+
+            # Single-flight: concurrent misses on one key wait for the
+            # first caller's computation instead of repeating it
+            flight = self._pending.get(key)
+            if flight is None:
+                flight = self._pending[key] = _Flight(sql_query)
+                self.misses += 1
+                generation = self._generation
+                owner = True
+            else:
+                self.coalesced += 1
+                owner = False
+
+        if not owner:
+            result, shareable = flight.future.result()
+            if shareable or flight.sql_query == sql_query:
+                return result
+            # A parse error quotes its own SQL; compute ours separately
+            return compute()[0]
+
+        try:
+            if self.store is None:
+                result, deps = compute()
+            else:
+                result, deps = self.store.get_or_compute(key, compute)
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            flight.future.set_exception(e)
+            raise
+
+        shareable = _is_shareable(result)
+        store_key = key if shareable else ("sql", sql_query, dialect)
+        with self._lock:
+            del self._pending[key]
+            if generation == self._generation:
+                self._store(store_key, result, deps)
+                if store_key in self._entries:
+                    self._remember(exact, store_key)
+        flight.future.set_result((result, shareable))
+
+        return result
+
+    async def aget_or_compute(
+        self,
+        sql_query: str,
+        dialect: Optional[str],
+        compute: Callable[[], tuple[Any, Dependencies]],
+        executor: Optional[Executor] = None,
+    ) -> Any:
+        """
+        Async counterpart of ``get_or_compute`` that never parses on the loop.
+
+        Exact hits are answered inline. Anything else -- fingerprinting,
+        parsing and validation -- runs in ``executor`` (the loop's default
+        executor if ``None``). Concurrent awaits of the same query on one
+        loop share a single in-flight computation.
+
+        Args:
+            sql_query: The raw SQL query string.
+            dialect: SQL dialect the query is parsed with.
+            compute: Zero-argument callable returning ``(result, deps)``.
+            executor: A thread-based ``concurrent.futures.Executor``.
+        """
+        # Imported lazily: asyncio is a noticeable share of import time for
+        # short-lived CLI runs that never await anything
+        import asyncio
+
+        with self._lock:
+            hit = self._exact_hit((sql_query, dialect))
+        if hit is not _MISSING:
+            return hit
+
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, sql_query, dialect)
+        pending = self._async_pending.get(flight_key)
+        if pending is None:
+            pending = loop.run_in_executor(
+                executor, self.get_or_compute, sql_query, dialect, compute
+            )
+            self._async_pending[flight_key] = pending
+            pending.add_done_callback(
+                lambda _: self._async_pending.pop(flight_key, None)
+            )
+        else:
+            with self._lock:
+                self.coalesced += 1
+
+        # Shield so one cancelled caller does not cancel the shared flight
+        return await asyncio.shield(pending)
+
+    def _exact_hit(self, exact: tuple[str, Optional[str]]) -> Any:
+        """Return the entry for a previously seen SQL string, or ``_MISSING``."""
+        key = self._keys.get(exact)
+        if key is not None and key in self._entries:
+            self._keys.move_to_end(exact)
+            self._policy.touch(key)
+            self.exact_hits += 1
+            return self._entries[key]
+        return _MISSING
+
+    def _key_for(self, sql_query: str, dialect: Optional[str]) -> Hashable:
+        """Build the cache key for a query."""
+        if self.use_fingerprint:
+            fp = fingerprint(
+                sql_query, dialect, case_sensitive=self.case_sensitive
+            )
+            if fp is not None:
+                return ("fp", fp, dialect)
+        return ("sql", sql_query, dialect)
+
+    def _store(self, key: Hashable, result: Any, deps: Dependencies) -> None:
+        """Insert a result, evicting the entries the policy gives up."""
+        if self.maxsize == 0:
+            return
+        if key in self._entries:
+            self._unindex(key)
+            self._entries[key] = result
+            self._index(key, deps)
+            self._policy.touch(key)
+            return
+        self._entries[key] = result
+        self._index(key, deps)
+        for evicted in self._policy.admit(key):
+            self._drop(evicted)
+
+    def _drop(self, key: Hashable) -> None:
+        """Remove an entry and the raw SQL strings mapped to it."""
+        self._entries.pop(key, None)
+        self._unindex(key)
+        for exact in self._exact_of.pop(key, ()):
+            self._keys.pop(exact, None)
+
+    def _index(self, key: Hashable, deps: Dependencies) -> None:
+        """Add an entry to the reverse dependency index."""
+        self._deps[key] = deps
+        if deps is None:
+            self._schema_wide.add(key)
+            return
+        tables, columns = deps
+        for table in tables:
+            self._by_table.setdefault(table, set()).add(key)
+        for column in columns:
+            self._by_column.setdefault(column, set()).add(key)
+
+    def _unindex(self, key: Hashable) -> None:
+        """Remove an entry from the reverse dependency index."""
+        deps = self._deps.pop(key, None)
+        if deps is None:
+            self._schema_wide.discard(key)
+            return
+        tables, columns = deps
+        for index, names in ((self._by_table, tables), (self._by_column, columns)):
+            for name in names:
+                keys = index.get(name)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[name]
+
+    def invalidate(
+        self,
+        tables: Iterable[str] = (),
+        columns: Iterable[str] = (),
+    ) -> int:
+        """
+        Evict the entries that depend on changed tables or columns.
+
+        Entries with a schema-wide dependency are evicted whenever anything
+        changed. If nothing changed, nothing is evicted.
+
+        Args:
+            tables: Normalized names of tables that were added, dropped or
+                whose columns changed.
+            columns: Normalized names of columns that were added to or
+                dropped from the schema as a whole.
+
+        Returns:
+            The number of evicted entries.
+        """
+        tables = set(tables)
+        columns = set(columns)
+        if not tables and not columns:
+            return 0
+
+        with self._lock:
+            stale = set(self._schema_wide)
+            for table in tables:
+                stale.update(self._by_table.get(table, ()))
+            for column in columns:
+                stale.update(self._by_column.get(column, ()))
+
+            for key in stale:
+                self._policy.discard(key)
+                self._drop(key)
+
+            self._generation += 1
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def _remember(self, exact: tuple[str, Optional[str]], key: Hashable) -> None:
+        """Record the raw SQL -> key mapping used by exact hits."""
+        if self.maxsize == 0:
+            return
+        previous = self._keys.get(exact)
+        if previous is not None and previous != key:
+            self._exact_of.get(previous, {}).pop(exact, None)
+        self._keys[exact] = key
+        self._keys.move_to_end(exact)
+        self._exact_of.setdefault(key, {})[exact] = None
+        if self.maxsize is not None:
+            while len(self._keys) > self.maxsize:
+                old, old_key = self._keys.popitem(last=False)
+                mapped = self._exact_of.get(old_key)
+                if mapped is not None:
+                    mapped.pop(old, None)
+                    if not mapped:
+                        del self._exact_of[old_key]
+
+    def clear(self) -> None:
+        """Drop all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._policy.clear()
+            self._keys.clear()
+            self._exact_of.clear()
+            self._deps.clear()
+            self._by_table.clear()
+            self._by_column.clear()
+            self._schema_wide.clear()
+            self._generation += 1
+            self.exact_hits = 0
+            self.fingerprint_hits = 0
+            self.misses = 0
+            self.invalidations = 0
+            self.coalesced = 0
+
+    def info(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            A dictionary with keys: ``hits``, ``exact_hits``,
+            ``fingerprint_hits``, ``misses``, ``coalesced``,
+            ``invalidations``, ``size``, ``maxsize``, ``hit_rate``,
+            ``policy``, ``admissions``, ``rejections``.
+            ``coalesced`` counts calls that waited on an identical in-flight
+            computation instead of repeating it. ``admissions`` counts
+            results the policy let into the cache and ``rejections`` those
+            it turned away in favour of more frequently used entries. With a ``store``,
+            ``disk_hits`` and ``disk_misses`` count lookups of in-memory
+            misses in it.
+        """
+        hits = self.exact_hits + self.fingerprint_hits
+        info = {
+            "hits": hits,
+            "exact_hits": self.exact_hits,
+            "fingerprint_hits": self.fingerprint_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_rate": (
+                hits / (hits + self.misses)
+                if (hits + self.misses) > 0
+                else 0.0
+            ),
+            "policy": self.policy,
+            "admissions": self._policy.admissions,
+            "rejections": self._policy.rejections,
+        }
+        if self.store is not None:
+            info["disk_hits"] = self.store.hits
+            info["disk_misses"] = self.store.misses
+        return info
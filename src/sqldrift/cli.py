@@ -0,0 +1,233 @@
+"""
+``sqldrift`` command-line tool.
+
+Validates SQL files, or a query log read from stdin, against a schema
+snapshot and writes one JSON object per statement to stdout followed by a
+timing summary on stderr. The exit status is ``0`` when every statement is
+valid, ``1`` when drift (or a syntax error) was found and ``2`` on usage
+errors.
+
+Usage:
+    sqldrift --schema schema.json models/ queries/adhoc.sql
+    cat queries.jsonl | sqldrift --schema schema.json --workers 8 -
+
+The schema snapshot is JSON in the ``SchemaDict`` format used by
+``ColumnValidator`` (tables and columns are both checked), or a plain JSON
+list of table names (only tables are checked).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Sequence, TextIO
+
+from sqldrift import batch
+from sqldrift.optimized import SchemaValidator
+from sqldrift.stream import LogResult, iter_queries, iter_validate
+from sqldrift.unified import UnifiedValidator
+
+
+# Below this many statements a process pool costs more than it saves
+_AUTO_WORKERS_THRESHOLD = 500
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sqldrift",
+        description="Detect schema drift in SQL files and query logs.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="SQL files or directories (searched for *.sql). "
+        "Use '-' or omit to read a query log from stdin.",
+    )
+    parser.add_argument(
+        "-s", "--schema",
+        required=True,
+        help="Schema snapshot: JSON SchemaDict or a JSON list of table names.",
+    )
+    parser.add_argument("-d", "--dialect", help="SQL dialect, e.g. postgres.")
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=0,
+        help="Worker processes (default: 0 = CPU count for large inputs, "
+        "otherwise 1).",
+    )
+    parser.add_argument(
+        "--format",
+        dest="log_format",
+        choices=("auto", "jsonl", "csv", "sql"),
+        default="auto",
+        help="Format of the stdin log (default: auto).",
+    )
+    parser.add_argument(
+        "--field",
+        default="query",
+        help="JSON key or CSV column holding the SQL (default: query).",
+    )
+    parser.add_argument(
+        "--case-sensitive",
+        action="store_true",
+        help="Match table and column names case-sensitively.",
+    )
+    parser.add_argument(
+        "--failures-only",
+        action="store_true",
+        help="Only emit results for statements that failed validation.",
+    )
+    parser.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="Do not print the timing summary.",
+    )
+    return parser
+
+
+def _load_validator(path: str, case_sensitive: bool) -> Any:
+    """Build a validator from a schema snapshot file."""
+    with open(path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+
+    if isinstance(snapshot, list):
+        return SchemaValidator(snapshot, case_sensitive=case_sensitive)
+    if isinstance(snapshot, dict):
+        return UnifiedValidator(snapshot, case_sensitive=case_sensitive)
+    raise ValueError("schema snapshot must be a JSON object or list")
+
+
+def _iter_sql_files(paths: Sequence[str]) -> Iterator[Path]:
+    """Expand directories to the ``*.sql`` files below them."""
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            yield from sorted(path.rglob("*.sql"))
+        else:
+            yield path
+
+
+def _validate_files(
+    validator: Any,
+    paths: Sequence[str],
+    dialect: Optional[str],
+    workers: int,
+) -> Iterator[tuple[str, LogResult]]:
+    """Validate every statement of the given SQL files."""
+    statements: list[tuple[str, int, str]] = []
+    for path in _iter_sql_files(paths):
+        with open(path, encoding="utf-8") as f:
+            for record in iter_queries(f, log_format="sql"):
+                statements.append((str(path), record.line, record.sql))
+
+    if workers == 0:
+        workers = (
+            os.cpu_count() or 1
+            if len(statements) >= _AUTO_WORKERS_THRESHOLD
+            else 1
+        )
+
+    results = batch.validate_many(
+        validator,
+        [sql for _, _, sql in statements],
+        dialect=dialect,
+        workers=workers,
+    )
+    for (source, line, sql), (success, message) in zip(statements, results):
+        yield source, LogResult(line, sql, success, message)
+
+
+def _validate_stream(
+    validator: Any,
+    stream: TextIO,
+    dialect: Optional[str],
+    workers: int,
+    log_format: str,
+    field: str,
+) -> Iterator[tuple[str, LogResult]]:
+    """Validate a query log read from a text stream."""
+    lines: Iterable[str] = stream
+    if workers == 0:
+        # Peek far enough to tell a short log from a long one; spawning a
+        # pool costs more than validating a handful of statements inline
+        head = list(islice(stream, _AUTO_WORKERS_THRESHOLD))
+        workers = (
+            os.cpu_count() or 1
+            if len(head) >= _AUTO_WORKERS_THRESHOLD
+            else 1
+        )
+        lines = chain(head, stream)
+    for result in iter_validate(
+        lines,
+        validator,
+        dialect=dialect,
+        log_format=log_format,
+        field=field,
+        workers=workers,
+    ):
+        yield "<stdin>", result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the command-line tool and return its exit status."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        validator = _load_validator(args.schema, args.case_sensitive)
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot load schema {args.schema!r}: {e}")
+    loaded = time.perf_counter()
+
+    paths = [p for p in args.paths if p != "-"]
+    try:
+        if paths:
+            results = _validate_files(
+                validator, paths, args.dialect, args.workers
+            )
+        else:
+            results = _validate_stream(
+                validator,
+                sys.stdin,
+                args.dialect,
+                args.workers,
+                args.log_format,
+                args.field,
+            )
+
+        total = failures = 0
+        out = sys.stdout
+        for source, result in results:
+            total += 1
+            if not result.success:
+                failures += 1
+            elif args.failures_only:
+                continue
+            out.write(json.dumps({
+                "source": source,
+                "line": result.line,
+                "success": result.success,
+                "message": result.message,
+            }))
+            out.write("\n")
+    except (OSError, ValueError) as e:
+        # ValueError covers UnicodeDecodeError from non-UTF-8 input
+        parser.error(f"cannot read input: {e}")
+
+    finished = time.perf_counter()
+    if not args.quiet:
+        elapsed = finished - loaded
+        rate = total / elapsed if elapsed > 0 else 0.0
+        print(
+            f"sqldrift: {total} statements, {failures} failed | "
+            f"schema load {loaded - started:.3f}s, "
+            f"validation {elapsed:.3f}s ({rate:,.0f}/s)",
+            file=sys.stderr,
+        )
+
+    return 1 if failures else 0
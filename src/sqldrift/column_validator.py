@@ -29,9 +29,27 @@ Usage:
     (False, "Column Drift Detected: ...")
 """
 
+import copy
+import json
+import threading
+import time
+from collections.abc import Collection
+from concurrent.futures import Executor
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, Mapping, Optional, Union
+
 import sqlglot
-from typing import Optional
-from functools import lru_cache
+
+from sqldrift import batch
+from sqldrift.cache import Dependencies, ValidationCache
+from sqldrift.persistent import PersistentCache, owner_namespace, schema_digest
+from sqldrift.compact import CompactSchema
+from sqldrift.plan import ReferencePlan
+from sqldrift.query import Query, is_blank, parse_query
+from sqldrift.references import QueryReferences, collect_references
+from sqldrift.result import DEFAULT_MESSAGE_LIMIT, MissingColumn, ValidationResult
+from sqldrift.suggest import TrigramIndex, edit_budget, match_score
 
 
 # ---------------------------------------------------------------------------
@@ -46,6 +64,142 @@ from functools import lru_cache
 #   }
 SchemaDict = dict[str, dict[str, list[str]]]
 
+# Column metadata kept per normalized column name:
+# (original-case name, type or None, ordinal position in the table)
+ColumnEntry = tuple[str, Optional[str], int]
+
+
+class _ColumnSnapshot:
+    """
+    Column lookups of a ``ColumnValidator`` at one point in time.
+
+    A snapshot is never mutated once published. Validators read every lookup
+    through a single ``_state`` reference and replace it wholesale on update,
+    so a concurrent ``validate`` sees either the old schema or the new one,
+    never a new table map paired with an old column lookup.
+
+    The index behind column suggestions is built on first use, so a
+    snapshot that never sees a missing column never pays for it. Once
+    built, it is carried forward through schema changes (see
+    ``carry_suggester``).
+    """
+
+    __slots__ = (
+        "schema", "column_lookup", "raw", "raw_names", "compact", "_suggester",
+    )
+
+    def __init__(
+        self,
+        schema: Mapping[str, Collection[str]],
+        column_lookup: Mapping[str, object],
+        raw: Optional[SchemaDict] = None,
+        raw_names: Optional[dict[str, str]] = None,
+        compact: Optional[CompactSchema] = None,
+    ):
+        # table -> normalized column -> ``ColumnEntry`` (compact: a set view)
+        self.schema = schema
+        # column -> number of tables containing it (compact: table list)
+        self.column_lookup = column_lookup
+        # Private shallow copy of the raw schema; ``None`` when compact
+        self.raw = raw
+        # normalized table -> its key in ``raw``
+        self.raw_names = raw_names
+        self.compact = compact
+        self._suggester: Optional[
+            tuple[TrigramIndex, Mapping[str, list[str]]]
+        ] = None
+
+    def __reduce__(self):
+        # The suggestion index is cheap to rebuild and not worth shipping
+        return _ColumnSnapshot, (
+            self.schema, self.column_lookup, self.raw, self.raw_names, self.compact,
+        )
+
+    def suggester(self) -> tuple[TrigramIndex, Mapping[str, list[str]]]:
+        """
+        Return the column suggestion index, building it once.
+
+        Returns:
+            A trigram index over the distinct normalized column names, and
+            a ``column -> [tables]`` mapping to expand its hits.
+        """
+        suggester = self._suggester
+        if suggester is None:
+            if self.compact is not None:
+                tables_of: Mapping[str, list[str]] = self.column_lookup
+            else:
+                tables_of = {}
+                for table, columns in self.schema.items():
+                    for col in columns:
+                        tables_of.setdefault(col, []).append(table)
+            # Racing builders produce identical indexes; the last one wins
+            suggester = self._suggester = (TrigramIndex(tables_of), tables_of)
+        return suggester
+
+    def carry_suggester(
+        self,
+        previous: "_ColumnSnapshot",
+        changed_tables: set[str],
+        changed_columns: set[str],
+    ) -> None:
+        """
+        Derive the suggestion index from the snapshot this one replaces.
+
+        Only the changed names are re-indexed and only the changed tables'
+        entries of ``column -> [tables]`` are edited, so a schema change does
+        not make the next failure rebuild the index from scratch. Nothing is
+        done if ``previous`` never built its index.
+
+        Args:
+            previous: The snapshot being replaced.
+            changed_tables: Tables added, dropped or with changed columns.
+            changed_columns: Column names that appeared in or disappeared
+                from the schema as a whole.
+        """
+        suggester = previous._suggester
+        if suggester is None or self._suggester is not None:
+            return
+        index, tables_of = suggester
+        lookup = self.column_lookup
+        index = index.updated(
+            (col for col in changed_columns if col in lookup),
+            (col for col in changed_columns if col not in lookup),
+        )
+        if self.compact is not None:
+            self._suggester = (index, lookup)
+            return
+
+        tables_of = dict(tables_of)
+        # Columns whose table list this snapshot owns and may edit
+        owned: set[str] = set()
+
+        def own(col: str) -> list[str]:
+            if col in owned:
+                return tables_of[col]
+            owned.add(col)
+            tables = tables_of[col] = list(tables_of.get(col, ()))
+            return tables
+
+        for table in changed_tables:
+            before = previous.schema.get(table, {})
+            after = self.schema.get(table, {})
+            for col in before:
+                if col not in after:
+                    tables = own(col)
+                    tables.remove(table)
+                    if not tables:
+                        del tables_of[col]
+                        owned.discard(col)
+            for col in after:
+                if col not in before:
+                    own(col).append(table)
+        self._suggester = (index, tables_of)
+
+    @classmethod
+    def from_compact(cls, compact: CompactSchema) -> "_ColumnSnapshot":
+        """Serve all lookups from a ``CompactSchema``."""
+        return cls(compact.table_map(), compact.column_lookup(), compact=compact)
+
 
 class ColumnValidator:
     """
@@ -59,6 +213,14 @@ class ColumnValidator:
         schema: Dictionary mapping table names to column definitions.
         case_sensitive: If ``True``, column name matching is case-sensitive.
             Defaults to ``False``.
+        compact: If ``True``, store the schema in a ``CompactSchema`` --
+            interned names and sorted integer arrays -- and do not retain
+            the raw schema dictionary. Uses far less memory on very large
+            catalogs at the cost of ``O(log n)`` instead of ``O(1)`` name
+            lookups. Defaults to ``False``.
+        message_limit: Maximum number of available columns listed per
+            missing column in a drift message; the rest are summarized as a
+            count. Defaults to ``20``.
 
     Examples:
         >>> schema = {
@@ -75,10 +237,24 @@ class ColumnValidator:
         schema: SchemaDict,
         *,
         case_sensitive: bool = False,
+        compact: bool = False,
+        message_limit: int = DEFAULT_MESSAGE_LIMIT,
     ):
         self.case_sensitive = case_sensitive
-        self._schema_raw = schema
-        self._schema, self._column_lookup = self._build_lookups(schema)
+        self.compact = compact
+        self.message_limit = message_limit
+        # Serializes writers; readers never take it
+        self._write_lock = threading.Lock()
+        self._state = self._build_snapshot(schema)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_write_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._write_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -91,29 +267,71 @@ class ColumnValidator:
             name = name.lower()
         return name
 
+    def _build_snapshot(self, schema: SchemaDict) -> _ColumnSnapshot:
+        """Build the lookups for a schema with the configured backend."""
+        if self.compact:
+            return _ColumnSnapshot.from_compact(
+                CompactSchema.from_dict(schema, self._normalize)
+            )
+        # Shallow copy: ``apply_changes`` edits it without touching the
+        # caller's dictionary
+        raw = dict(schema)
+        tables, lookup, raw_names = self._build_lookups(raw)
+        return _ColumnSnapshot(tables, lookup, raw, raw_names)
+
+    def _iter_raw_columns(
+        self, state: _ColumnSnapshot
+    ) -> Iterator[tuple[str, str]]:
+        """Yield ``(original_table, original_column)`` for every column."""
+        if state.compact is not None:
+            yield from state.compact.iter_original_columns()
+            return
+        for raw_table, info in state.raw.items():
+            for raw_col in info.get("columns", []):
+                yield raw_table, raw_col
+
     def _build_lookups(
         self, schema: SchemaDict
-    ) -> tuple[dict[str, set[str]], dict[str, list[str]]]:
+    ) -> tuple[dict[str, dict[str, ColumnEntry]], dict[str, int], dict[str, str]]:
         """
         Build normalized lookup structures from the raw schema.
 
         Returns:
             A tuple of:
-            - table -> set of normalized column names
-            - column -> list of tables that contain it
+            - table -> normalized column -> ``(original, type, position)``
+            - column -> number of tables that contain it
+            - normalized table -> its key in the raw schema
         """
-        table_columns: dict[str, set[str]] = {}
-        column_to_tables: dict[str, list[str]] = {}
+        table_columns: dict[str, dict[str, ColumnEntry]] = {}
+        column_counts: dict[str, int] = {}
+        raw_names: dict[str, str] = {}
 
         for table, info in schema.items():
             norm_table = self._normalize(table)
-            cols = {self._normalize(c) for c in info.get("columns", [])}
-            table_columns[norm_table] = cols
+            table_columns[norm_table] = self._index_columns(info)
+            raw_names[norm_table] = table
 
+        for cols in table_columns.values():
             for col in cols:
-                column_to_tables.setdefault(col, []).append(norm_table)
+                column_counts[col] = column_counts.get(col, 0) + 1
+
+        return table_columns, column_counts, raw_names
+
+    def _index_columns(self, info: dict[str, list[str]]) -> dict[str, ColumnEntry]:
+        """
+        Index one table's columns by normalized name.
 
-        return table_columns, column_to_tables
+        The first occurrence of a normalized name wins, as in the compact
+        backend.
+        """
+        raw_types = info.get("types", [])
+        columns: dict[str, ColumnEntry] = {}
+        for pos, raw_col in enumerate(info.get("columns", [])):
+            norm_col = self._normalize(raw_col)
+            if norm_col not in columns:
+                col_type = raw_types[pos] if pos < len(raw_types) else None
+                columns[norm_col] = (raw_col, col_type, pos)
+        return columns
 
     # ------------------------------------------------------------------
     # Column extraction
@@ -121,7 +339,7 @@ class ColumnValidator:
 
     def extract_columns(
         self,
-        sql_query: str,
+        sql_query: Query,
         *,
         dialect: Optional[str] = None,
     ) -> list[tuple[Optional[str], str]]:
@@ -129,49 +347,23 @@ class ColumnValidator:
         Extract column references from a SQL query.
 
         Args:
-            sql_query: The SQL query to parse.
+            sql_query: The SQL query to parse, a parsed sqlglot expression or
+                a compiled plan.
             dialect: Optional SQL dialect for parsing.
 
         Returns:
             List of ``(table_or_alias, column_name)`` tuples.
             ``table_or_alias`` is ``None`` for unqualified references.
         """
+        if isinstance(sql_query, ReferencePlan):
+            if sql_query.refs is None:
+                return []
+            return self._resolve_refs(sql_query.refs)[1]
         try:
-            expression = sqlglot.parse_one(sql_query, read=dialect)
+            expression = parse_query(sql_query, dialect)
         except Exception:
             return []
-
-        # Build alias -> real table mapping from FROM/JOIN clauses
-        alias_map: dict[str, str] = {}
-        for table_node in expression.find_all(sqlglot.exp.Table):
-            real_name = table_node.name
-            alias = table_node.alias
-            if alias:
-                alias_map[self._normalize(alias)] = self._normalize(real_name)
-
-        columns: list[tuple[Optional[str], str]] = []
-        seen: set[str] = set()
-
-        for col in expression.find_all(sqlglot.exp.Column):
-            col_name = col.name
-            table_ref = col.table if col.table else None
-
-            # Resolve alias to real table name
-            if table_ref:
-                norm_ref = self._normalize(table_ref)
-                real_table = alias_map.get(norm_ref, norm_ref)
-            else:
-                real_table = None
-
-            norm_col = self._normalize(col_name)
-
-            # Deduplicate
-            key = f"{real_table}.{norm_col}" if real_table else norm_col
-            if key not in seen:
-                seen.add(key)
-                columns.append((real_table, norm_col))
-
-        return columns
+        return self._collect_refs(expression)[1]
 
     # ------------------------------------------------------------------
     # Validation
@@ -179,7 +371,7 @@ class ColumnValidator:
 
     def validate(
         self,
-        sql_query: str,
+        sql_query: Query,
         *,
         dialect: Optional[str] = None,
     ) -> tuple[bool, str]:
@@ -192,7 +384,10 @@ class ColumnValidator:
         when none of the ``FROM`` tables are known to the schema.
 
         Args:
-            sql_query: The SQL query to validate.
+            sql_query: The SQL query to validate, a parsed sqlglot
+                expression, which is validated without parsing again, or a
+                plan from ``sqldrift.compile``, which is checked without
+                parsing at all.
             dialect: Optional SQL dialect for parsing.
 
         Returns:
@@ -202,120 +397,342 @@ class ColumnValidator:
             - ``(False, "Column Drift Detected: ...")`` -- missing columns.
             - ``(False, "Invalid SQL syntax: ...")`` -- parse failure.
         """
-        if not sql_query or not sql_query.strip():
-            return True, "All columns exist."
+        return self._validate_with_deps(sql_query, dialect)[0].as_tuple()
+
+    def validate_result(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+        keep_ast: bool = False,
+    ) -> ValidationResult:
+        """
+        Validate a query and return a structured result.
+
+        Same check as ``validate``, but the missing columns -- with the
+        table or FROM tables each was checked against and its suggestions
+        -- parse errors and timings are available as attributes instead of
+        being formatted into a message.
+
+        Args:
+            sql_query: The SQL query to validate, a parsed sqlglot
+                expression or a compiled plan.
+            dialect: Optional SQL dialect for parsing.
+            keep_ast: If ``True``, the result also carries the parsed
+                ``expression``, the ``FROM`` / ``JOIN`` ``tables`` and the
+                ``columns`` referenced, as ``extract_columns`` returns them.
+                Plans carry no expression.
+
+        Returns:
+            A ``ValidationResult``.
+        """
+        return self._validate_with_deps(sql_query, dialect, keep_ast)[0]
+
+    def is_valid(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+    ) -> bool:
+        """
+        Return whether every column referenced in a query exists.
+
+        A fail-fast check for pre-execution gates: it stops at the first
+        missing column and computes no suggestions or message. Call
+        ``validate`` or ``validate_result`` for the diagnostics when it
+        returns ``False``.
 
+        Args:
+            sql_query: The SQL query string to check, a parsed sqlglot
+                expression or a compiled plan.
+            dialect: Optional SQL dialect for parsing.
+
+        Returns:
+            ``True`` if the query parses and all its columns exist (an empty
+            query is valid); ``False`` otherwise, including on parse errors.
+        """
+        if is_blank(sql_query):
+            return True
+        state = self._state
+        if isinstance(sql_query, ReferencePlan):
+            refs = sql_query.refs
+            return refs is not None and self._columns_exist(refs, state)
         try:
-            expression = sqlglot.parse_one(sql_query, read=dialect)
-        except Exception as e:
-            return False, f"Invalid SQL syntax: {e}"
+            expression = parse_query(sql_query, dialect)
+        except Exception:
+            return False
+        return self._columns_exist(collect_references(expression), state)
+
+    def _columns_exist(self, refs: QueryReferences, state: _ColumnSnapshot) -> bool:
+        """Fail-fast counterpart of ``_check_columns``."""
+        from_tables, alias_map = self._resolve_tables(refs)
+        known_from_tables = tuple(t for t in from_tables if t in state.schema)
+        is_missing = self._is_missing
+        return not any(
+            is_missing(table, col, known_from_tables, state)
+            for table, col in self._iter_column_refs(refs, alias_map)
+        )
+
+    def validate_many(
+        self,
+        queries: Iterable[str],
+        *,
+        dialect: Optional[str] = None,
+        workers: Optional[int] = 1,
+        chunksize: int = 256,
+    ) -> list[tuple[bool, str]]:
+        """
+        Validate many queries, returning results in input order.
+
+        Identical and fingerprint-equal queries are validated once. With
+        ``workers > 1`` the distinct queries are sharded across a
+        ``ProcessPoolExecutor``; the column index is placed in shared memory
+        once and every worker attaches to it.
+
+        Args:
+            queries: SQL query strings to validate.
+            dialect: Optional SQL dialect for parsing.
+            workers: Number of worker processes. ``1`` validates inline;
+                ``None`` uses ``os.cpu_count()``. Defaults to ``1``.
+            chunksize: Number of queries sent to a worker per task.
+
+        Returns:
+            A list of ``(success, message)`` tuples, one per query.
+        """
+        return batch.validate_many(
+            self,
+            queries,
+            dialect=dialect,
+            workers=workers,
+            chunksize=chunksize,
+        )
+
+    def _validate_with_deps(
+        self,
+        sql_query: Query,
+        dialect: Optional[str] = None,
+        keep_ast: bool = False,
+    ) -> tuple[ValidationResult, Dependencies]:
+        """
+        Validate a query and report which schema objects the result depends on.
+
+        A successful result depends on the tables named in the query and,
+        through the global fallback, on the unqualified column names; failures
+        depend on the whole schema because their suggestions do.
+        """
+        if is_blank(sql_query):
+            return (
+                ValidationResult(True, "All columns exist."),
+                (frozenset(), frozenset()),
+            )
+
+        start = time.perf_counter()
+        if isinstance(sql_query, ReferencePlan):
+            if sql_query.refs is None:
+                return ValidationResult.failed(sql_query.error), None
+            expression = None
+            parsed = start
+            from_tables, columns = self._resolve_refs(sql_query.refs)
+        else:
+            try:
+                expression = parse_query(sql_query, dialect)
+            except Exception as e:
+                return ValidationResult.failed(
+                    f"Invalid SQL syntax: {e}", parse_time=time.perf_counter() - start
+                ), None
+            parsed = time.perf_counter()
+            from_tables, columns = self._collect_refs(expression)
+
+        drift = self._check_columns(from_tables, columns, self._state)
+        if drift is not None:
+            drift.parse_time = parsed - start
+            drift.check_time = time.perf_counter() - parsed
+            if keep_ast:
+                self._keep_ast(drift, expression, from_tables, columns)
+            return drift, None
+
+        tables = set(from_tables)
+        unqualified: set[str] = set()
+        for table, col in columns:
+            if table:
+                tables.add(table)
+            else:
+                unqualified.add(col)
+
+        result = ValidationResult(
+            True,
+            "All columns exist.",
+            parse_time=parsed - start,
+            check_time=time.perf_counter() - parsed,
+        )
+        if keep_ast:
+            self._keep_ast(result, expression, from_tables, columns)
+        return result, (frozenset(tables), frozenset(unqualified))
+
+    @staticmethod
+    def _keep_ast(
+        result: ValidationResult,
+        expression: Optional[sqlglot.exp.Expression],
+        from_tables: set[str],
+        columns: list[tuple[Optional[str], str]],
+    ) -> None:
+        """Attach a parsed query and its references to a fresh result."""
+        result.expression = expression
+        result.tables = tuple(sorted(from_tables))
+        result.columns = tuple(columns)
+
+    def _collect_refs(
+        self, expression: sqlglot.exp.Expression
+    ) -> tuple[set[str], list[tuple[Optional[str], str]]]:
+        """
+        Collect table and column references from a parsed query.
 
-        # ----- Build alias map AND collect FROM/JOIN tables -----
+        The tree is walked once (see ``sqldrift.references``); aliases are
+        then resolved over the collected references.
+
+        Returns:
+            A tuple of:
+            - the set of normalized tables named in ``FROM`` / ``JOIN``
+            - deduplicated ``(real_table_or_None, column)`` references
+        """
+        return self._resolve_refs(collect_references(expression))
+
+    def _resolve_refs(
+        self, refs: QueryReferences
+    ) -> tuple[set[str], list[tuple[Optional[str], str]]]:
+        """Normalize collected references and resolve their aliases."""
+        from_tables, alias_map = self._resolve_tables(refs)
+        # dict keeps the first occurrence of each reference, in query order
+        columns = list(dict.fromkeys(self._iter_column_refs(refs, alias_map)))
+        return from_tables, columns
+
+    def _resolve_tables(
+        self, refs: QueryReferences
+    ) -> tuple[set[str], dict[str, str]]:
+        """
+        Return the normalized ``FROM`` / ``JOIN`` tables and alias map.
+
+        Unqualified references to a CTE visible from their scope are not
+        tables of the schema and are left out of the ``FROM`` tables; the
+        same name elsewhere in the query still names a real table.
+        """
+        normalize = self._normalize
+        # Tables of one scope share their set of visible CTE names
+        scope_ctes: dict[frozenset[str], set[str]] = {}
         alias_map: dict[str, str] = {}
         from_tables: set[str] = set()
 
-        for table_node in expression.find_all(sqlglot.exp.Table):
-            real_name = self._normalize(table_node.name)
-            alias = table_node.alias
+        for name, alias, qualified, visible in refs.tables:
+            real_name = normalize(name)
             if alias:
-                alias_map[self._normalize(alias)] = real_name
-            from_tables.add(real_name)
-
-        # ----- Extract column references -----
-        columns: list[tuple[Optional[str], str]] = []
-        seen: set[str] = set()
-
-        for col in expression.find_all(sqlglot.exp.Column):
-            col_name = col.name
-            table_ref = col.table if col.table else None
+                alias_map[normalize(alias)] = real_name
+            if qualified or not visible:
+                from_tables.add(real_name)
+                continue
+            ctes = scope_ctes.get(visible)
+            if ctes is None:
+                ctes = scope_ctes[visible] = {normalize(cte) for cte in visible}
+            if real_name not in ctes:
+                from_tables.add(real_name)
+
+        return from_tables, alias_map
+
+    def _iter_column_refs(
+        self, refs: QueryReferences, alias_map: dict[str, str]
+    ) -> Iterator[tuple[Optional[str], str]]:
+        """
+        Yield ``(real_table_or_None, column)`` for each column reference.
 
+        Aliases are resolved through ``alias_map``. References are yielded
+        lazily and may repeat.
+        """
+        normalize = self._normalize
+        for table_ref, name in refs.columns:
             if table_ref:
-                norm_ref = self._normalize(table_ref)
-                real_table = alias_map.get(norm_ref, norm_ref)
+                norm_ref = normalize(table_ref)
+                yield alias_map.get(norm_ref, norm_ref), normalize(name)
             else:
-                real_table = None
-
-            norm_col = self._normalize(col_name)
-            key = f"{real_table}.{norm_col}" if real_table else norm_col
-            if key not in seen:
-                seen.add(key)
-                columns.append((real_table, norm_col))
+                yield None, normalize(name)
+
+    @staticmethod
+    def _is_missing(
+        table: Optional[str],
+        col: str,
+        known_from_tables: tuple[str, ...],
+        state: _ColumnSnapshot,
+    ) -> bool:
+        """
+        Return whether one column reference is missing from a snapshot.
 
+        Qualified references are checked against their table; references to
+        tables outside the schema are left to table-level drift detection.
+        Unqualified references are checked against the query's known FROM
+        tables, or across the whole schema when there are none.
+        """
+        schema = state.schema
+        if table:
+            return table in schema and col not in schema[table]
+        if known_from_tables:
+            return not any(col in schema[t] for t in known_from_tables)
+        return col not in state.column_lookup
+
+    def _check_columns(
+        self,
+        from_tables: set[str],
+        columns: list[tuple[Optional[str], str]],
+        state: _ColumnSnapshot,
+    ) -> Optional[ValidationResult]:
+        """Check collected column references against a schema snapshot."""
         if not columns:
-            return True, "All columns exist."
+            return None
+
+        schema = state.schema
 
         # ----- Validate each column reference -----
         # Track missing columns with context for actionable error messages
-        missing_details: list[dict] = []
+        missing: list[tuple[str, Optional[str], tuple[str, ...]]] = []
 
         # Pre-compute which FROM tables are known to the schema
-        known_from_tables = [t for t in from_tables if t in self._schema]
+        known_from_tables = tuple(t for t in from_tables if t in schema)
 
         for table, col in columns:
+            if not self._is_missing(table, col, known_from_tables, state):
+                continue
             if table:
-                # Qualified reference: check specific table
-                if table in self._schema:
-                    if col not in self._schema[table]:
-                        missing_details.append({
-                            "ref": f"{table}.{col}",
-                            "column": col,
-                            "table": table,
-                        })
-                # If table not in schema, skip -- table-level drift is
-                # handled by SchemaValidator
+                missing.append((col, table, ()))
+            elif known_from_tables:
+                single = (
+                    known_from_tables[0]
+                    if len(known_from_tables) == 1 else None
+                )
+                missing.append((col, single, known_from_tables))
             else:
-                # Unqualified reference: check against FROM-clause tables
-                if known_from_tables:
-                    found = any(
-                        col in self._schema[t] for t in known_from_tables
-                    )
-                    if not found:
-                        missing_details.append({
-                            "ref": col,
-                            "column": col,
-                            "table": known_from_tables[0] if len(known_from_tables) == 1 else None,
-                            "tables": known_from_tables,
-                        })
-                else:
-                    # No known FROM tables — fall back to global check
-                    if col not in self._column_lookup:
-                        missing_details.append({
-                            "ref": col,
-                            "column": col,
-                            "table": None,
-                        })
-
-        if missing_details:
-            parts: list[str] = []
-            for detail in missing_details:
-                col = detail["column"]
-                table = detail.get("table")
-
-                line = f"- Column '{col}' not found"
-
-                # Show which table it was checked against
-                if table and table in self._schema:
-                    available = sorted(self._schema[table])
-                    line += f" in table '{table}'"
-                    line += f". Available columns: {', '.join(available)}"
-                elif "tables" in detail:
-                    tables_str = ", ".join(detail["tables"])
-                    line += f" in tables: {tables_str}"
-
-                # Add suggestions
-                suggestions = self.suggest_alternatives(col)
-                if suggestions:
-                    line += f". Did you mean: {', '.join(suggestions[:5])}"
-
-                parts.append(line)
-
-            detail_block = "\n".join(parts)
-            return (
-                False,
-                f"Column Drift Detected:\n{detail_block}",
-            )
+                missing.append((col, None, ()))
 
-        return True, "All columns exist."
+        if not missing:
+            return None
+
+        details: list[MissingColumn] = []
+        for col, table, tables in missing:
+            # Show which table it was checked against, up to the limit
+            available: tuple[str, ...] = ()
+            available_count = 0
+            if table:
+                available_count = len(schema[table])
+                available = tuple(sorted(schema[table])[:self.message_limit])
+
+            # Suggest from the tables it was checked against first
+            scope = tables or ((table,) if table else ())
+            details.append(MissingColumn(
+                col,
+                table=table,
+                tables=tables,
+                available=available,
+                available_count=available_count,
+                suggestions=tuple(self._suggest_columns(col, state, scope)),
+            ))
+
+        return ValidationResult(False, missing_columns=tuple(details))
 
     # ------------------------------------------------------------------
     # Schema management
@@ -328,31 +745,397 @@ class ColumnValidator:
         Args:
             schema: New schema dictionary.
         """
-        self._schema_raw = schema
-        self._schema, self._column_lookup = self._build_lookups(schema)
+        self._replace_snapshot(self._build_snapshot(schema))
+
+    def _replace_snapshot(self, new: _ColumnSnapshot) -> tuple[set[str], set[str]]:
+        """
+        Publish a rebuilt snapshot, carrying the suggestion index forward.
+
+        Returns:
+            A tuple of:
+            - normalized tables that were added, dropped or changed
+            - normalized column names that appeared in or disappeared from
+              the schema as a whole
+        """
+        # The snapshot replaced is read under the lock, so concurrent
+        # writers each diff against the one they actually replace
+        with self._write_lock:
+            old = self._state
+            changed_tables = {
+                table
+                for table in old.schema.keys() | new.schema.keys()
+                if old.schema.get(table) != new.schema.get(table)
+            }
+            changed_columns = old.column_lookup.keys() ^ new.column_lookup.keys()
+            new.carry_suggester(old, changed_tables, changed_columns)
+            self._state = new
+        return changed_tables, changed_columns
+
+    def apply_changes(
+        self,
+        *,
+        added_tables: Optional[SchemaDict] = None,
+        dropped_tables: Iterable[str] = (),
+        added_columns: Optional[SchemaDict] = None,
+        dropped_columns: Optional[Mapping[str, Iterable[str]]] = None,
+        renamed: Optional[Mapping[Union[str, tuple[str, str]], str]] = None,
+    ) -> None:
+        """
+        Apply an incremental schema change.
+
+        Changes are applied in order: dropped tables, renames, dropped
+        columns, added tables, added columns. Dropping or renaming an object
+        that does not exist, and adding a column that already exists, are
+        no-ops, so replaying a change is harmless. An added table that
+        already exists replaces the old definition.
+
+        The change is applied to a shallow copy of the lookups that is then
+        swapped in, so concurrent ``validate`` calls are unaffected. Column
+        indexes of untouched tables are shared with the previous snapshot and
+        no untouched name is re-normalized. With ``compact=True`` the index
+        is immutable, so it is rebuilt in ``O(schema)``.
+
+        Args:
+            added_tables: New tables in ``SchemaDict`` format.
+            dropped_tables: Names of dropped tables.
+            added_columns: Columns appended to existing tables, in
+                ``SchemaDict`` format (``types`` optional).
+            dropped_columns: Mapping of table name to dropped column names.
+            renamed: Mapping of old name to new name. A string key renames
+                a table; a ``(table, column)`` key renames a column.
+
+        Examples:
+            >>> v.apply_changes(
+            ...     added_columns={"users": {"columns": ["tier"]}},
+            ...     renamed={("users", "name"): "full_name"},
+            ... )
+        """
+        self._apply_column_changes(
+            added_tables or {},
+            dropped_tables,
+            added_columns or {},
+            dropped_columns or {},
+            renamed or {},
+        )
+
+    def _apply_column_changes(
+        self,
+        added_tables: SchemaDict,
+        dropped_tables: Iterable[str],
+        added_columns: SchemaDict,
+        dropped_columns: Mapping[str, Iterable[str]],
+        renamed: Mapping[Union[str, tuple[str, str]], str],
+    ) -> tuple[set[str], set[str]]:
+        """
+        Apply a schema delta to a copy of the lookups and publish it.
+
+        Returns:
+            A tuple of:
+            - normalized tables that were added, dropped or changed
+            - normalized column names that appeared in or disappeared from
+              the schema as a whole
+        """
+        with self._write_lock:
+            state = self._state
+            if state.compact is not None:
+                # The compact index is immutable: edit a dictionary and rebuild
+                raw = state.compact.to_dict()
+                tables, lookup, raw_names = self._build_lookups(raw)
+            else:
+                raw = dict(state.raw)
+                raw_names = dict(state.raw_names)
+                tables = dict(state.schema)
+                lookup = dict(state.column_lookup)
+
+            changed = self._edit_columns(
+                raw,
+                raw_names,
+                tables,
+                lookup,
+                added_tables,
+                dropped_tables,
+                added_columns,
+                dropped_columns,
+                renamed,
+            )
+
+            if state.compact is not None:
+                new = _ColumnSnapshot.from_compact(
+                    CompactSchema.from_dict(raw, self._normalize)
+                )
+            else:
+                new = _ColumnSnapshot(tables, lookup, raw, raw_names)
+            new.carry_suggester(state, *changed)
+            self._state = new
+        return changed
+
+    def _edit_columns(
+        self,
+        raw: SchemaDict,
+        raw_names: dict[str, str],
+        tables: dict[str, dict[str, ColumnEntry]],
+        lookup: dict[str, int],
+        added_tables: SchemaDict,
+        dropped_tables: Iterable[str],
+        added_columns: SchemaDict,
+        dropped_columns: Mapping[str, Iterable[str]],
+        renamed: Mapping[Union[str, tuple[str, str]], str],
+    ) -> tuple[set[str], set[str]]:
+        """
+        Apply a schema delta in place to unpublished lookups.
+
+        The top-level dictionaries must be private copies; raw entries may
+        still be shared with the published snapshot and are copied before
+        their first edit. The delta is applied to the raw entries, then the
+        column index of every touched table is rebuilt from its entry.
+        """
+        normalize = self._normalize
+
+        # Touched table -> its normalized column names so far, or ``None``
+        # once dropped
+        pending: dict[str, Optional[set[str]]] = {}
+        # Raw table entries already copied by this call
+        owned: dict[str, dict[str, list]] = {}
+
+        def columns_of(table: str) -> set[str]:
+            cols = pending.get(table)
+            if cols is None:
+                cols = pending[table] = set(tables[table])
+            return cols
+
+        def raw_entry(table: str) -> dict[str, list]:
+            # Copy before editing: the entry may be shared with the caller
+            entry = owned.get(table)
+            if entry is None:
+                key = raw_names[table]
+                info = raw[key]
+                entry = {"columns": list(info.get("columns", []))}
+                if "types" in info:
+                    entry["types"] = list(info["types"])
+                raw[key] = owned[table] = entry
+            return entry
+
+        def drop_table(name: str) -> None:
+            table = normalize(name)
+            if table not in raw_names:
+                return
+            del raw[raw_names.pop(table)]
+            owned.pop(table, None)
+            pending[table] = None
+
+        def add_table(name: str, info: dict[str, list[str]]) -> None:
+            drop_table(name)
+            table = normalize(name)
+            raw[name] = info
+            raw_names[table] = name
+            pending[table] = {normalize(c) for c in info.get("columns", [])}
+
+        def rename_table(old: str, new: str) -> None:
+            table = normalize(old)
+            if table not in raw_names:
+                return
+            cols = columns_of(table)
+            info = raw.pop(raw_names.pop(table))
+            entry = owned.pop(table, None)
+            pending[table] = None
+            drop_table(new)
+            new_table = normalize(new)
+            raw[new] = info
+            raw_names[new_table] = new
+            pending[new_table] = cols
+            if entry is not None:
+                owned[new_table] = entry
+
+        def drop_column(table: str, name: str) -> None:
+            col = normalize(name)
+            if table not in raw_names or col not in columns_of(table):
+                return
+            entry = raw_entry(table)
+            columns, types = entry["columns"], entry.get("types", [])
+            for i in reversed(range(len(columns))):
+                if normalize(columns[i]) == col:
+                    del columns[i]
+                    if i < len(types):
+                        del types[i]
+            columns_of(table).discard(col)
+
+        def add_column(table: str, name: str, col_type: Optional[str]) -> None:
+            col = normalize(name)
+            if table not in raw_names or col in columns_of(table):
+                return
+            entry = raw_entry(table)
+            if col_type is not None:
+                types = entry.setdefault("types", [])
+                types.extend([None] * (len(entry["columns"]) - len(types)))
+                types.append(col_type)
+            entry["columns"].append(name)
+            columns_of(table).add(col)
+
+        def rename_column(table: str, old: str, new: str) -> None:
+            col, new_col = normalize(old), normalize(new)
+            if table not in raw_names or col not in columns_of(table):
+                return
+            if new_col != col:
+                drop_column(table, new)
+            columns = raw_entry(table)["columns"]
+            for i, raw_col in enumerate(columns):
+                if normalize(raw_col) == col:
+                    columns[i] = new
+            cols = columns_of(table)
+            cols.discard(col)
+            cols.add(new_col)
+
+        # ----- Apply the delta in a fixed order -----
+        for name in dropped_tables:
+            drop_table(name)
+        for old, new in renamed.items():
+            if isinstance(old, tuple):
+                rename_column(normalize(old[0]), old[1], new)
+            else:
+                rename_table(old, new)
+        for name, cols in dropped_columns.items():
+            for col in cols:
+                drop_column(normalize(name), col)
+        for name, info in added_tables.items():
+            add_table(name, info)
+        for name, info in added_columns.items():
+            table = normalize(name)
+            types = info.get("types", [])
+            for i, col in enumerate(info.get("columns", [])):
+                add_column(table, col, types[i] if i < len(types) else None)
+
+        # ----- Rebuild the touched tables and the column counts -----
+        columns_before: dict[str, bool] = {}
+        for table in pending:
+            old = tables.pop(table, {})
+            if table in raw_names:
+                tables[table] = self._index_columns(raw[raw_names[table]])
+            new = tables.get(table, {})
+            for col in old.keys() - new.keys():
+                columns_before.setdefault(col, True)
+                remaining = lookup[col] - 1
+                if remaining:
+                    lookup[col] = remaining
+                else:
+                    del lookup[col]
+            for col in new.keys() - old.keys():
+                columns_before.setdefault(col, col in lookup)
+                lookup[col] = lookup.get(col, 0) + 1
+
+        changed_columns = {
+            col for col, was in columns_before.items() if was != (col in lookup)
+        }
+        return set(pending), changed_columns
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Write the schema to a binary snapshot for ``from_snapshot``.
+
+        The snapshot holds the compact index (see ``sqldrift.compact``) and
+        the validator's ``case_sensitive`` setting.
+
+        Args:
+            path: Destination file path.
+        """
+        state = self._state
+        compact = state.compact
+        if compact is None:
+            compact = CompactSchema.from_dict(state.raw, self._normalize)
+        compact.save(path, metadata={"case_sensitive": self.case_sensitive})
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        path: str,
+        *,
+        mmap: bool = True,
+        **kwargs,
+    ) -> "ColumnValidator":
+        """
+        Create a validator from a snapshot written by ``save_snapshot``.
+
+        With ``mmap=True`` the snapshot is memory-mapped read-only: start-up
+        does not rebuild any lookups, and processes loading the same file
+        share its pages instead of each holding a private copy. The
+        validator uses the compact backend; ``update_schema`` builds a new
+        in-memory index as usual.
+
+        Args:
+            path: Snapshot file path.
+            mmap: Memory-map the file instead of reading it.
+                Defaults to ``True``.
+            **kwargs: Extra constructor arguments (e.g. ``cache_size`` for
+                ``CachedColumnValidator``). ``case_sensitive`` and
+                ``compact`` are fixed by the snapshot and may only be passed
+                with the values it was saved with.
+
+        Returns:
+            A validator serving lookups from the snapshot.
+
+        Raises:
+            ValueError: If ``case_sensitive`` or ``compact`` conflicts with
+                the snapshot.
+        """
+        compact = CompactSchema.load(path, mmap)
+        fixed = {
+            "case_sensitive": compact.metadata.get("case_sensitive", False),
+            "compact": True,
+        }
+        for key, value in fixed.items():
+            if kwargs.pop(key, value) != value:
+                raise ValueError(f"{path} was saved with {key}={value}")
+        validator = cls({}, **fixed, **kwargs)
+        validator._state = _ColumnSnapshot.from_compact(compact)
+        return validator
+
+    def _share(self) -> tuple["ColumnValidator", list[SharedMemory]]:
+        """
+        Prepare a copy of the validator for shipping to worker processes.
+
+        The column index is placed in shared memory; the returned copy
+        pickles as a reference to it, so every worker attaches to one copy
+        instead of unpickling and holding its own. A file-backed snapshot is
+        already shared through the page cache and is shipped as is.
+
+        Returns:
+            The copy to ship, and the shared memory blocks the caller must
+            close and unlink once the workers are done.
+        """
+        state = self._state
+        compact = state.compact
+        if compact is not None and compact._source is not None:
+            return self, []
+        if compact is None:
+            compact = CompactSchema.from_dict(state.raw, self._normalize)
+        block = compact.share()
+        shipped = copy.copy(self)
+        shipped._state = _ColumnSnapshot.from_compact(compact.shared_as(block.name))
+        return shipped, [block]
 
     def get_table_count(self) -> int:
         """Return the number of tables in the schema."""
-        return len(self._schema)
+        return len(self._state.schema)
 
     def get_column_count(self, table: str) -> int | None:
         """Return the number of columns in a table, or None if not found."""
         norm = self._normalize(table)
-        if norm in self._schema:
-            return len(self._schema[norm])
+        schema = self._state.schema
+        if norm in schema:
+            return len(schema[norm])
         return None
 
     def column_exists(self, table: str, column: str) -> bool:
         """Check if a specific column exists in a table."""
         norm_table = self._normalize(table)
         norm_col = self._normalize(column)
-        if norm_table in self._schema:
-            return norm_col in self._schema[norm_table]
+        schema = self._state.schema
+        if norm_table in schema:
+            return norm_col in schema[norm_table]
         return False
 
     def get_column_info(
         self, table: str, column: str
-    ) -> Optional[dict[str, str]]:
+    ) -> Optional[dict[str, Union[str, int]]]:
         """
         Get information about a specific column.
 
@@ -361,61 +1144,128 @@ class ColumnValidator:
             column: Column name.
 
         Returns:
-            Dictionary with ``table``, ``column``, and optionally ``type``
-            keys, or ``None`` if not found.
+            Dictionary with ``table``, ``column`` (original case),
+            ``position`` (0-based ordinal in the table) and optionally
+            ``type`` keys, or ``None`` if not found.
         """
-        norm_table = self._normalize(table)
-        norm_col = self._normalize(column)
+        return self._column_info(
+            self._state, self._normalize(table), self._normalize(column)
+        )
 
-        if norm_table not in self._schema or norm_col not in self._schema[norm_table]:
-            return None
+    def get_columns_info(
+        self, pairs: Iterable[tuple[str, str]]
+    ) -> list[Optional[dict[str, Union[str, int]]]]:
+        """
+        Get information about many columns against one schema snapshot.
 
-        # Find the original-case names and type from raw schema
-        for raw_table, info in self._schema_raw.items():
-            if self._normalize(raw_table) == norm_table:
-                raw_columns = info.get("columns", [])
-                raw_types = info.get("types", [])
-                for i, c in enumerate(raw_columns):
-                    if self._normalize(c) == norm_col:
-                        result: dict[str, str] = {
-                            "table": raw_table,
-                            "column": c,
-                        }
-                        if i < len(raw_types):
-                            result["type"] = raw_types[i]
-                        return result
+        Args:
+            pairs: ``(table, column)`` tuples.
 
-        return None
+        Returns:
+            One ``get_column_info`` result per pair, in input order.
+        """
+        state = self._state
+        normalize = self._normalize
+        return [
+            self._column_info(state, normalize(table), normalize(column))
+            for table, column in pairs
+        ]
+
+    def _column_info(
+        self, state: _ColumnSnapshot, norm_table: str, norm_col: str
+    ) -> Optional[dict[str, Union[str, int]]]:
+        """Look up a normalized ``(table, column)`` in a snapshot."""
+        if state.compact is not None:
+            return state.compact.column_info(norm_table, norm_col)
+
+        entry = state.schema.get(norm_table, {}).get(norm_col)
+        if entry is None:
+            return None
+        raw_col, col_type, position = entry
+        result: dict[str, Union[str, int]] = {
+            "table": state.raw_names[norm_table],
+            "column": raw_col,
+            "position": position,
+        }
+        if col_type is not None:
+            result["type"] = col_type
+        return result
 
     # ------------------------------------------------------------------
     # Suggestions
     # ------------------------------------------------------------------
 
-    def suggest_alternatives(self, column: str) -> list[str]:
+    def suggest_alternatives(
+        self,
+        column: str,
+        *,
+        tables: Iterable[str] = (),
+        max_results: int = 5,
+    ) -> list[str]:
         """
         Suggest alternative column names for a missing column.
 
-        Uses substring matching to find similar column names across
-        all tables in the schema.
+        Columns of ``tables`` are ranked first; the remaining slots come
+        from a trigram index over every distinct column name in the schema,
+        built once per schema, so a lookup does not scan every table. A
+        column matches when it is within a small edit distance of
+        ``column`` (e.g. ``nme`` vs ``name``), has similar trigrams (e.g.
+        ``cust_name`` vs ``customer_name``), contains ``column`` or shares
+        its first three characters.
 
         Args:
             column: The column name that was not found.
+            tables: Tables the column was expected in, typically the
+                query's FROM tables.
+            max_results: Maximum number of suggestions to return.
 
         Returns:
-            List of suggestions in ``table.column`` format.
+            List of suggestions in ``table.column`` format, closest first.
         """
-        norm_col = self._normalize(column)
-        suggestions: list[str] = []
+        state = self._state
+        scope = [
+            t for t in map(self._normalize, tables) if t in state.schema
+        ]
+        return self._suggest_columns(
+            column, state, scope, max_results=max_results
+        )
 
-        for raw_table, info in self._schema_raw.items():
-            for raw_col in info.get("columns", []):
-                norm_raw = self._normalize(raw_col)
-                if (
-                    norm_col in norm_raw
-                    or norm_raw in norm_col
-                ):
-                    suggestions.append(f"{raw_table}.{raw_col}")
+    def _suggest_columns(
+        self,
+        column: str,
+        state: _ColumnSnapshot,
+        scope: Iterable[str] = (),
+        *,
+        max_results: int = 5,
+    ) -> list[str]:
+        """Suggest alternative columns from a snapshot, ``scope`` tables first."""
+        norm_col = self._normalize(column)
+        max_edits = edit_budget(norm_col)
+
+        # Columns of the tables the query reads are few: score them all
+        scored: list[tuple[float, str, str]] = []
+        for table in scope:
+            for col in state.schema[table]:
+                score = match_score(norm_col, col, max_edits=max_edits)
+                if score is not None:
+                    scored.append((-score, col, table))
+        pairs = [(table, col) for _, col, table in sorted(scored)]
+        pairs = pairs[:max_results]
+
+        if len(pairs) < max_results:
+            index, tables_of = state.suggester()
+            seen = set(pairs)
+            for col in index.suggest(
+                norm_col, max_results=max_results, max_edits=max_edits
+            ):
+                for table in sorted(tables_of[col]):
+                    if (table, col) not in seen and len(pairs) < max_results:
+                        pairs.append((table, col))
 
+        suggestions: list[str] = []
+        for table, col in pairs:
+            info = self._column_info(state, table, col)
+            suggestions.append(f"{info['table']}.{info['column']}")
         return suggestions
 
 
@@ -423,10 +1273,32 @@ class CachedColumnValidator(ColumnValidator):
     """
     Extended column validator with LRU caching for repeated queries.
 
+    The cache is keyed on a literal-insensitive query fingerprint, so
+    queries that differ only in literal values share one entry.
+
     Args:
         schema: Dictionary mapping table names to column definitions.
         case_sensitive: If ``True``, column name matching is case-sensitive.
+        compact: If ``True``, use the compact schema backend.
+        message_limit: Maximum number of available columns listed per
+            missing column in a drift message. Defaults to ``20``.
         cache_size: Maximum number of queries to cache. Defaults to ``128``.
+        cache_policy: Eviction policy of the in-memory cache: ``"lru"``, or
+            ``"tinylfu"`` to keep frequently used entries through bursts of
+            one-off queries (see ``sqldrift.policy``). Defaults to ``"lru"``.
+        fingerprint: If ``True``, key the cache on a literal-insensitive
+            query fingerprint so that queries differing only in literals,
+            comments or whitespace (and, when not ``case_sensitive``, case)
+            share one entry. If ``False``, key on the raw SQL string.
+            Defaults to ``True``.
+        executor: Thread-based executor used by ``avalidate`` to run
+            parsing off the event loop. Defaults to ``None`` (the running
+            loop's default executor).
+        cache_path: Path of a SQLite file that keeps results across
+            restarts and is shared by processes on the same host (see
+            ``sqldrift.persistent``). Defaults to ``None`` (memory only).
+        disk_cache_size: Maximum number of results kept in ``cache_path``.
+            Defaults to ``100_000``.
 
     Examples:
         >>> cached = CachedColumnValidator(schema, cache_size=256)
@@ -441,52 +1313,246 @@ class CachedColumnValidator(ColumnValidator):
         schema: SchemaDict,
         *,
         case_sensitive: bool = False,
+        compact: bool = False,
+        message_limit: int = DEFAULT_MESSAGE_LIMIT,
         cache_size: int = 128,
+        cache_policy: str = "lru",
+        fingerprint: bool = True,
+        executor: Optional[Executor] = None,
+        cache_path: Optional[str] = None,
+        disk_cache_size: int = 100_000,
     ):
-        super().__init__(schema, case_sensitive=case_sensitive)
+        super().__init__(
+            schema,
+            case_sensitive=case_sensitive,
+            compact=compact,
+            message_limit=message_limit,
+        )
         self.cache_size = cache_size
-        self._validate_cached = lru_cache(maxsize=cache_size)(
-            self._validate_internal
+        self.executor = executor
+        self.cache_path = cache_path
+        store = None
+        if cache_path is not None:
+            store = PersistentCache(
+                cache_path, owner_namespace(self), max_entries=disk_cache_size
+            )
+        # Namespace of the last snapshot it was computed for
+        self._namespace: tuple[object, str] = (None, "")
+        self._cache = ValidationCache(
+            cache_size,
+            use_fingerprint=fingerprint,
+            case_sensitive=case_sensitive,
+            store=store,
+            policy=cache_policy,
         )
 
+    def __getstate__(self) -> dict:
+        # Executors do not pickle; a shipped copy uses the loop default. The
+        # namespace memo holds a snapshot, which may not be the one shipped
+        state = super().__getstate__()
+        state["executor"] = None
+        state["_namespace"] = (None, "")
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        # The disk store does not pickle its namespace callable
+        if self._cache.store is not None:
+            self._cache.store.namespace = owner_namespace(self)
+
     def _validate_internal(
         self,
         sql_query: str,
         dialect: Optional[str] = None,
-    ) -> tuple[bool, str]:
+    ) -> tuple[ValidationResult, Dependencies]:
         """Internal validation method that gets cached."""
-        return super().validate(sql_query, dialect=dialect)
+        return self._validate_with_deps(sql_query, dialect)
+
+    def _cached_result(
+        self, sql_query: Query, dialect: Optional[str]
+    ) -> ValidationResult:
+        """
+        Return the cached result of SQL text, computing it on a miss.
+
+        Parsed expressions skip the cache (see
+        ``CachedSchemaValidator._cached_result``).
+        """
+        if not isinstance(sql_query, str):
+            return self._validate_with_deps(sql_query, dialect)[0]
+        return self._cache.get_or_compute(
+            sql_query,
+            dialect,
+            lambda: self._validate_internal(sql_query, dialect),
+        )
+
+    def _cache_namespace(self) -> tuple[object, str]:
+        """
+        Return the current snapshot and the on-disk namespace of its results.
+
+        The namespace combines the validator options with a hash of every
+        table name and ``(table, column)`` pair, and is computed once per
+        snapshot.
+        """
+        state = self._state
+        token, namespace = self._namespace
+        if token is state:
+            return token, namespace
+        options = (
+            f"{type(self).__name__}:{self.case_sensitive}:"
+            f"{self.compact}:{self.message_limit}"
+        )
+        # JSON-encoded parts cannot collide on dotted names, and tables
+        # without columns still change the hash
+        digest = schema_digest(
+            chain(
+                (json.dumps([table]) for table in state.schema),
+                (
+                    json.dumps([table, col])
+                    for table, col in self._iter_raw_columns(state)
+                ),
+            )
+        )
+        namespace = f"{options}:{digest}"
+        self._namespace = (state, namespace)
+        return state, namespace
 
     def validate(
         self,
-        sql_query: str,
+        sql_query: Query,
         *,
         dialect: Optional[str] = None,
     ) -> tuple[bool, str]:
         """Validate with caching support."""
-        return self._validate_cached(sql_query, dialect)
+        return self._cached_result(sql_query, dialect).as_tuple()
+
+    def validate_result(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+        keep_ast: bool = False,
+    ) -> ValidationResult:
+        """
+        Return a structured result, with caching support.
+
+        Cached results are shared and carry no AST, so ``keep_ast=True``
+        always parses and validates afresh.
+        """
+        if keep_ast:
+            return self._validate_with_deps(sql_query, dialect, keep_ast)[0]
+        return self._cached_result(sql_query, dialect)
+
+    def is_valid(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+    ) -> bool:
+        """
+        Return whether a query is valid, with caching support.
+
+        Cached results answer directly. On a miss the query is validated in
+        full -- diagnostics are only computed for failures -- so the
+        ``validate`` call that usually follows a ``False`` is a cache hit.
+        """
+        return self._cached_result(sql_query, dialect).ok
+
+    async def avalidate(
+        self,
+        sql_query: str,
+        *,
+        dialect: Optional[str] = None,
+    ) -> tuple[bool, str]:
+        """
+        Validate without blocking the event loop.
+
+        Cache hits on the exact SQL text are answered inline; everything
+        else runs in ``self.executor``. Concurrent calls for the same query
+        share one in-flight computation, and completed results land in the
+        same cache ``validate`` uses.
+        """
+        result = await self._cache.aget_or_compute(
+            sql_query,
+            dialect,
+            lambda: self._validate_internal(sql_query, dialect),
+            self.executor,
+        )
+        return result.as_tuple()
+
+    async def avalidate_many(
+        self,
+        queries: Iterable[str],
+        *,
+        dialect: Optional[str] = None,
+    ) -> list[tuple[bool, str]]:
+        """
+        Validate many queries concurrently, returning results in input order.
+
+        Duplicate queries in the batch are coalesced into one computation.
+        """
+        import asyncio
+
+        return list(
+            await asyncio.gather(
+                *(self.avalidate(sql, dialect=dialect) for sql in queries)
+            )
+        )
+
+    def update_schema(self, schema: SchemaDict) -> None:
+        """
+        Update the schema and evict only the affected cache entries.
+
+        Cached successes are kept unless they reference a table that was
+        added, dropped or had its columns changed, or an unqualified column
+        name that appeared in or disappeared from the schema. Cached failures
+        are always evicted because their suggestions span the whole schema.
+
+        Args:
+            schema: New schema dictionary.
+        """
+        changed_tables, changed_columns = self._replace_snapshot(
+            self._build_snapshot(schema)
+        )
+        self._cache.invalidate(changed_tables, changed_columns)
+
+    def apply_changes(
+        self,
+        *,
+        added_tables: Optional[SchemaDict] = None,
+        dropped_tables: Iterable[str] = (),
+        added_columns: Optional[SchemaDict] = None,
+        dropped_columns: Optional[Mapping[str, Iterable[str]]] = None,
+        renamed: Optional[Mapping[Union[str, tuple[str, str]], str]] = None,
+    ) -> None:
+        """
+        Apply an incremental schema change and evict the affected entries.
+
+        See ``ColumnValidator.apply_changes``.
+        """
+        changed_tables, changed_columns = self._apply_column_changes(
+            added_tables or {},
+            dropped_tables,
+            added_columns or {},
+            dropped_columns or {},
+            renamed or {},
+        )
+        self._cache.invalidate(changed_tables, changed_columns)
 
     def clear_cache(self) -> None:
         """Clear the validation cache."""
-        self._validate_cached.cache_clear()
+        self._cache.clear()
 
     def get_cache_info(self) -> dict:
         """
         Get cache statistics.
 
+        ``hits`` is the sum of ``exact_hits`` (the same SQL text was seen
+        before) and ``fingerprint_hits`` (a query of the same shape, e.g.
+        differing only in literals, was seen before).
+
         Returns:
-            A dictionary with keys: ``hits``, ``misses``, ``size``,
-            ``maxsize``, ``hit_rate``.
-        """
-        info = self._validate_cached.cache_info()
-        return {
-            "hits": info.hits,
-            "misses": info.misses,
-            "size": info.currsize,
-            "maxsize": info.maxsize,
-            "hit_rate": (
-                info.hits / (info.hits + info.misses)
-                if (info.hits + info.misses) > 0
-                else 0.0
-            ),
-        }
+            A dictionary with keys: ``hits``, ``exact_hits``,
+            ``fingerprint_hits``, ``misses``, ``size``, ``maxsize``,
+            ``hit_rate``.
+        """
+        return self._cache.info()
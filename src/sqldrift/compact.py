@@ -0,0 +1,675 @@
+"""
+Compact, interned schema index for very large catalogs.
+
+The default ``ColumnValidator`` lookups hold a Python ``set`` of strings per
+table plus a ``column -> [tables]`` dict, and keep the caller's raw schema
+alive for ``get_column_info``. At tens of thousands of tables and millions of
+columns that is gigabytes of small objects.
+
+``CompactSchema`` stores the same information in a handful of flat integer
+arrays over one sorted string pool:
+
+- every distinct string (normalized and original names, types) is stored once
+  in a UTF-8 blob; its id is its rank in sorted order, and an open-addressing
+  table of ids keyed by CRC-32 finds a name without a ``str -> id`` dict
+- tables are sorted by normalized-name id; each owns a contiguous, sorted run
+  of column entries, so column membership is a binary search within the run
+- a reverse index maps each column-name id to the tables containing it
+
+``ColumnValidator(schema, compact=True)`` uses it through read-only mapping
+views with the same behaviour as the default dict/set lookups.
+
+Because everything lives in flat buffers, the index can be written to a
+binary snapshot (``CompactSchema.save``) and loaded back with ``mmap``
+(``CompactSchema.load``): the arrays are then ``memoryview`` casts over the
+mapped file, so loading is near-instant and every process mapping the same
+snapshot shares one copy through the page cache. The same layout can be
+placed in a ``multiprocessing.shared_memory`` block (``CompactSchema.share``)
+that worker processes attach to by name (``CompactSchema.attach``).
+"""
+
+import json
+import mmap as mmap_module
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Set
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Iterator, Optional
+
+
+# Marker for "no id": an empty hash slot, or a column without a type
+_NO_ID = 0xFFFFFFFF
+
+# Snapshot layout: magic, 8-byte little-endian header length, JSON header,
+# then each array at an 8-byte aligned offset of the data section
+_SNAPSHOT_MAGIC = b"SQLDRIFT"
+_SNAPSHOT_VERSION = 2
+
+# Constructor arguments in order, with their array typecodes
+_FIELDS = (
+    ("blob", "B"),
+    ("offsets", "Q"),
+    ("slots", "I"),
+    ("table_names", "I"),
+    ("table_originals", "I"),
+    ("table_starts", "Q"),
+    ("table_order", "I"),
+    ("column_names", "I"),
+    ("column_originals", "I"),
+    ("column_types", "I"),
+    ("column_positions", "I"),
+    ("lookup_names", "I"),
+    ("lookup_starts", "Q"),
+    ("lookup_tables", "I"),
+)
+
+
+class CompactSchema:
+    """
+    Immutable, array-backed schema index.
+
+    Build one with ``CompactSchema.from_dict``. All names passed to lookup
+    methods must already be normalized the same way as during the build.
+
+    Args:
+        blob: Concatenated UTF-8 bytes of the sorted string pool.
+        offsets: ``len(pool) + 1`` byte offsets into ``blob``.
+        slots: Open-addressing hash table of pool ids (power-of-two size,
+            linear probing on ``zlib.crc32`` of the UTF-8 name).
+        table_names: Normalized-name id of each table, ascending.
+        table_originals: Original-name id of each table.
+        table_starts: ``len(tables) + 1`` offsets into the column arrays.
+        table_order: Table indices in the order of the source schema.
+        column_names: Normalized-name id of each column, ascending per table.
+        column_originals: Original-name id of each column.
+        column_types: Type-name id of each column, or ``0xFFFFFFFF``.
+        column_positions: Ordinal position of each column in its table.
+        lookup_names: Distinct normalized column-name ids, ascending.
+        lookup_starts: ``len(lookup_names) + 1`` offsets into
+            ``lookup_tables``.
+        lookup_tables: Table indices containing each column name.
+    """
+
+    def __init__(
+        self,
+        blob,
+        offsets,
+        slots,
+        table_names,
+        table_originals,
+        table_starts,
+        table_order,
+        column_names,
+        column_originals,
+        column_types,
+        column_positions,
+        lookup_names,
+        lookup_starts,
+        lookup_tables,
+    ):
+        self._blob = blob
+        self._offsets = offsets
+        self._slots = slots
+        self._mask = len(slots) - 1
+        self._table_names = table_names
+        self._table_originals = table_originals
+        self._table_starts = table_starts
+        self._table_order = table_order
+        self._column_names = column_names
+        self._column_originals = column_originals
+        self._column_types = column_types
+        self._column_positions = column_positions
+        self._lookup_names = lookup_names
+        self._lookup_starts = lookup_starts
+        self._lookup_tables = lookup_tables
+        # Free-form metadata stored alongside a snapshot
+        self.metadata: dict = {}
+        # ``(loader, args)`` re-opening the same buffers (a snapshot file or
+        # a shared memory block), so pickling does not copy them
+        self._source: Optional[tuple[Callable, tuple]] = None
+
+    def __reduce__(self):
+        if self._source is not None:
+            return self._source
+        arrays = tuple(
+            bytes(self._blob) if code == "B"
+            else array(code, getattr(self, "_" + name))
+            for name, code in _FIELDS
+        )
+        return (_restore, (arrays, self.metadata))
+
+    def _arrays(self) -> tuple:
+        """Return the constructor arguments, sharing the buffers."""
+        return tuple(getattr(self, "_" + name) for name, _ in _FIELDS)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_dict(
+        cls,
+        schema: dict[str, dict[str, list[str]]],
+        normalize: Callable[[str], str],
+    ) -> "CompactSchema":
+        """
+        Build a compact index from a ``SchemaDict``.
+
+        When several raw names normalize to the same table, the last one
+        wins (matching the default lookups); within a table the first
+        occurrence of a normalized column name wins.
+
+        Args:
+            schema: Dictionary mapping table names to column definitions.
+            normalize: Name normalization function of the owning validator.
+        """
+        # norm table -> (original table, {norm col: (orig col, type, pos)})
+        tables: dict[str, tuple[str, dict[str, tuple[str, Optional[str], int]]]] = {}
+        for raw_table, info in schema.items():
+            raw_types = info.get("types", [])
+            columns: dict[str, tuple[str, Optional[str], int]] = {}
+            for pos, raw_col in enumerate(info.get("columns", [])):
+                norm_col = normalize(raw_col)
+                if norm_col not in columns:
+                    col_type = raw_types[pos] if pos < len(raw_types) else None
+                    columns[norm_col] = (raw_col, col_type, pos)
+            tables[normalize(raw_table)] = (raw_table, columns)
+
+        # ----- Intern every string into one sorted pool -----
+        strings: set[str] = set()
+        for norm_table, (raw_table, columns) in tables.items():
+            strings.add(norm_table)
+            strings.add(raw_table)
+            for norm_col, (raw_col, col_type, _) in columns.items():
+                strings.add(norm_col)
+                strings.add(raw_col)
+                if col_type is not None:
+                    strings.add(col_type)
+        pool = sorted(strings)
+        ids = {s: i for i, s in enumerate(pool)}
+
+        encoded = [s.encode("utf-8") for s in pool]
+        offsets = array("Q", [0])
+        total = 0
+        for chunk in encoded:
+            total += len(chunk)
+            offsets.append(total)
+        blob = b"".join(encoded)
+
+        size = 2
+        while size < 2 * len(encoded):
+            size *= 2
+        slots = array("I", [_NO_ID]) * size
+        mask = size - 1
+        for string_id, chunk in enumerate(encoded):
+            h = zlib.crc32(chunk) & mask
+            while slots[h] != _NO_ID:
+                h = (h + 1) & mask
+            slots[h] = string_id
+
+        # ----- Tables and their sorted column runs -----
+        table_names = array("I")
+        table_originals = array("I")
+        table_starts = array("Q", [0])
+        column_names = array("I")
+        column_originals = array("I")
+        column_types = array("I")
+        column_positions = array("I")
+        by_column: dict[int, list[int]] = {}
+
+        ordered = sorted(tables, key=ids.__getitem__)
+        for t_index, norm_table in enumerate(ordered):
+            raw_table, columns = tables[norm_table]
+            table_names.append(ids[norm_table])
+            table_originals.append(ids[raw_table])
+            for norm_col in sorted(columns, key=ids.__getitem__):
+                raw_col, col_type, pos = columns[norm_col]
+                col_id = ids[norm_col]
+                column_names.append(col_id)
+                column_originals.append(ids[raw_col])
+                column_types.append(_NO_ID if col_type is None else ids[col_type])
+                column_positions.append(pos)
+                by_column.setdefault(col_id, []).append(t_index)
+            table_starts.append(len(column_names))
+
+        index_of = {norm_table: i for i, norm_table in enumerate(ordered)}
+        table_order = array("I", (index_of[t] for t in tables))
+
+        # ----- Reverse index: column name -> tables -----
+        lookup_names = array("I")
+        lookup_starts = array("Q", [0])
+        lookup_tables = array("I")
+        for col_id in sorted(by_column):
+            lookup_names.append(col_id)
+            lookup_tables.extend(by_column[col_id])
+            lookup_starts.append(len(lookup_tables))
+
+        return cls(
+            blob,
+            offsets,
+            slots,
+            table_names,
+            table_originals,
+            table_starts,
+            table_order,
+            column_names,
+            column_originals,
+            column_types,
+            column_positions,
+            lookup_names,
+            lookup_starts,
+            lookup_tables,
+        )
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def _layout(
+        self, metadata: Optional[dict]
+    ) -> tuple[bytes, list[tuple[int, memoryview]], int]:
+        """
+        Lay out the snapshot format.
+
+        Returns:
+            A tuple of the header (magic, length and JSON), the
+            ``(absolute offset, bytes)`` of each array, and the total size.
+        """
+        views = []
+        entries = []
+        position = 0
+        for name, code in _FIELDS:
+            view = memoryview(getattr(self, "_" + name)).cast("B")
+            position = (position + 7) & ~7
+            itemsize = array(code).itemsize
+            entries.append([name, code, itemsize, len(view) // itemsize, position])
+            views.append((position, view))
+            position += len(view)
+
+        header = json.dumps({
+            "version": _SNAPSHOT_VERSION,
+            "byteorder": sys.byteorder,
+            "metadata": metadata if metadata is not None else self.metadata,
+            "arrays": entries,
+        }).encode("utf-8")
+        prefix = _SNAPSHOT_MAGIC + len(header).to_bytes(8, "little") + header
+        data_start = (len(prefix) + 7) & ~7
+
+        return (
+            prefix,
+            [(data_start + offset, view) for offset, view in views],
+            data_start + position,
+        )
+
+    def save(self, path: str, *, metadata: Optional[dict] = None) -> None:
+        """
+        Write the index to a binary snapshot file.
+
+        Args:
+            path: Destination file path.
+            metadata: JSON-serializable metadata stored in the header
+                (e.g. the normalization settings of the owning validator).
+        """
+        prefix, views, _ = self._layout(metadata)
+        with open(path, "wb") as f:
+            f.write(prefix)
+            written = len(prefix)
+            for offset, view in views:
+                f.write(b"\0" * (offset - written))
+                f.write(view)
+                written = offset + len(view)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CompactSchema":
+        """
+        Load an index from a binary snapshot file.
+
+        Args:
+            path: Snapshot file written by ``save``.
+            mmap: If ``True``, memory-map the file read-only; the arrays are
+                views over the mapping and nothing is copied. If ``False``,
+                read the file into memory. Defaults to ``True``.
+
+        Raises:
+            ValueError: If the file is not a compatible snapshot.
+        """
+        with open(path, "rb") as f:
+            if mmap:
+                buffer = mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ)
+            else:
+                buffer = f.read()
+
+        schema = cls._from_buffer(buffer, str(path))
+        schema._source = (CompactSchema.load, (str(path), mmap))
+        return schema
+
+    def share(self, *, metadata: Optional[dict] = None) -> SharedMemory:
+        """
+        Copy the index into a new shared memory block.
+
+        Other processes attach to it by name with ``attach``, mapping the
+        one copy instead of each holding their own. The caller owns the
+        block and must ``close()`` and ``unlink()`` it once every attached
+        process is done with it.
+
+        Args:
+            metadata: JSON-serializable metadata stored in the header.
+
+        Returns:
+            The new ``SharedMemory`` block.
+        """
+        prefix, views, size = self._layout(metadata)
+        block = SharedMemory(create=True, size=size)
+        try:
+            block.buf[:len(prefix)] = prefix
+            for offset, view in views:
+                block.buf[offset:offset + len(view)] = view
+        except BaseException:
+            block.close()
+            block.unlink()
+            raise
+        return block
+
+    @classmethod
+    def attach(cls, name: str) -> "CompactSchema":
+        """
+        Attach to an index placed in shared memory by ``share``.
+
+        The arrays are views over the block; nothing is copied.
+
+        Args:
+            name: Name of the shared memory block.
+
+        Raises:
+            ValueError: If the block does not hold a compatible index.
+        """
+        block = SharedMemory(name=name)
+        schema = cls._from_buffer(block.buf, f"shared memory block {name!r}")
+        schema._source = (CompactSchema.attach, (name,))
+        # Set after the array views so they are released before the block
+        schema._block = block
+        return schema
+
+    def shared_as(self, name: str) -> "CompactSchema":
+        """
+        Return a copy of this index that pickles as a reference to ``name``.
+
+        The copy shares this index's buffers; unpickling it calls ``attach``.
+        Use it to ship an index to worker processes after ``share``.
+        """
+        schema = CompactSchema(*self._arrays())
+        schema.metadata = self.metadata
+        schema._source = (CompactSchema.attach, (name,))
+        return schema
+
+    @classmethod
+    def _from_buffer(cls, buffer: Any, label: str) -> "CompactSchema":
+        """Build an index over a buffer in the snapshot format."""
+        view = memoryview(buffer)
+        if bytes(view[:len(_SNAPSHOT_MAGIC)]) != _SNAPSHOT_MAGIC:
+            raise ValueError(f"{label} is not a sqldrift schema snapshot")
+        prefix = len(_SNAPSHOT_MAGIC)
+        header_len = int.from_bytes(view[prefix:prefix + 8], "little")
+        header = json.loads(bytes(view[prefix + 8:prefix + 8 + header_len]))
+        if header.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(
+                f"unsupported snapshot version {header.get('version')!r}"
+            )
+        data_start = (prefix + 8 + header_len + 7) & ~7
+        swap = header["byteorder"] != sys.byteorder
+
+        arrays = []
+        for name, code, itemsize, length, offset in header["arrays"]:
+            if array(code).itemsize != itemsize:
+                raise ValueError(
+                    f"snapshot array {name!r} uses {itemsize}-byte items; "
+                    f"this platform's {code!r} items are {array(code).itemsize}"
+                )
+            start = data_start + offset
+            part = view[start:start + length * itemsize]
+            if code == "B":
+                arrays.append(part)
+            elif swap:
+                # Foreign byte order: fall back to a private, swapped copy
+                converted = array(code, bytes(part))
+                converted.byteswap()
+                arrays.append(converted)
+            else:
+                arrays.append(part.cast(code))
+
+        schema = cls(*arrays)
+        schema.metadata = header.get("metadata", {})
+        return schema
+
+    # ------------------------------------------------------------------
+    # String pool
+    # ------------------------------------------------------------------
+
+    def _string(self, string_id: int) -> str:
+        """Decode a pooled string by id."""
+        offsets = self._offsets
+        return bytes(
+            self._blob[offsets[string_id]:offsets[string_id + 1]]
+        ).decode("utf-8")
+
+    def _find(self, name: str) -> int:
+        """Return the pool id of ``name``, or ``-1`` if it is not pooled."""
+        key = name.encode("utf-8")
+        blob, offsets, slots, mask = self._blob, self._offsets, self._slots, self._mask
+        h = zlib.crc32(key) & mask
+        while True:
+            string_id = slots[h]
+            if string_id == _NO_ID:
+                return -1
+            if blob[offsets[string_id]:offsets[string_id + 1]] == key:
+                return string_id
+            h = (h + 1) & mask
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def table_index(self, table: str) -> int:
+        """Return the index of a normalized table name, or ``-1``."""
+        name_id = self._find(table)
+        if name_id < 0:
+            return -1
+        names = self._table_names
+        i = bisect_left(names, name_id)
+        if i < len(names) and names[i] == name_id:
+            return i
+        return -1
+
+    def _column_slot(self, t_index: int, column: str) -> int:
+        """Return the column-array slot of a column in a table, or ``-1``."""
+        name_id = self._find(column)
+        if name_id < 0:
+            return -1
+        lo = self._table_starts[t_index]
+        hi = self._table_starts[t_index + 1]
+        i = bisect_left(self._column_names, name_id, lo, hi)
+        if i < hi and self._column_names[i] == name_id:
+            return i
+        return -1
+
+    def table_count(self) -> int:
+        """Return the number of tables."""
+        return len(self._table_names)
+
+    def column_info(self, table: str, column: str) -> Optional[dict[str, Any]]:
+        """
+        Return original-case names, position and type of a column, or ``None``.
+
+        Args:
+            table: Normalized table name.
+            column: Normalized column name.
+        """
+        t_index = self.table_index(table)
+        if t_index < 0:
+            return None
+        slot = self._column_slot(t_index, column)
+        if slot < 0:
+            return None
+        result = {
+            "table": self._string(self._table_originals[t_index]),
+            "column": self._string(self._column_originals[slot]),
+            "position": self._column_positions[slot],
+        }
+        type_id = self._column_types[slot]
+        if type_id != _NO_ID:
+            result["type"] = self._string(type_id)
+        return result
+
+    def iter_original_columns(self) -> Iterator[tuple[str, str]]:
+        """
+        Yield ``(original_table, original_column)`` for every column.
+
+        Tables and columns come in the order of the source schema, like the
+        default lookups.
+        """
+        for t_index in self._table_order:
+            raw_table = self._string(self._table_originals[t_index])
+            for slot in self._slots_by_position(t_index):
+                yield raw_table, self._string(self._column_originals[slot])
+
+    def _slots_by_position(self, t_index: int) -> list[int]:
+        """Return a table's column slots in source column order."""
+        starts = self._table_starts
+        return sorted(
+            range(starts[t_index], starts[t_index + 1]),
+            key=self._column_positions.__getitem__,
+        )
+
+    def to_dict(self) -> dict[str, dict[str, list[str]]]:
+        """
+        Rebuild a ``SchemaDict`` with original names in column order.
+
+        Columns dropped as normalized duplicates during the build are not
+        restored. Missing types are returned as ``None``.
+        """
+        schema: dict[str, dict[str, list[str]]] = {}
+        for t_index in self._table_order:
+            slots = self._slots_by_position(t_index)
+            columns = [self._string(self._column_originals[i]) for i in slots]
+            types = [
+                None if self._column_types[i] == _NO_ID
+                else self._string(self._column_types[i])
+                for i in slots
+            ]
+            while types and types[-1] is None:
+                types.pop()
+            info = {"columns": columns}
+            if types:
+                info["types"] = types
+            schema[self._string(self._table_originals[t_index])] = info
+        return schema
+
+    def table_map(self) -> "CompactTableMap":
+        """Return a ``table -> column set`` mapping view."""
+        return CompactTableMap(self)
+
+    def column_lookup(self) -> "CompactColumnLookup":
+        """Return a ``column -> [tables]`` mapping view."""
+        return CompactColumnLookup(self)
+
+
+def _restore(arrays: tuple, metadata: dict) -> CompactSchema:
+    """Unpickle an in-memory ``CompactSchema``."""
+    schema = CompactSchema(*arrays)
+    schema.metadata = metadata
+    return schema
+
+
+class CompactColumnSet(Set):
+    """Read-only set view of one table's normalized column names."""
+
+    __slots__ = ("_schema", "_t_index")
+
+    def __init__(self, schema: CompactSchema, t_index: int):
+        self._schema = schema
+        self._t_index = t_index
+
+    def __contains__(self, column: object) -> bool:
+        return (
+            isinstance(column, str)
+            and self._schema._column_slot(self._t_index, column) >= 0
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        schema = self._schema
+        starts = schema._table_starts
+        for slot in range(starts[self._t_index], starts[self._t_index + 1]):
+            yield schema._string(schema._column_names[slot])
+
+    def __len__(self) -> int:
+        starts = self._schema._table_starts
+        return starts[self._t_index + 1] - starts[self._t_index]
+
+
+class CompactTableMap(Mapping):
+    """Read-only ``table -> column set`` view over a ``CompactSchema``."""
+
+    __slots__ = ("_schema",)
+
+    def __init__(self, schema: CompactSchema):
+        self._schema = schema
+
+    def __contains__(self, table: object) -> bool:
+        return isinstance(table, str) and self._schema.table_index(table) >= 0
+
+    def __getitem__(self, table: str) -> CompactColumnSet:
+        t_index = self._schema.table_index(table)
+        if t_index < 0:
+            raise KeyError(table)
+        return CompactColumnSet(self._schema, t_index)
+
+    def __iter__(self) -> Iterator[str]:
+        schema = self._schema
+        for name_id in schema._table_names:
+            yield schema._string(name_id)
+
+    def __len__(self) -> int:
+        return self._schema.table_count()
+
+
+class CompactColumnLookup(Mapping):
+    """Read-only ``column -> [tables]`` view over a ``CompactSchema``."""
+
+    __slots__ = ("_schema",)
+
+    def __init__(self, schema: CompactSchema):
+        self._schema = schema
+
+    def _lookup_index(self, column: str) -> int:
+        name_id = self._schema._find(column)
+        if name_id < 0:
+            return -1
+        names = self._schema._lookup_names
+        i = bisect_left(names, name_id)
+        if i < len(names) and names[i] == name_id:
+            return i
+        return -1
+
+    def __contains__(self, column: object) -> bool:
+        return isinstance(column, str) and self._lookup_index(column) >= 0
+
+    def __getitem__(self, column: str) -> list[str]:
+        i = self._lookup_index(column)
+        if i < 0:
+            raise KeyError(column)
+        schema = self._schema
+        starts = schema._lookup_starts
+        return [
+            schema._string(schema._table_names[t_index])
+            for t_index in schema._lookup_tables[starts[i]:starts[i + 1]]
+        ]
+
+    def __iter__(self) -> Iterator[str]:
+        schema = self._schema
+        for name_id in schema._lookup_names:
+            yield schema._string(name_id)
+
+    def __len__(self) -> int:
+        return len(self._schema._lookup_names)
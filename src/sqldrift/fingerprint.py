@@ -0,0 +1,147 @@
+"""
+Literal-insensitive query fingerprints.
+
+Drift validation only depends on the tables and columns a query references,
+never on the literal values it filters by. Queries that differ only in
+literals, comments or whitespace therefore share a validation result, and
+the cached validators use the fingerprint below as their cache key.
+
+Usage:
+    >>> from sqldrift.fingerprint import fingerprint
+    >>> fingerprint("SELECT * FROM users WHERE id = 17")
+    'SELECT * FROM users WHERE id = ?'
+    >>> fingerprint("SELECT *  FROM users -- lookup\\nWHERE id = 18")
+    'SELECT * FROM users WHERE id = ?'
+    >>> fingerprint("select * from Users where id = 19", case_sensitive=False)
+    'select * from users where id = ?'
+"""
+
+from typing import Optional
+
+import sqlglot
+from sqlglot.tokens import TokenType
+
+
+# Token types replaced by a placeholder. Looked up by name so that older
+# sqlglot releases without some of the string flavours still work.
+_NUMBER_TYPES = frozenset({TokenType.NUMBER})
+_STRING_TYPES = frozenset(
+    getattr(TokenType, name)
+    for name in (
+        "STRING",
+        "NATIONAL_STRING",
+        "RAW_STRING",
+        "HEREDOC_STRING",
+        "UNICODE_STRING",
+        "BIT_STRING",
+        "HEX_STRING",
+        "BYTE_STRING",
+    )
+    if hasattr(TokenType, name)
+)
+
+# Tokens after which a string can only be a value. sqlglot reads a string
+# after FROM, JOIN, AS or a comma as a table or alias name in most dialects,
+# so anywhere else a string is kept verbatim.
+_VALUE_CONTEXT = frozenset(
+    getattr(TokenType, name)
+    for name in (
+        "EQ",
+        "NEQ",
+        "LT",
+        "LTE",
+        "GT",
+        "GTE",
+        "LIKE",
+        "ILIKE",
+        "DPIPE",
+        "PLUS",
+        "DASH",
+        "SLASH",
+        "MOD",
+        "AND",
+        "OR",
+        "BETWEEN",
+        "WHEN",
+        "THEN",
+        "ELSE",
+    )
+    if hasattr(TokenType, name)
+)
+
+# Tokens that open a subquery rather than a value list after ``IN (``
+_QUERY_START = frozenset({TokenType.SELECT, TokenType.WITH})
+
+
+def fingerprint(
+    sql_query: str,
+    dialect: Optional[str] = None,
+    *,
+    case_sensitive: bool = True,
+) -> Optional[str]:
+    """
+    Compute a literal-insensitive fingerprint of a SQL query.
+
+    The query is tokenized with the dialect's tokenizer; numeric literals
+    become ``?``, comments are dropped and tokens are joined by single
+    spaces. String literals become ``'?'`` only where they can only be
+    values -- after a comparison or other operator, or in an ``IN (...)``
+    list -- since elsewhere a string may name a table. Quoted identifiers
+    keep their quotes.
+
+    Token text keeps its case, because many keywords (``DATE``,
+    ``FILTER``) are also valid identifiers. Validators that match names
+    case-insensitively pass ``case_sensitive=False`` to fold the case of
+    every token, so that queries they treat the same share a fingerprint.
+
+    Args:
+        sql_query: The SQL query string.
+        dialect: Optional SQL dialect used for tokenizing.
+        case_sensitive: If ``False``, lower-case all tokens but string
+            literals. Defaults to ``True``.
+
+    Returns:
+        The fingerprint string, or ``None`` if the query cannot be tokenized.
+    """
+    try:
+        tokens = sqlglot.tokenize(sql_query, read=dialect)
+    except Exception:
+        return None
+
+    parts: list[str] = []
+    depth = 0
+    # Paren depths of the open ``IN (...)`` value lists
+    value_lists: list[int] = []
+    previous = None
+    for i, token in enumerate(tokens):
+        token_type = token.token_type
+        if token_type in _NUMBER_TYPES:
+            parts.append("?")
+        elif token_type in _STRING_TYPES:
+            in_list = (
+                previous in (TokenType.L_PAREN, TokenType.COMMA)
+                and bool(value_lists)
+                and value_lists[-1] == depth
+            )
+            if previous in _VALUE_CONTEXT or in_list:
+                parts.append("'?'")
+            else:
+                parts.append("'" + token.text.replace("'", "''") + "'")
+        else:
+            text = token.text
+            if token_type == TokenType.IDENTIFIER:
+                text = '"' + text.replace('"', '""') + '"'
+            parts.append(text if case_sensitive else text.lower())
+
+        if token_type == TokenType.L_PAREN:
+            depth += 1
+            following = tokens[i + 1].token_type if i + 1 < len(tokens) else None
+            if previous == TokenType.IN and following not in _QUERY_START:
+                value_lists.append(depth)
+        elif token_type == TokenType.R_PAREN:
+            if value_lists and value_lists[-1] == depth:
+                value_lists.pop()
+            depth -= 1
+        previous = token_type
+
+    return " ".join(parts)
@@ -0,0 +1,426 @@
+"""
+Reverse dependency index for schema-change impact analysis.
+
+Validators answer "does this query still work against this schema?". Before
+dropping or renaming a column, the question is the reverse: which of the
+queries we run would break? ``ImpactIndex`` extracts the references of a
+query corpus once, with the same extraction the validators use, and stores
+them in a SQLite file keyed by table and by ``(table, column)``.
+``impact_of`` then answers with a few index lookups, whatever the size of
+the corpus:
+
+    >>> index = ImpactIndex("impact.db")
+    >>> index.add_many(record.sql for record in iter_queries(log))
+    >>> for hit in index.impact_of(dropped_columns={"users": ["name"]}):
+    ...     print(hit.count, hit.query_id, hit.references)
+
+Logged queries repeat heavily. Each query is keyed on its fingerprint (see
+``sqldrift.fingerprint``), so a repeat only increments a counter and is not
+parsed again.
+
+The index errs on the side of reporting a query. An unqualified column, or
+one qualified by a CTE or subquery alias, counts as a reference to that
+column of every table the query reads, since only a schema could tell which
+table it comes from.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional, Union
+
+from sqldrift.column_validator import ColumnValidator
+from sqldrift.fingerprint import fingerprint
+from sqldrift.optimized import SchemaValidator
+from sqldrift.plan import ReferencePlan, compile
+from sqldrift.query import Query
+
+
+# Bumped whenever the layout of the index or its query keys change
+_FORMAT = 2
+
+# Queries written per transaction by ``add_many``
+_COMMIT_EVERY = 10_000
+
+# Ids per ``IN (...)`` lookup, below SQLite's default variable limit
+_ID_CHUNK = 500
+
+
+class ImpactedQuery(NamedTuple):
+    """A query affected by a schema change."""
+
+    query_id: str
+    sql: Optional[str]  # first SQL text added under this id, if any
+    count: int  # number of times the query was added
+    references: tuple[str, ...]  # changed objects it uses, e.g. "users.name"
+
+
+class ImpactIndex:
+    """
+    On-disk index from tables and columns to the queries that use them.
+
+    Args:
+        path: Path of the SQLite file. Created if it does not exist.
+        case_sensitive: If ``True``, names are matched case-sensitively.
+            Must be the same every time a file is opened. Defaults to
+            ``False``.
+
+    Raises:
+        ValueError: If the file was built with a different
+            ``case_sensitive`` setting or by an incompatible version.
+
+    Examples:
+        >>> index = ImpactIndex("impact.db")
+        >>> index.add("SELECT u.name FROM users u WHERE u.id = 7")
+        True
+        >>> [hit.references for hit in index.impact_of(renamed_tables=["users"])]
+        [('users',)]
+    """
+
+    def __init__(self, path: str, *, case_sensitive: bool = False):
+        self.path = os.fspath(path)
+        self.case_sensitive = case_sensitive
+        # Reference extraction and name normalization are the validators'
+        self._tables = SchemaValidator([], case_sensitive=case_sensitive)
+        self._columns = ColumnValidator({}, case_sensitive=case_sensitive)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Process that opened ``_conn``; connections do not survive a fork
+        self._pid = 0
+        with self._lock:
+            self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this process's connection, creating the index if needed."""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS queries ("
+                "id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, "
+                "sql TEXT, seen INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_tables ("
+                "name TEXT NOT NULL, query INTEGER NOT NULL, "
+                "PRIMARY KEY (name, query)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_columns ("
+                "tbl TEXT NOT NULL, name TEXT NOT NULL, query INTEGER NOT NULL, "
+                "PRIMARY KEY (tbl, name, query)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('format', ?), ('case_sensitive', ?)",
+                (str(_FORMAT), str(int(self.case_sensitive))),
+            )
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            if meta["format"] != str(_FORMAT):
+                conn.close()
+                raise ValueError(
+                    f"{self.path} was built by an incompatible version of sqldrift"
+                )
+            if meta["case_sensitive"] != str(int(self.case_sensitive)):
+                conn.close()
+                raise ValueError(
+                    f"{self.path} was built with "
+                    f"case_sensitive={not self.case_sensitive}"
+                )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # Building the index
+    # ------------------------------------------------------------------
+
+    def add(
+        self,
+        sql_query: Query,
+        *,
+        query_id: Optional[str] = None,
+        dialect: Optional[str] = None,
+    ) -> bool:
+        """
+        Add one query to the index.
+
+        Args:
+            sql_query: SQL text, a parsed sqlglot expression or a compiled
+                plan.
+            query_id: Identifier to report the query under, e.g. the name
+                of a saved query. Defaults to the query's fingerprint.
+                Required for plans, which carry no SQL.
+            dialect: Optional SQL dialect for parsing.
+
+        Returns:
+            ``True`` if the query was indexed or counted, ``False`` if it
+            could not be parsed.
+        """
+        item = sql_query if query_id is None else (query_id, sql_query)
+        return self.add_many([item], dialect=dialect) == 1
+
+    def add_many(
+        self,
+        queries: Iterable[Union[Query, tuple[str, Query]]],
+        *,
+        dialect: Optional[str] = None,
+    ) -> int:
+        """
+        Add a stream of queries to the index.
+
+        A query whose id is already in the index is only counted again; it
+        is not re-parsed. To replace the SQL stored under an id, ``discard``
+        it first. Queries are written in large transactions, so the stream
+        may be arbitrarily long.
+
+        Args:
+            queries: Queries as accepted by ``add``, or
+                ``(query_id, query)`` pairs.
+            dialect: Optional SQL dialect for parsing.
+
+        Returns:
+            The number of queries indexed or counted. Queries that fail to
+            parse and blank queries are skipped.
+        """
+        added = 0
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                for n, item in enumerate(queries, 1):
+                    if isinstance(item, tuple):
+                        query_id, sql_query = item
+                    else:
+                        query_id, sql_query = None, item
+                    added += self._add(conn, sql_query, query_id, dialect)
+                    if n % _COMMIT_EVERY == 0:
+                        conn.execute("COMMIT")
+                        conn.execute("BEGIN")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return added
+
+    def _add(
+        self,
+        conn: sqlite3.Connection,
+        sql_query: Query,
+        query_id: Optional[str],
+        dialect: Optional[str],
+    ) -> bool:
+        """Count a known query, or extract and insert a new one."""
+        if isinstance(sql_query, str):
+            sql = sql_query
+        elif isinstance(sql_query, ReferencePlan):
+            if query_id is None:
+                raise ValueError("query_id is required to add a compiled plan")
+            sql = None
+        else:
+            sql = sql_query.sql(dialect=dialect)
+
+        key = query_id
+        if key is None:
+            key = (
+                fingerprint(sql, dialect, case_sensitive=self.case_sensitive)
+                or sql
+            )
+        if conn.execute(
+            "UPDATE queries SET seen = seen + 1 WHERE key = ?", (key,)
+        ).rowcount:
+            return True
+
+        plan = compile(sql_query, dialect=dialect)
+        # Queries whose tables could not be resolved, e.g. a bare word that
+        # parses as a column, are rejected like parse errors
+        if plan.tables is None or plan.refs is None:
+            return False
+        tables, columns = self._references(plan)
+        row = conn.execute(
+            "INSERT INTO queries (key, sql, seen) VALUES (?, ?, 1)", (key, sql)
+        ).lastrowid
+        conn.executemany(
+            "INSERT OR IGNORE INTO query_tables VALUES (?, ?)",
+            ((name, row) for name in tables),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO query_columns VALUES (?, ?, ?)",
+            ((table, name, row) for table, name in columns),
+        )
+        return True
+
+    def _references(
+        self, plan: ReferencePlan
+    ) -> tuple[set[str], set[tuple[str, str]]]:
+        """
+        Return the normalized tables and ``(table, column)`` pairs of a plan.
+
+        Tables are the union of what ``SchemaValidator`` and
+        ``ColumnValidator`` check. Columns that do not resolve to one of
+        those tables are attributed to each of them.
+        """
+        from_tables, column_refs = self._columns._resolve_refs(plan.refs)
+        tables = set(from_tables)
+        if plan.tables is not None:
+            tables.update(self._tables._normalize_tables(plan.tables))
+
+        columns: set[tuple[str, str]] = set()
+        for table, name in column_refs:
+            if table in tables:
+                columns.add((table, name))
+            else:
+                columns.update((candidate, name) for candidate in tables)
+        return tables, columns
+
+    def discard(self, query_id: str) -> bool:
+        """
+        Remove a query from the index.
+
+        Args:
+            query_id: The id the query was added under; its fingerprint if
+                no id was given.
+
+        Returns:
+            ``True`` if the query was in the index.
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT id FROM queries WHERE key = ?", (query_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM queries WHERE id = ?", row)
+            conn.execute("DELETE FROM query_tables WHERE query = ?", row)
+            conn.execute("DELETE FROM query_columns WHERE query = ?", row)
+            conn.execute("COMMIT")
+        return True
+
+    # ------------------------------------------------------------------
+    # Impact analysis
+    # ------------------------------------------------------------------
+
+    def impact_of(
+        self,
+        *,
+        dropped_tables: Iterable[str] = (),
+        dropped_columns: Optional[Mapping[str, Iterable[str]]] = None,
+        renamed_tables: Iterable[str] = (),
+        renamed_columns: Optional[Mapping[str, Iterable[str]]] = None,
+    ) -> list[ImpactedQuery]:
+        """
+        Find the indexed queries that a schema change would break.
+
+        A query that references a renamed object by its old name breaks
+        just as if the object had been dropped, so renames only need the
+        old names. A mapping of old to new names is accepted too.
+
+        Each changed object costs one index lookup, plus one row read per
+        affected query.
+
+        Args:
+            dropped_tables: Names of dropped tables.
+            dropped_columns: Mapping of table name to dropped column names.
+            renamed_tables: Old names of renamed tables.
+            renamed_columns: Mapping of table name to old names of renamed
+                columns.
+
+        Returns:
+            The affected queries, most frequently added first, each with
+            the changed objects it references.
+
+        Examples:
+            >>> index.impact_of(
+            ...     dropped_columns={"users": ["tier"]},
+            ...     renamed_tables={"orders": "purchases"},
+            ... )
+        """
+        hits: dict[int, list[str]] = {}
+        with self._lock:
+            conn = self._connect()
+            for label, statement, params in self._lookups(
+                dropped_tables, dropped_columns, renamed_tables, renamed_columns
+            ):
+                for (row,) in conn.execute(statement, params):
+                    hits.setdefault(row, []).append(label)
+
+            ids = list(hits)
+            rows = []
+            for start in range(0, len(ids), _ID_CHUNK):
+                chunk = ids[start:start + _ID_CHUNK]
+                rows += conn.execute(
+                    "SELECT id, key, sql, seen FROM queries "
+                    f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+
+        impacted = [
+            ImpactedQuery(key, sql, seen, tuple(dict.fromkeys(hits[row])))
+            for row, key, sql, seen in rows
+        ]
+        impacted.sort(key=lambda hit: (-hit.count, hit.query_id))
+        return impacted
+
+    def _lookups(
+        self,
+        dropped_tables: Iterable[str],
+        dropped_columns: Optional[Mapping[str, Iterable[str]]],
+        renamed_tables: Iterable[str],
+        renamed_columns: Optional[Mapping[str, Iterable[str]]],
+    ) -> Iterator[tuple[str, str, tuple[str, ...]]]:
+        """Yield ``(label, statement, params)`` for each changed object."""
+        table_key = self._tables._table_key
+        normalize = self._columns._normalize
+
+        for names in (dropped_tables, renamed_tables):
+            for name in names:
+                table = table_key(name)
+                yield (
+                    table,
+                    "SELECT query FROM query_tables WHERE name = ?",
+                    (table,),
+                )
+        for changed in (dropped_columns or {}, renamed_columns or {}):
+            for name, columns in changed.items():
+                table = table_key(name)
+                for column in columns:
+                    column = normalize(column)
+                    yield (
+                        f"{table}.{column}",
+                        "SELECT query FROM query_columns WHERE tbl = ? AND name = ?",
+                        (table, column),
+                    )
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connect().execute(
+                "SELECT COUNT(*) FROM queries"
+            ).fetchone()
+        return count
+
+    def clear(self) -> None:
+        """Remove every query from the index."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            for table in ("queries", "query_tables", "query_columns"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
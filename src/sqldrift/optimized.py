@@ -5,10 +5,116 @@ Provides class-based validators with pre-computed table lookups and optional
 LRU caching, designed to handle schemas with 4,000+ tables efficiently.
 """
 
+import threading
+import time
+
 import sqlglot
-from sqlglot.optimizer.scope import build_scope
-from typing import Optional
-from functools import lru_cache
+from concurrent.futures import Executor
+from typing import Iterable, Iterator, Mapping, Optional
+
+from sqldrift import batch
+from sqldrift.cache import Dependencies, ValidationCache
+from sqldrift.persistent import PersistentCache, owner_namespace, schema_digest
+from sqldrift.plan import ReferencePlan
+from sqldrift.query import Query, parse_query
+from sqldrift.references import iter_physical_tables
+from sqldrift.result import DEFAULT_MESSAGE_LIMIT, MissingTable, ValidationResult
+from sqldrift.suggest import TrigramIndex
+
+
+# Suggestions listed per missing table
+_SUGGESTIONS = 5
+
+
+def _available_sample(
+    ranked: list[list[str]], names: list[str], limit: int
+) -> tuple[str, ...]:
+    """
+    Pick ``limit`` available names to list in a drift message.
+
+    When every name fits, all are listed alphabetically. Otherwise the best
+    matches of each missing name are taken in turn, so every missing name
+    gets its closest candidates listed; the sample is then padded with the
+    alphabetically first names.
+    """
+    if len(names) <= limit:
+        return tuple(names)
+    sample: dict[str, None] = {}
+    for rank in range(max(map(len, ranked), default=0)):
+        for similar in ranked:
+            if len(sample) == limit:
+                return tuple(sample)
+            if rank < len(similar):
+                sample[similar[rank]] = None
+    for name in names:
+        if len(sample) >= limit:
+            break
+        sample[name] = None
+    return tuple(sample)[:limit]
+
+
+class _TableSnapshot:
+    """
+    Table lookups of a ``SchemaValidator`` at one point in time.
+
+    A snapshot is never mutated once published. Validators read every lookup
+    through a single ``_state`` reference and replace it wholesale on update,
+    so a concurrent ``validate`` sees either the old schema or the new one,
+    never a mix of both.
+
+    The trigram index behind table suggestions is built on first use, so a
+    snapshot that never sees a missing table never pays for it. Once built,
+    it is carried forward through schema changes (see ``carry_index``).
+    """
+
+    __slots__ = ("tables", "full", "refs", "_index")
+
+    def __init__(
+        self,
+        tables: set[str],
+        full: set[str],
+        refs: Optional[dict[str, int]] = None,
+    ):
+        # Names matched against queries (base or qualified names)
+        self.tables = tables
+        # Normalized full qualified names, used to apply deltas
+        self.full = full
+        # Base name -> number of qualified names sharing it; built by the
+        # first ``apply_changes`` when schema prefixes are dropped
+        self.refs = refs
+        self._index: Optional[TrigramIndex] = None
+
+    def __reduce__(self):
+        # The suggestion index is cheap to rebuild and not worth shipping
+        return _TableSnapshot, (self.tables, self.full, self.refs)
+
+    def index(self) -> TrigramIndex:
+        """Return the trigram index over ``tables``, building it once."""
+        index = self._index
+        if index is None:
+            # Racing builders produce identical indexes; the last one wins
+            index = self._index = TrigramIndex(self.tables)
+        return index
+
+    def carry_index(self, previous: "_TableSnapshot", changed: set[str]) -> None:
+        """
+        Derive the trigram index from the snapshot this one replaces.
+
+        Only the ``changed`` names are re-indexed, so a schema change does
+        not make the next failure rebuild the index from scratch. Nothing
+        is done if ``previous`` never built its index.
+
+        Args:
+            previous: The snapshot being replaced.
+            changed: Names that appeared in or disappeared from ``tables``.
+        """
+        index = previous._index
+        if index is not None and self._index is None:
+            tables = self.tables
+            self._index = index.updated(
+                (name for name in changed if name in tables),
+                (name for name in changed if name not in tables),
+            )
 
 
 class SchemaValidator:
@@ -26,6 +132,8 @@ class SchemaValidator:
             Defaults to ``False``.
         preserve_schema: If ``True``, match full ``schema.table`` names;
             if ``False``, only match base table names. Defaults to ``False``.
+        message_limit: Maximum number of available tables listed in a drift
+            message; the rest are summarized as a count. Defaults to ``20``.
 
     Examples:
         >>> validator = SchemaValidator(["users", "orders", "products"])
@@ -39,19 +147,23 @@ class SchemaValidator:
         *,
         case_sensitive: bool = False,
         preserve_schema: bool = False,
+        message_limit: int = DEFAULT_MESSAGE_LIMIT,
     ):
         self.case_sensitive = case_sensitive
         self.preserve_schema = preserve_schema
-        self._live_tables_raw = live_tables
+        self.message_limit = message_limit
+        # Serializes writers; readers never take it
+        self._write_lock = threading.Lock()
+        self._state = self._build_snapshot(live_tables)
 
-        # Pre-compute normalized table sets for O(1) lookup
-        self._live_tables_set = self._build_table_set(live_tables)
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_write_lock"]
+        return state
 
-        # Also store full qualified names for optional strict matching
-        if preserve_schema:
-            self._live_tables_full = {
-                self._normalize_name(t) for t in live_tables
-            }
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._write_lock = threading.Lock()
 
     def _normalize_name(self, name: str) -> str:
         """Normalize a table name based on configuration."""
@@ -60,19 +172,24 @@ class SchemaValidator:
             name = name.lower()
         return name
 
-    def _build_table_set(self, tables: list[str]) -> set[str]:
-        """Build an optimized set of table names for fast lookup."""
+    def _table_key(self, name: str) -> str:
+        """Normalize a table name to the form stored in the lookup set."""
+        if self.preserve_schema:
+            return self._normalize_name(name)
+        return self._normalize_name(name.split(".")[-1])
+
+    def _build_snapshot(self, live_tables: list[str]) -> _TableSnapshot:
+        """Build the table lookups from a full table list."""
+        full = {self._normalize_name(t) for t in live_tables}
+
+        # Pre-compute normalized table sets for O(1) lookup
         if self.preserve_schema:
-            return {self._normalize_name(t) for t in tables}
-        else:
-            return {
-                self._normalize_name(t.split(".")[-1])
-                for t in tables
-            }
+            return _TableSnapshot(full, full)
+        return _TableSnapshot({self._table_key(t) for t in full}, full)
 
     def validate(
         self,
-        sql_query: str,
+        sql_query: Query,
         *,
         dialect: Optional[str] = None,
     ) -> tuple[bool, str]:
@@ -80,69 +197,236 @@ class SchemaValidator:
         Validate that all tables referenced in a SQL query exist in the schema.
 
         Args:
-            sql_query: The SQL query string to validate.
+            sql_query: The SQL query string to validate, a parsed sqlglot
+                expression, which is validated without parsing again, or a
+                plan from ``sqldrift.compile``, which is checked without
+                parsing at all.
             dialect: Optional SQL dialect for parsing
                 (e.g., ``"postgres"``, ``"mysql"``).
 
         Returns:
             A ``(success, message)`` tuple.
         """
-        try:
-            expression = sqlglot.parse_one(sql_query, read=dialect)
-            root_scope = build_scope(expression)
+        return self._validate_with_deps(sql_query, dialect)[0].as_tuple()
 
-            referenced_tables: set[str] = set()
+    def validate_result(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+        keep_ast: bool = False,
+    ) -> ValidationResult:
+        """
+        Validate a query and return a structured result.
 
-            for scope in root_scope.traverse():
-                for table in scope.tables:
-                    if table.name in scope.cte_sources:
-                        continue
+        Same check as ``validate``, but the missing tables, their
+        suggestions, parse errors and timings are available as attributes
+        instead of being formatted into a message.
 
-                    if self.preserve_schema:
-                        name = self._normalize_name(str(table))
-                    else:
-                        name = self._normalize_name(table.this.name)
+        Args:
+            sql_query: The SQL query string to validate, a parsed sqlglot
+                expression or a compiled plan.
+            dialect: Optional SQL dialect for parsing.
+            keep_ast: If ``True``, the result also carries the parsed
+                ``expression`` and the referenced ``tables``, for stages
+                that would otherwise parse the query again. Plans carry no
+                expression.
 
-                    referenced_tables.add(name)
+        Returns:
+            A ``ValidationResult``.
+        """
+        return self._validate_with_deps(sql_query, dialect, keep_ast)[0]
 
-            missing_tables = referenced_tables - self._live_tables_set
+    def is_valid(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+    ) -> bool:
+        """
+        Return whether every table referenced in a query exists.
 
-            if missing_tables:
-                parts: list[str] = []
-                available = sorted(self._live_tables_set)
+        A fail-fast check for pre-execution gates: it stops at the first
+        missing table and computes no suggestions or message. Call
+        ``validate`` or ``validate_result`` for the diagnostics when it
+        returns ``False``.
 
-                for table in sorted(missing_tables):
-                    line = f"- Table '{table}' not found"
+        Args:
+            sql_query: The SQL query string to check, a parsed sqlglot
+                expression or a compiled plan.
+            dialect: Optional SQL dialect for parsing.
+
+        Returns:
+            ``True`` if the query parses and all its tables exist;
+            ``False`` otherwise, including on parse errors.
+        """
+        tables = self._state.tables
+        if isinstance(sql_query, ReferencePlan):
+            return sql_query.tables is not None and all(
+                name in tables for name in self._normalize_tables(sql_query.tables)
+            )
+        try:
+            expression = parse_query(sql_query, dialect)
+            return all(
+                name in tables
+                for name in self._iter_referenced_tables(expression)
+            )
+        except Exception:
+            return False
+
+    def validate_many(
+        self,
+        queries: Iterable[str],
+        *,
+        dialect: Optional[str] = None,
+        workers: Optional[int] = 1,
+        chunksize: int = 256,
+    ) -> list[tuple[bool, str]]:
+        """
+        Validate many queries, returning results in input order.
 
-                    # Add suggestions
-                    suggestions = self.suggest_tables(table)
-                    if suggestions:
-                        line += f". Did you mean: {', '.join(suggestions[:5])}"
+        Identical and fingerprint-equal queries are validated once. With
+        ``workers > 1`` the distinct queries are sharded across a
+        ``ProcessPoolExecutor``; the validator is shipped to each worker
+        once, with its lookups already built.
 
-                    parts.append(line)
+        Args:
+            queries: SQL query strings to validate.
+            dialect: Optional SQL dialect for parsing.
+            workers: Number of worker processes. ``1`` validates inline;
+                ``None`` uses ``os.cpu_count()``. Defaults to ``1``.
+            chunksize: Number of queries sent to a worker per task.
 
-                parts.append(
-                    f"  Available tables: {', '.join(available)}"
-                )
+        Returns:
+            A list of ``(success, message)`` tuples, one per query.
+        """
+        return batch.validate_many(
+            self,
+            queries,
+            dialect=dialect,
+            workers=workers,
+            chunksize=chunksize,
+        )
 
-                detail_block = "\n".join(parts)
-                return (
-                    False,
-                    f"Schema Drift Detected:\n{detail_block}",
-                )
+    def _validate_with_deps(
+        self,
+        sql_query: Query,
+        dialect: Optional[str] = None,
+        keep_ast: bool = False,
+    ) -> tuple[ValidationResult, Dependencies]:
+        """
+        Validate a query and report which schema objects the result depends on.
 
-            return True, "Query is safe to execute."
+        A successful result depends only on the referenced tables; failures
+        list available tables and suggestions and so depend on the whole
+        schema.
+        """
+        start = time.perf_counter()
+        try:
+            if isinstance(sql_query, ReferencePlan):
+                if sql_query.tables is None:
+                    return ValidationResult.failed(sql_query.error), None
+                expression = None
+                parsed = start
+                referenced_tables = set(self._normalize_tables(sql_query.tables))
+            else:
+                expression = parse_query(sql_query, dialect)
+                parsed = time.perf_counter()
+                referenced_tables = self._referenced_tables(expression)
+            result = self._table_drift(referenced_tables, self._state)
+            deps: Dependencies = None
+            if result is None:
+                result = ValidationResult(True, "Query is safe to execute.")
+                deps = (frozenset(referenced_tables), frozenset())
+            if keep_ast:
+                result.expression = expression
+                result.tables = tuple(sorted(referenced_tables))
 
         except (sqlglot.errors.ParseError, sqlglot.errors.SqlglotError) as e:
-            return False, f"Invalid SQL syntax: {e}"
+            return ValidationResult.failed(
+                f"Invalid SQL syntax: {e}", parse_time=time.perf_counter() - start
+            ), None
         except Exception as e:
-            return False, f"Unexpected error during validation: {e}"
+            return ValidationResult.failed(
+                f"Unexpected error during validation: {e}",
+                parse_time=time.perf_counter() - start,
+            ), None
+
+        result.parse_time = parsed - start
+        result.check_time = time.perf_counter() - parsed
+        return result, deps
+
+    def _referenced_tables(self, expression: sqlglot.exp.Expression) -> set[str]:
+        """Collect the normalized physical tables referenced by a parsed query."""
+        return set(self._iter_referenced_tables(expression))
+
+    def _iter_referenced_tables(
+        self, expression: sqlglot.exp.Expression
+    ) -> Iterator[str]:
+        """
+        Yield the normalized physical tables referenced by a parsed query.
+
+        Scopes are walked lazily, so a consumer that stops early skips the
+        rest of the query. Tables referenced more than once are yielded
+        more than once.
+        """
+        return self._normalize_tables(iter_physical_tables(expression))
+
+    def _normalize_tables(
+        self, tables: Iterable[tuple[str, str]]
+    ) -> Iterator[str]:
+        """Normalize ``(name, qualified_name)`` pairs to lookup keys, lazily."""
+        preserve_schema = self.preserve_schema
+        normalize = self._normalize_name
+        for name, qualified in tables:
+            yield normalize(qualified if preserve_schema else name)
+
+    def _table_drift(
+        self, referenced_tables: set[str], state: _TableSnapshot
+    ) -> Optional[ValidationResult]:
+        """
+        Diff referenced tables against a schema snapshot.
+
+        Returns:
+            A failed result describing the missing tables, or ``None`` if
+            every referenced table exists. Only ``message_limit`` available
+            tables are kept: those most similar to the missing names first,
+            then the rest alphabetically.
+        """
+        missing_tables = referenced_tables - state.tables
+
+        if not missing_tables:
+            return None
+
+        index = state.index()
+        limit = self.message_limit
+        # One lookup per missing table serves both its suggestions and the
+        # ranking of the available sample
+        ranked = [
+            (table, index.suggest(table, max_results=max(limit, _SUGGESTIONS)))
+            for table in sorted(missing_tables)
+        ]
+        return ValidationResult(
+            False,
+            missing_tables=tuple(
+                MissingTable(table, tuple(similar[:_SUGGESTIONS]))
+                for table, similar in ranked
+            ),
+            available_tables=_available_sample(
+                [similar for _, similar in ranked], index.names, limit
+            ),
+            table_count=len(index),
+        )
 
     def suggest_tables(self, table_name: str, *, max_results: int = 5) -> list[str]:
         """
         Suggest similar table names for a missing table.
 
-        Uses substring and prefix matching to find candidates.
+        Candidates come from a trigram index built once per schema, so the
+        cost depends on how many tables resemble the name rather than on
+        the size of the schema. Tables containing the name, sharing its
+        first three characters, or with similar trigrams are returned,
+        closest first.
 
         Args:
             table_name: The missing table name.
@@ -151,37 +435,155 @@ class SchemaValidator:
         Returns:
             A list of similar table names from the schema.
         """
-        norm = self._normalize_name(table_name)
-        suggestions: list[str] = []
-
-        for candidate in sorted(self._live_tables_set):
-            if norm in candidate or candidate in norm:
-                suggestions.append(candidate)
-            elif norm[:3] == candidate[:3] and len(norm) >= 3:
-                suggestions.append(candidate)
-
-        return suggestions[:max_results]
+        return self._state.index().suggest(
+            self._table_key(table_name), max_results=max_results
+        )
 
     def update_schema(self, live_tables: list[str]) -> None:
         """
         Update the validator with a new list of available tables.
 
         Useful when the schema changes and you want to reuse the validator
-        instance without recreating it.
+        instance without recreating it. The new lookups are built aside and
+        swapped in with a single assignment, so it is safe to call while
+        other threads are validating.
 
         Args:
             live_tables: New list of available table names.
         """
-        self._live_tables_raw = live_tables
-        self._live_tables_set = self._build_table_set(live_tables)
-        if self.preserve_schema:
-            self._live_tables_full = {
-                self._normalize_name(t) for t in live_tables
-            }
+        self._replace_snapshot(self._build_snapshot(live_tables))
+
+    def _replace_snapshot(self, state: _TableSnapshot) -> set[str]:
+        """
+        Publish a rebuilt snapshot, carrying the suggestion index forward.
+
+        Returns:
+            The names that appeared in or disappeared from the lookup set.
+        """
+        # The snapshot replaced is read under the lock, so concurrent
+        # writers each diff against the one they actually replace
+        with self._write_lock:
+            old = self._state
+            changed = old.tables ^ state.tables
+            state.carry_index(old, changed)
+            self._state = state
+        return changed
+
+    def apply_changes(
+        self,
+        *,
+        added_tables: Iterable[str] = (),
+        dropped_tables: Iterable[str] = (),
+        renamed: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """
+        Apply an incremental schema change.
+
+        Drops are applied first, then renames, then additions. Dropping or
+        renaming a table that does not exist and adding one that already
+        exists are no-ops, so replaying a change is harmless.
+
+        The change is applied to a copy of the lookups that is then swapped
+        in, so concurrent ``validate`` calls are unaffected. Copying the
+        table sets is a fast ``O(tables)`` operation; no name is
+        re-normalized.
+
+        Args:
+            added_tables: Names of tables that were created.
+            dropped_tables: Names of tables that were dropped.
+            renamed: Mapping of old table name to new table name.
+        """
+        self._apply_table_changes(added_tables, dropped_tables, renamed or {})
+
+    def _apply_table_changes(
+        self,
+        added_tables: Iterable[str],
+        dropped_tables: Iterable[str],
+        renamed: Mapping[str, str],
+    ) -> set[str]:
+        """
+        Apply a table delta to a copy of the lookups and publish it.
+
+        Returns:
+            The normalized names that appeared in or disappeared from the
+            lookup set.
+        """
+        with self._write_lock:
+            state = self._state
+            full = set(state.full)
+            if self.preserve_schema:
+                live = full
+                refs = None
+            else:
+                live = set(state.tables)
+                if state.refs is None:
+                    refs = {}
+                    for name in full:
+                        key = self._table_key(name)
+                        refs[key] = refs.get(key, 0) + 1
+                else:
+                    refs = dict(state.refs)
+            changed = self._edit_tables(
+                full, live, refs, added_tables, dropped_tables, renamed
+            )
+            new = _TableSnapshot(live, full, refs)
+            new.carry_index(state, changed)
+            self._state = new
+        return changed
+
+    def _edit_tables(
+        self,
+        full: set[str],
+        live: set[str],
+        refs: Optional[dict[str, int]],
+        added_tables: Iterable[str],
+        dropped_tables: Iterable[str],
+        renamed: Mapping[str, str],
+    ) -> set[str]:
+        """Apply a table delta in place to unpublished lookups."""
+
+        # Membership of every touched name before the change
+        before: dict[str, bool] = {}
+
+        def add(name: str) -> None:
+            name = self._normalize_name(name)
+            if name in full:
+                return
+            key = self._table_key(name)
+            before.setdefault(key, key in live)
+            full.add(name)
+            if refs is not None:
+                refs[key] = refs.get(key, 0) + 1
+                live.add(key)
+
+        def drop(name: str) -> None:
+            name = self._normalize_name(name)
+            if name not in full:
+                return
+            key = self._table_key(name)
+            before.setdefault(key, key in live)
+            full.discard(name)
+            if refs is not None:
+                # Another schema may still hold a table with this base name
+                refs[key] -= 1
+                if not refs[key]:
+                    del refs[key]
+                    live.discard(key)
+
+        for name in dropped_tables:
+            drop(name)
+        for old, new in renamed.items():
+            if self._normalize_name(old) in full:
+                drop(old)
+                add(new)
+        for name in added_tables:
+            add(name)
+
+        return {key for key, was in before.items() if was != (key in live)}
 
     def get_table_count(self) -> int:
         """Return the number of tables in the schema."""
-        return len(self._live_tables_set)
+        return len(self._state.tables)
 
     def table_exists(self, table_name: str) -> bool:
         """
@@ -193,26 +595,40 @@ class SchemaValidator:
         Returns:
             ``True`` if the table exists, ``False`` otherwise.
         """
-        if self.preserve_schema:
-            normalized = self._normalize_name(table_name)
-        else:
-            normalized = self._normalize_name(table_name.split(".")[-1])
-
-        return normalized in self._live_tables_set
+        return self._table_key(table_name) in self._state.tables
 
 
 class CachedSchemaValidator(SchemaValidator):
     """
     Extended validator with LRU caching for repeated query validation.
 
-    Identical queries return cached results, providing up to ~282x speedup
+    Identical queries -- and queries that differ only in literals, comments
+    or whitespace -- return cached results, providing up to ~282x speedup
     over the original function-based approach with cache hits.
 
     Args:
         live_tables: List of available table names.
         case_sensitive: If ``True``, table name matching is case-sensitive.
         preserve_schema: If ``True``, match full ``schema.table`` names.
+        message_limit: Maximum number of available tables listed in a drift
+            message. Defaults to ``20``.
         cache_size: Maximum number of queries to cache. Defaults to ``128``.
+        cache_policy: Eviction policy of the in-memory cache: ``"lru"``, or
+            ``"tinylfu"`` to keep frequently used entries through bursts of
+            one-off queries (see ``sqldrift.policy``). Defaults to ``"lru"``.
+        fingerprint: If ``True``, key the cache on a literal-insensitive
+            query fingerprint so that queries differing only in literals,
+            comments or whitespace (and, when not ``case_sensitive``, case)
+            share one entry. If ``False``, key on the raw SQL string.
+            Defaults to ``True``.
+        executor: Thread-based executor used by ``avalidate`` to run
+            parsing off the event loop. Defaults to ``None`` (the running
+            loop's default executor).
+        cache_path: Path of a SQLite file that keeps results across
+            restarts and is shared by processes on the same host (see
+            ``sqldrift.persistent``). Defaults to ``None`` (memory only).
+        disk_cache_size: Maximum number of results kept in ``cache_path``.
+            Defaults to ``100_000``.
 
     Examples:
         >>> cached = CachedSchemaValidator(["users", "orders"], cache_size=256)
@@ -228,57 +644,224 @@ class CachedSchemaValidator(SchemaValidator):
         *,
         case_sensitive: bool = False,
         preserve_schema: bool = False,
+        message_limit: int = DEFAULT_MESSAGE_LIMIT,
         cache_size: int = 128,
+        cache_policy: str = "lru",
+        fingerprint: bool = True,
+        executor: Optional[Executor] = None,
+        cache_path: Optional[str] = None,
+        disk_cache_size: int = 100_000,
     ):
         super().__init__(
             live_tables,
             case_sensitive=case_sensitive,
             preserve_schema=preserve_schema,
+            message_limit=message_limit,
         )
         self.cache_size = cache_size
-
-        self._validate_cached = lru_cache(maxsize=cache_size)(
-            self._validate_internal
+        self.executor = executor
+        self.cache_path = cache_path
+        store = None
+        if cache_path is not None:
+            store = PersistentCache(
+                cache_path, owner_namespace(self), max_entries=disk_cache_size
+            )
+        # Namespace of the last snapshot it was computed for
+        self._namespace: tuple[object, str] = (None, "")
+        self._cache = ValidationCache(
+            cache_size,
+            use_fingerprint=fingerprint,
+            case_sensitive=case_sensitive,
+            store=store,
+            policy=cache_policy,
         )
 
+    def __getstate__(self) -> dict:
+        # Executors do not pickle; a shipped copy uses the loop default. The
+        # namespace memo holds a snapshot, which may not be the one shipped
+        state = super().__getstate__()
+        state["executor"] = None
+        state["_namespace"] = (None, "")
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        # The disk store does not pickle its namespace callable
+        if self._cache.store is not None:
+            self._cache.store.namespace = owner_namespace(self)
+
     def _validate_internal(
         self,
         sql_query: str,
         dialect: Optional[str] = None,
-    ) -> tuple[bool, str]:
+    ) -> tuple[ValidationResult, Dependencies]:
         """Internal validation method that gets cached."""
-        return super().validate(sql_query, dialect=dialect)
+        return self._validate_with_deps(sql_query, dialect)
+
+    def _cached_result(
+        self, sql_query: Query, dialect: Optional[str]
+    ) -> ValidationResult:
+        """
+        Return the cached result of SQL text, computing it on a miss.
+
+        Parsed expressions skip the cache: keying them would mean rendering
+        them back to SQL, and the parse a hit would save is already paid.
+        """
+        if not isinstance(sql_query, str):
+            return self._validate_with_deps(sql_query, dialect)[0]
+        return self._cache.get_or_compute(
+            sql_query,
+            dialect,
+            lambda: self._validate_internal(sql_query, dialect),
+        )
+
+    def _cache_namespace(self) -> tuple[object, str]:
+        """
+        Return the current snapshot and the on-disk namespace of its results.
+
+        The namespace combines the validator options with a hash of the
+        schema, and is computed once per snapshot.
+        """
+        state = self._state
+        token, namespace = self._namespace
+        if token is state:
+            return token, namespace
+        options = (
+            f"{type(self).__name__}:{self.case_sensitive}:"
+            f"{self.preserve_schema}:{self.message_limit}"
+        )
+        namespace = f"{options}:{schema_digest(state.full)}"
+        self._namespace = (state, namespace)
+        return state, namespace
 
     def validate(
         self,
-        sql_query: str,
+        sql_query: Query,
         *,
         dialect: Optional[str] = None,
     ) -> tuple[bool, str]:
         """Validate with caching support."""
-        return self._validate_cached(sql_query, dialect)
+        return self._cached_result(sql_query, dialect).as_tuple()
+
+    def validate_result(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+        keep_ast: bool = False,
+    ) -> ValidationResult:
+        """
+        Return a structured result, with caching support.
+
+        Cached results are shared and carry no AST, so ``keep_ast=True``
+        always parses and validates afresh.
+        """
+        if keep_ast:
+            return self._validate_with_deps(sql_query, dialect, keep_ast)[0]
+        return self._cached_result(sql_query, dialect)
+
+    def is_valid(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+    ) -> bool:
+        """
+        Return whether a query is valid, with caching support.
+
+        Cached results answer directly. On a miss the query is validated in
+        full -- diagnostics are only computed for failures -- so the
+        ``validate`` call that usually follows a ``False`` is a cache hit.
+        """
+        return self._cached_result(sql_query, dialect).ok
+
+    async def avalidate(
+        self,
+        sql_query: str,
+        *,
+        dialect: Optional[str] = None,
+    ) -> tuple[bool, str]:
+        """
+        Validate without blocking the event loop.
+
+        Cache hits on the exact SQL text are answered inline; everything
+        else runs in ``self.executor``. Concurrent calls for the same query
+        share one in-flight computation, and completed results land in the
+        same cache ``validate`` uses.
+        """
+        result = await self._cache.aget_or_compute(
+            sql_query,
+            dialect,
+            lambda: self._validate_internal(sql_query, dialect),
+            self.executor,
+        )
+        return result.as_tuple()
+
+    async def avalidate_many(
+        self,
+        queries: Iterable[str],
+        *,
+        dialect: Optional[str] = None,
+    ) -> list[tuple[bool, str]]:
+        """
+        Validate many queries concurrently, returning results in input order.
+
+        Duplicate queries in the batch are coalesced into one computation.
+        """
+        import asyncio
+
+        return list(
+            await asyncio.gather(
+                *(self.avalidate(sql, dialect=dialect) for sql in queries)
+            )
+        )
+
+    def update_schema(self, live_tables: list[str]) -> None:
+        """
+        Update the table list and evict only the affected cache entries.
+
+        Cached successes are kept unless they reference a table that was
+        added or dropped; cached failures are always evicted because their
+        messages list the available tables.
+
+        Args:
+            live_tables: New list of available table names.
+        """
+        changed = self._replace_snapshot(self._build_snapshot(live_tables))
+        self._cache.invalidate(changed)
+
+    def apply_changes(
+        self,
+        *,
+        added_tables: Iterable[str] = (),
+        dropped_tables: Iterable[str] = (),
+        renamed: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """
+        Apply an incremental schema change and evict the affected entries.
+
+        See ``SchemaValidator.apply_changes``.
+        """
+        changed = self._apply_table_changes(
+            added_tables, dropped_tables, renamed or {}
+        )
+        self._cache.invalidate(changed)
 
     def clear_cache(self) -> None:
         """Clear the validation cache."""
-        self._validate_cached.cache_clear()
+        self._cache.clear()
 
     def get_cache_info(self) -> dict:
         """
         Get cache statistics.
 
+        ``hits`` is the sum of ``exact_hits`` (the same SQL text was seen
+        before) and ``fingerprint_hits`` (a query of the same shape, e.g.
+        differing only in literals, was seen before).
+
         Returns:
-            A dictionary with keys: ``hits``, ``misses``, ``size``,
-            ``maxsize``, ``hit_rate``.
-        """
-        info = self._validate_cached.cache_info()
-        return {
-            "hits": info.hits,
-            "misses": info.misses,
-            "size": info.currsize,
-            "maxsize": info.maxsize,
-            "hit_rate": (
-                info.hits / (info.hits + info.misses)
-                if (info.hits + info.misses) > 0
-                else 0.0
-            ),
-        }
+            A dictionary with keys: ``hits``, ``exact_hits``,
+            ``fingerprint_hits``, ``misses``, ``size``, ``maxsize``,
+            ``hit_rate``.
+        """
+        return self._cache.info()
@@ -0,0 +1,286 @@
+"""
+On-disk validation cache that survives restarts.
+
+The in-memory cache of the cached validators starts empty in every new
+process, so a fresh deploy re-parses its whole working set before latencies
+settle. ``PersistentCache`` keeps results in a SQLite file next to the
+in-memory LRU: a miss in memory looks on disk before parsing, and every
+computed result is written back.
+
+Entries are keyed on the query fingerprint and dialect within a
+*namespace* derived from the validator class, its options and a hash of
+its schema. A schema change therefore moves lookups to a new namespace, and
+entries computed against the old schema are never served; they age out
+through the size limit like any other cold entry. Several processes on one
+host can share the file -- it is opened in WAL mode so readers do not block
+the writer.
+
+Only results that may be shared across a fingerprint are stored (parse
+errors quote their own SQL). Results are stored as JSON data, never as
+pickles, so a process that can write the shared file cannot make readers
+run code. The cache never fails a validation: a locked, read-only or
+corrupt file degrades to computing the result.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Callable, Hashable, Iterable, Optional
+
+from sqldrift.cache import Dependencies, _is_shareable
+from sqldrift.result import ValidationResult
+
+
+# Bumped whenever the stored result format or the cache key changes, so
+# older entries are never read back
+_FORMAT = 4
+
+# Inserts between checks of the entry count
+_TRIM_EVERY = 512
+
+
+def schema_digest(parts: Iterable[str]) -> str:
+    """
+    Return a stable hash of a schema's names.
+
+    Args:
+        parts: One string per schema object, e.g. ``"table.column"``. The
+            order does not matter.
+    """
+    digest = hashlib.sha256()
+    for part in sorted(parts):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def owner_namespace(owner) -> Callable[[], tuple[object, str]]:
+    """
+    Return a namespace callable resolved through a validator at call time.
+
+    The validator is held weakly and looked up on every call, so a cache
+    neither keeps its validator alive nor forms a reference cycle with it.
+
+    Args:
+        owner: A validator with a ``_cache_namespace()`` method.
+    """
+    ref = weakref.ref(owner)
+
+    def namespace() -> tuple[object, str]:
+        return ref()._cache_namespace()
+
+    return namespace
+
+
+def _encode(result: ValidationResult, deps: Dependencies) -> str:
+    """Serialize a result and its dependencies to JSON."""
+    fixed = result.ok or result.error is not None
+    return json.dumps(
+        {
+            "result": result.to_dict(),
+            # Drift messages are rendered again from the fields
+            "message": result.message if fixed else None,
+            "deps": None if deps is None else [sorted(deps[0]), sorted(deps[1])],
+        },
+        separators=(",", ":"),
+    )
+
+
+def _decode(value: str) -> tuple[ValidationResult, Dependencies]:
+    """Rebuild a result and its dependencies from ``_encode`` output."""
+    data = json.loads(value)
+    deps = data["deps"]
+    return (
+        ValidationResult.from_dict(data["result"], data["message"]),
+        None if deps is None else (frozenset(deps[0]), frozenset(deps[1])),
+    )
+
+
+class PersistentCache:
+    """
+    SQLite-backed cache of ``(ValidationResult, deps)`` pairs.
+
+    Args:
+        path: Path of the SQLite file. Created if it does not exist.
+        namespace: Zero-argument callable returning ``(token, namespace)``:
+            the schema snapshot a computation will run against, and the
+            namespace string its results belong to. A result is only
+            written if the token is unchanged after computing it, so a
+            concurrent schema update cannot file a result under the wrong
+            schema. It is not pickled; the owner of an unpickled cache sets
+            it again.
+        max_entries: Maximum number of entries in the file, across all
+            namespaces. The least recently used are evicted.
+            Defaults to ``100_000``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: Optional[Callable[[], tuple[object, str]]],
+        *,
+        max_entries: int = 100_000,
+    ):
+        self.path = os.fspath(path)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Process that opened ``_conn``; connections do not survive a fork
+        self._pid = 0
+        self._inserts = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def __getstate__(self) -> dict:
+        # The connection stays behind; a shipped copy reopens the file. The
+        # namespace callable refers to the owning validator, which may not be
+        # the copy being shipped: the owner sets it again on unpickling
+        return {"path": self.path, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["path"], None, max_entries=state["max_entries"])
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this process's connection, opening the file if needed."""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key BLOB PRIMARY KEY, namespace TEXT NOT NULL, "
+                "value BLOB NOT NULL, used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_used ON results (used)"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _row_key(namespace: str, key: Hashable) -> bytes:
+        """Hash a namespace and an in-memory cache key into a row key."""
+        return hashlib.sha256(repr((_FORMAT, namespace, key)).encode()).digest()
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], tuple[ValidationResult, Dependencies]],
+    ) -> tuple[ValidationResult, Dependencies]:
+        """
+        Return the stored ``(result, deps)`` for a key, computing it on a miss.
+
+        Args:
+            key: The in-memory cache key (fingerprint and dialect).
+            compute: Zero-argument callable returning ``(result, deps)``.
+        """
+        token, namespace = self.namespace()
+        row_key = self._row_key(namespace, key)
+
+        loaded = self._load(row_key)
+        if loaded is not None:
+            return loaded
+
+        result, deps = compute()
+        if _is_shareable(result) and self.namespace()[0] is token:
+            self._save(row_key, namespace, result, deps)
+        return result, deps
+
+    def _load(
+        self, row_key: bytes
+    ) -> Optional[tuple[ValidationResult, Dependencies]]:
+        """Read and decode one entry, touching its last-used time."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value FROM results WHERE key = ?", (row_key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute(
+                    "UPDATE results SET used = ? WHERE key = ?",
+                    (time.time(), row_key),
+                )
+                self.hits += 1
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+        try:
+            return _decode(row[0])
+        except Exception:
+            # Corrupt, or written by an incompatible version; recompute and
+            # overwrite
+            self.errors += 1
+            return None
+
+    def _save(
+        self,
+        row_key: bytes,
+        namespace: str,
+        result: ValidationResult,
+        deps: Dependencies,
+    ) -> None:
+        """Write one entry, trimming the file every ``_TRIM_EVERY`` inserts."""
+        value = _encode(result, deps)
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                    (row_key, namespace, value, time.time()),
+                )
+                self._inserts += 1
+                if self._inserts % _TRIM_EVERY == 0:
+                    self._trim(conn)
+        except sqlite3.Error:
+            self.errors += 1
+
+    def _trim(self, conn: sqlite3.Connection) -> None:
+        """Evict the least recently used entries beyond ``max_entries``."""
+        (count,) = conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY used LIMIT ?)",
+                (excess,),
+            )
+
+    def trim(self) -> None:
+        """Evict entries beyond ``max_entries`` now."""
+        try:
+            with self._lock:
+                self._trim(self._connect())
+        except sqlite3.Error:
+            self.errors += 1
+
+    def clear(self) -> None:
+        """Delete every entry in the file, for all namespaces."""
+        with self._lock:
+            self._connect().execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connect().execute(
+                "SELECT COUNT(*) FROM results"
+            ).fetchone()
+        return count
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
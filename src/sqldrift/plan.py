@@ -0,0 +1,111 @@
+"""
+Compiled reference plans.
+
+Validating a query is mostly parsing it: checking the references against a
+schema is a handful of set lookups. A saved-query catalog re-validated after
+every schema change therefore spends nearly all its time re-parsing SQL that
+did not change. ``compile`` parses a query once and keeps only what the
+validators check -- its physical tables and its column references -- in a
+small, picklable ``ReferencePlan``. Every validator accepts a plan wherever
+it accepts a query, and checks it against its current schema without
+parsing, in time proportional to the number of references:
+
+    >>> from sqldrift import ColumnValidator, compile
+    >>> plan = compile("SELECT u.name FROM users u")
+    >>> ColumnValidator({"users": {"columns": ["id", "name"]}}).validate(plan)
+    (True, 'All columns exist.')
+    >>> ColumnValidator({"users": {"columns": ["id", "full_name"]}}).validate(plan)[0]
+    False
+
+Names are stored as written in the query, so one plan can be checked by
+validators with different options (case sensitivity, ``preserve_schema``),
+and gives the same result as validating the SQL itself. Queries that fail to
+parse compile to a plan that carries the error.
+"""
+
+from typing import Optional
+
+import sqlglot
+
+from sqldrift.query import Query, is_blank, parse_query
+from sqldrift.references import (
+    QueryReferences,
+    collect_references,
+    iter_physical_tables,
+)
+
+
+class ReferencePlan:
+    """
+    The references of one query, extracted once for repeated checking.
+
+    Attributes:
+        tables: ``(name, qualified_name)`` of each physical table, with CTE
+            references resolved away, or ``None`` if they could not be
+            resolved. Used by ``SchemaValidator``.
+        refs: The tables, aliases, CTE names and deduplicated column
+            references, or ``None`` if the query did not parse. Used by
+            ``ColumnValidator``.
+        error: Why ``tables`` or ``refs`` is missing, as the validators
+            report it, or ``None``.
+        blank: Whether the query was empty SQL text, which the column and
+            unified validators accept and ``SchemaValidator`` rejects.
+    """
+
+    __slots__ = ("tables", "refs", "error", "blank")
+
+    def __init__(
+        self,
+        tables: Optional[tuple[tuple[str, str], ...]],
+        refs: Optional[QueryReferences],
+        error: Optional[str] = None,
+        blank: bool = False,
+    ):
+        self.tables = tables
+        self.refs = refs
+        self.error = error
+        self.blank = blank
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return f"ReferencePlan(error={self.error!r})"
+        return f"ReferencePlan(tables={self.tables!r}, refs={self.refs!r})"
+
+    def __reduce__(self):
+        # Plans are pickled by the hundred thousand; skip the slot state dict
+        return ReferencePlan, (self.tables, self.refs, self.error, self.blank)
+
+
+def compile(sql_query: Query, *, dialect: Optional[str] = None) -> ReferencePlan:
+    """
+    Parse a query once into a plan the validators can check without parsing.
+
+    Args:
+        sql_query: SQL text or a parsed sqlglot expression.
+        dialect: Optional SQL dialect for parsing.
+
+    Returns:
+        A ``ReferencePlan``. Parse errors are recorded in the plan rather
+        than raised, so a catalog can be compiled in one pass.
+    """
+    if isinstance(sql_query, ReferencePlan):
+        return sql_query
+    try:
+        expression = parse_query(sql_query, dialect)
+    except Exception as e:
+        blank = is_blank(sql_query)
+        refs = QueryReferences((), (), frozenset()) if blank else None
+        return ReferencePlan(None, refs, f"Invalid SQL syntax: {e}", blank)
+
+    refs = collect_references(expression)
+    refs = QueryReferences(
+        tuple(refs.tables), tuple(dict.fromkeys(refs.columns)), frozenset(refs.ctes)
+    )
+    try:
+        tables = tuple(dict.fromkeys(iter_physical_tables(expression)))
+    except (sqlglot.errors.ParseError, sqlglot.errors.SqlglotError) as e:
+        return ReferencePlan(None, refs, f"Invalid SQL syntax: {e}")
+    except Exception as e:
+        return ReferencePlan(None, refs, f"Unexpected error during validation: {e}")
+    return ReferencePlan(tables, refs)
+
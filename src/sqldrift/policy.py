@@ -0,0 +1,282 @@
+"""
+Eviction policies for ``ValidationCache``.
+
+A policy only tracks keys: the cache tells it about hits, insertions and
+removals, and the policy answers which keys to evict.
+
+``LRUPolicy`` evicts the least recently used key. It is simple and works
+well when recent queries are the likely next ones, but a burst of one-off
+queries -- an agent exploring a warehouse -- pushes out every hot entry.
+
+``TinyLFUPolicy`` is a W-TinyLFU policy. New keys enter a small LRU
+*window* (1% of the capacity). When a key leaves the window it must win an
+admission contest to enter the main cache: its estimated access frequency is
+compared with that of the main cache's eviction victim, and the more
+frequent of the two stays. Frequencies come from a count-min sketch of
+4-bit counters that are halved periodically, so the estimate follows
+changes in the workload. The main cache is a segmented LRU: keys hit while
+on probation are promoted to a protected segment holding 80% of it. A scan
+of queries seen once therefore only ever churns the window.
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class LRUPolicy:
+    """
+    Least-recently-used eviction.
+
+    Args:
+        maxsize: Maximum number of keys. ``None`` means unbounded.
+    """
+
+    name = "lru"
+
+    def __init__(self, maxsize: Optional[int]):
+        self.maxsize = maxsize
+        self._order: OrderedDict[Hashable, None] = OrderedDict()
+        self.admissions = 0
+        self.rejections = 0
+
+    def touch(self, key: Hashable) -> None:
+        """Record a hit on a resident key."""
+        self._order.move_to_end(key)
+
+    def admit(self, key: Hashable) -> list[Hashable]:
+        """
+        Insert a new key.
+
+        Returns:
+            The keys to evict. Never contains ``key`` itself.
+        """
+        self._order[key] = None
+        self.admissions += 1
+        evicted: list[Hashable] = []
+        if self.maxsize is not None:
+            while len(self._order) > self.maxsize:
+                evicted.append(self._order.popitem(last=False)[0])
+        return evicted
+
+    def discard(self, key: Hashable) -> None:
+        """Forget a key removed by the cache."""
+        self._order.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every key and reset statistics."""
+        self._order.clear()
+        self.admissions = 0
+        self.rejections = 0
+
+
+# Odd 192-bit multiplier spreading a 64-bit hash over six 32-bit slices:
+# four counter rows, then two doorkeeper bits
+_MULTIPLIER = 0x9E3779B97F4A7C15C2B2AE3D27D4EB4F165667B19E3779F9
+_MASK64 = (1 << 64) - 1
+
+
+class _FrequencySketch:
+    """
+    Count-min sketch of 4-bit access counters with periodic aging.
+
+    Four rows of counters are indexed by independent slices of a mixed
+    hash; the estimate is the minimum of the four. A key's first access
+    only sets its bits in a Bloom filter, the *doorkeeper*, so keys seen
+    once never reach the counters and cannot inflate the estimates of
+    others. After ``10 * capacity`` accesses every counter is halved and
+    the doorkeeper is cleared, so old popularity fades.
+    """
+
+    __slots__ = (
+        "_rows", "_doorkeeper", "_mask", "_door_mask", "_samples", "_period",
+    )
+
+    def __init__(self, capacity: int):
+        # Four counters per cached key in each row keep collisions between
+        # keys rare
+        width = 16
+        while width < 4 * capacity and width < 1 << 32:
+            width <<= 1
+        self._mask = width - 1
+        self._period = 10 * max(capacity, 1)
+        # About eight doorkeeper bits per access between resets
+        bits = 128
+        while bits < 8 * self._period and bits < 1 << 32:
+            bits <<= 1
+        self._door_mask = bits - 1
+        self.clear()
+
+    def frequency(self, key: Hashable) -> int:
+        """Return the estimated number of recent accesses to ``key``."""
+        x = ((hash(key) & _MASK64) * _MULTIPLIER) >> 64
+        mask = self._mask
+        a, b, c, d = self._rows
+        count = min(
+            a[x & mask],
+            b[(x >> 32) & mask],
+            c[(x >> 64) & mask],
+            d[(x >> 96) & mask],
+        )
+        return count + self._seen(x)
+
+    def increment(self, key: Hashable) -> None:
+        """Count one access to ``key``."""
+        x = ((hash(key) & _MASK64) * _MULTIPLIER) >> 64
+        if self._seen(x):
+            mask = self._mask
+            for row, i in zip(
+                self._rows,
+                (x & mask, (x >> 32) & mask, (x >> 64) & mask, (x >> 96) & mask),
+            ):
+                if row[i] < 15:
+                    row[i] += 1
+        else:
+            door_mask = self._door_mask
+            doorkeeper = self._doorkeeper
+            i = (x >> 128) & door_mask
+            j = (x >> 160) & door_mask
+            doorkeeper[i >> 3] |= 1 << (i & 7)
+            doorkeeper[j >> 3] |= 1 << (j & 7)
+        self._samples += 1
+        if self._samples >= self._period:
+            self._age()
+
+    def _seen(self, x: int) -> bool:
+        """Return whether the doorkeeper has both bits of a mixed hash."""
+        door_mask = self._door_mask
+        doorkeeper = self._doorkeeper
+        i = (x >> 128) & door_mask
+        j = (x >> 160) & door_mask
+        return bool(
+            doorkeeper[i >> 3] & (1 << (i & 7))
+            and doorkeeper[j >> 3] & (1 << (j & 7))
+        )
+
+    def _age(self) -> None:
+        """Halve every counter and clear the doorkeeper."""
+        halve = bytes(c >> 1 for c in range(256))
+        self._rows = [row.translate(halve) for row in self._rows]
+        self._doorkeeper = bytearray((self._door_mask + 1) >> 3)
+        self._samples //= 2
+
+    def clear(self) -> None:
+        """Reset every counter."""
+        self._rows = [bytearray(self._mask + 1) for _ in range(4)]
+        self._doorkeeper = bytearray((self._door_mask + 1) >> 3)
+        self._samples = 0
+
+
+class TinyLFUPolicy:
+    """
+    W-TinyLFU eviction: an LRU window in front of a frequency-filtered
+    segmented LRU.
+
+    Args:
+        maxsize: Maximum number of keys. Must be bounded.
+    """
+
+    name = "tinylfu"
+
+    def __init__(self, maxsize: Optional[int]):
+        if maxsize is None:
+            raise ValueError("The tinylfu policy needs a bounded cache size")
+        self.maxsize = maxsize
+        self._window_size = max(1, maxsize // 100)
+        main = max(0, maxsize - self._window_size)
+        self._protected_size = int(main * 0.8)
+        self._main_size = main
+
+        self._window: OrderedDict[Hashable, None] = OrderedDict()
+        self._probation: OrderedDict[Hashable, None] = OrderedDict()
+        self._protected: OrderedDict[Hashable, None] = OrderedDict()
+        self._sketch = _FrequencySketch(maxsize)
+
+        self.admissions = 0
+        self.rejections = 0
+
+    def touch(self, key: Hashable) -> None:
+        """Record a hit on a resident key."""
+        self._sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            # A second access promotes it; the protected segment's least
+            # recent key goes back on probation to make room
+            del self._probation[key]
+            self._protected[key] = None
+            if len(self._protected) > self._protected_size:
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+
+    def admit(self, key: Hashable) -> list[Hashable]:
+        """
+        Insert a new key into the window.
+
+        Returns:
+            The keys to evict: the main cache's victim, or the key pushed
+            out of the window if it lost the admission contest.
+        """
+        self._sketch.increment(key)
+        self._window[key] = None
+        if len(self._window) <= self._window_size:
+            return []
+
+        candidate, _ = self._window.popitem(last=False)
+        if len(self._probation) + len(self._protected) < self._main_size:
+            self._probation[candidate] = None
+            self.admissions += 1
+            return []
+
+        segment = self._probation or self._protected
+        if not segment:
+            self.rejections += 1
+            return [candidate]
+        victim = next(iter(segment))
+        frequency = self._sketch.frequency
+        if frequency(candidate) > frequency(victim):
+            del segment[victim]
+            self._probation[candidate] = None
+            self.admissions += 1
+            return [victim]
+        self.rejections += 1
+        return [candidate]
+
+    def discard(self, key: Hashable) -> None:
+        """Forget a key removed by the cache."""
+        for segment in (self._window, self._probation, self._protected):
+            if segment.pop(key, 0) is None:
+                return
+
+    def clear(self) -> None:
+        """Forget every key, reset the sketch and statistics."""
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self._sketch.clear()
+        self.admissions = 0
+        self.rejections = 0
+
+
+_POLICIES = {policy.name: policy for policy in (LRUPolicy, TinyLFUPolicy)}
+
+
+def make_policy(name: str, maxsize: Optional[int]):
+    """
+    Build an eviction policy by name.
+
+    Args:
+        name: ``"lru"`` or ``"tinylfu"``.
+        maxsize: Maximum number of keys.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    try:
+        policy = _POLICIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown cache policy {name!r}; expected one of {sorted(_POLICIES)}"
+        ) from None
+    return policy(maxsize)
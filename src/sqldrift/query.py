@@ -0,0 +1,69 @@
+"""
+Query inputs accepted by the validators.
+
+Every validator accepts either SQL text or an already parsed sqlglot
+expression. Pipelines that parse queries themselves -- to rewrite or
+transpile them -- can hand the expression over and skip a second parse:
+
+    >>> import sqlglot
+    >>> from sqldrift import SchemaValidator
+    >>> expression = sqlglot.parse_one("SELECT * FROM users")
+    >>> SchemaValidator(["users"]).validate(expression)
+    (True, 'Query is safe to execute.')
+
+Expressions are only read, never modified, so the same tree can be passed
+on to later stages afterwards. Validators also accept a ``ReferencePlan``
+compiled from a query (see ``sqldrift.plan``), which they check without
+parsing at all.
+"""
+
+from typing import TYPE_CHECKING, Optional, Union
+
+import sqlglot
+from sqlglot import exp
+
+if TYPE_CHECKING:
+    from sqldrift.plan import ReferencePlan
+
+
+# SQL text, a parsed expression, or a compiled plan (see ``sqldrift.plan``)
+Query = Union[str, exp.Expression, "ReferencePlan"]
+
+
+def parse_query(
+    sql_query: Union[str, exp.Expression], dialect: Optional[str] = None
+) -> exp.Expression:
+    """
+    Return the expression of a query, parsing it if it is SQL text.
+
+    Plans carry no expression; validators check them before parsing.
+
+    Args:
+        sql_query: SQL text or a parsed expression.
+        dialect: SQL dialect used to parse text. Ignored for expressions.
+
+    Returns:
+        The parsed expression, or ``sql_query`` itself if it already is one.
+
+    Raises:
+        sqlglot.errors.ParseError: If the SQL text cannot be parsed.
+    """
+    if isinstance(sql_query, exp.Expression):
+        return sql_query
+    expression = sqlglot.parse_one(sql_query, read=dialect)
+    if expression is None:
+        # Older sqlglot releases return None instead of raising
+        raise sqlglot.errors.ParseError(
+            f"No expression was parsed from {sql_query!r}"
+        )
+    return expression
+
+
+def is_blank(sql_query: Query) -> bool:
+    """Return whether a query is empty or whitespace-only SQL text, or a plan of it."""
+    if isinstance(sql_query, str):
+        return not sql_query.strip()
+    if isinstance(sql_query, exp.Expression):
+        return False
+    # None, or a ``ReferencePlan``
+    return sql_query is None or sql_query.blank
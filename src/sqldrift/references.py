@@ -0,0 +1,187 @@
+"""
+Single-pass collection of the references in a parsed query.
+
+Column validation needs the tables a query reads, their aliases, the names
+of its CTEs and every column reference. Looking each kind up with its own
+``find_all`` walks the whole tree once per kind. ``collect_references``
+visits every node once and records all of them, in the same breadth-first
+order ``find_all`` yields them.
+
+``iter_physical_tables`` resolves the tables ``SchemaValidator`` checks,
+skipping CTE references scope by scope.
+
+Names are returned as written; normalizing them is up to the validator.
+
+Usage:
+    >>> import sqlglot
+    >>> from sqldrift.references import collect_references
+    >>> refs = collect_references(sqlglot.parse_one(
+    ...     "WITH t AS (SELECT id FROM users) SELECT o.total FROM t JOIN orders o ON 1 = 1"
+    ... ))
+    >>> [table[:3] for table in refs.tables]
+    [('t', '', False), ('orders', 'o', False), ('users', '', False)]
+    >>> refs.tables[0][3]
+    frozenset({'t'})
+    >>> refs.columns
+    [('o', 'total'), ('', 'id')]
+    >>> refs.ctes
+    {'t'}
+"""
+
+from collections import deque
+from collections.abc import Collection, Sequence
+from typing import Iterator
+
+from sqlglot import exp
+from sqlglot.errors import ParseError
+from sqlglot.optimizer.scope import build_scope
+
+
+# Base class of every node; older sqlglot releases have no ``Expr``
+_NODE = getattr(exp, "Expr", exp.Expression)
+
+# Arg holding a query's WITH clause; older sqlglot releases call it ``with``
+_WITH = "with_" if "with_" in exp.Select.arg_types else "with"
+
+_NO_CTES: frozenset[str] = frozenset()
+
+
+class QueryReferences:
+    """
+    The raw references of one query.
+
+    Attributes:
+        tables: ``(name, alias, qualified, ctes)`` for each table node,
+            where ``alias`` is ``""`` when there is none, ``qualified``
+            tells whether it names a schema or catalog and ``ctes`` holds
+            the CTE names visible from the table's scope.
+        columns: ``(table_or_alias, column)`` for each column reference,
+            with ``""`` for unqualified references. May repeat.
+        ctes: Names of all the query's CTEs, in any scope.
+    """
+
+    __slots__ = ("tables", "columns", "ctes")
+
+    def __init__(
+        self,
+        tables: Sequence[tuple[str, str, bool, frozenset[str]]],
+        columns: Sequence[tuple[str, str]],
+        ctes: Collection[str],
+    ):
+        self.tables = tables
+        self.columns = columns
+        self.ctes = ctes
+
+    def __reduce__(self):
+        # Plans are pickled by the hundred thousand; skip the slot state dict
+        return QueryReferences, (self.tables, self.columns, self.ctes)
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryReferences(tables={self.tables!r}, "
+            f"columns={self.columns!r}, ctes={self.ctes!r})"
+        )
+
+
+def collect_references(expression: exp.Expression) -> QueryReferences:
+    """
+    Collect the tables, aliases, CTE names and columns of a parsed query.
+
+    The tree is walked once, breadth first. Column nodes are not descended
+    into: below them are only the identifiers already read from them. A
+    query's CTE names are visible to everything below it except the CTE
+    bodies, which see only the CTEs defined before them. Each table records
+    the CTEs it may refer to, without building the query's scopes.
+
+    Args:
+        expression: A parsed query. It is not modified.
+
+    Returns:
+        A ``QueryReferences``.
+    """
+    tables: list[tuple[str, str, bool, frozenset[str]]] = []
+    columns: list[tuple[str, str]] = []
+    ctes: set[str] = set()
+
+    Column, Table, CTE, Identifier = exp.Column, exp.Table, exp.CTE, exp.Identifier
+    With = exp.With
+    node_type, with_key = _NODE, _WITH
+    # Each node is queued with the CTE names visible from it; the sets are
+    # shared down the tree and only copied where a WITH clause adds names
+    queue = deque(((expression, _NO_CTES),))
+    pop, push = queue.popleft, queue.append
+
+    while queue:
+        node, visible = pop()
+        if isinstance(node, Column):
+            columns.append((node.table, node.name))
+            continue
+        if isinstance(node, Identifier):
+            continue
+        args = node.args
+        # Visible below this node, except in its own WITH clause
+        inner = visible
+        with_ = None
+        if isinstance(node, Table):
+            tables.append(
+                (
+                    node.name,
+                    node.alias,
+                    bool(args.get("db") or args.get("catalog")),
+                    visible,
+                )
+            )
+        elif isinstance(node, CTE):
+            ctes.add(node.alias)
+        elif isinstance(node, With):
+            # A CTE body sees the CTEs defined before it, and itself only
+            # under WITH RECURSIVE, as sqlglot's scopes resolve them
+            recursive = bool(args.get("recursive"))
+            for cte in node.expressions:
+                name = {cte.alias}
+                push((cte, inner | name if recursive else inner))
+                inner = inner | name
+            for key, value in args.items():
+                if key != "expressions" and isinstance(value, node_type):
+                    push((value, visible))
+            continue
+        else:
+            with_ = args.get(with_key)
+            if with_ is not None:
+                inner = visible | {cte.alias for cte in with_.expressions}
+
+        for value in args.values():
+            if isinstance(value, list):
+                for child in value:
+                    if isinstance(child, node_type):
+                        push((child, inner))
+            elif isinstance(value, node_type):
+                push((value, visible if value is with_ else inner))
+
+    return QueryReferences(tables, columns, ctes)
+
+
+def iter_physical_tables(expression: exp.Expression) -> Iterator[tuple[str, str]]:
+    """
+    Yield ``(name, qualified_name)`` for each physical table of a query.
+
+    Tables are resolved scope by scope, so a name is skipped only where it
+    refers to a CTE visible from that scope. Scopes are walked lazily, so a
+    consumer that stops early skips the rest of the query. Tables
+    referenced more than once are yielded more than once.
+
+    Args:
+        expression: A parsed query. It is not modified.
+
+    Raises:
+        sqlglot.errors.ParseError: If the expression is not a query, e.g. a
+            misspelled keyword that parsed as a bare column.
+    """
+    root = build_scope(expression)
+    if root is None:
+        raise ParseError(f"Expected a query, got {expression.sql()!r}")
+    for scope in root.traverse():
+        for table in scope.tables:
+            if table.name in scope.cte_sources:
+                continue
+            yield table.this.name, str(table)
@@ -0,0 +1,308 @@
+"""
+Structured validation results.
+
+Validators describe drift as data -- the missing tables and columns, their
+suggestions and a bounded sample of what is available -- and only format the
+human-readable message when it is asked for. A failure against a 10,000-table
+schema therefore stores a few dozen names rather than a message listing every
+table, and callers that only look at the outcome never format anything.
+
+``validate_result`` on every validator returns these objects directly, so
+pipelines can read the missing references instead of parsing the message:
+
+    >>> from sqldrift import SchemaValidator
+    >>> result = SchemaValidator(["users"]).validate_result("SELECT * FROM user")
+    >>> result.ok, [t.name for t in result.missing_tables]
+    (False, ['user'])
+    >>> result.missing_tables[0].suggestions
+    ('users',)
+"""
+
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from sqlglot.exp import Expression
+
+
+# Default number of available names listed in a drift message
+DEFAULT_MESSAGE_LIMIT = 20
+
+
+class MissingTable:
+    """A table referenced by a query that is not in the schema."""
+
+    __slots__ = ("name", "suggestions")
+
+    def __init__(self, name: str, suggestions: tuple[str, ...] = ()):
+        self.name = name
+        self.suggestions = suggestions
+
+    def __repr__(self) -> str:
+        return f"MissingTable({self.name!r}, suggestions={self.suggestions!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {"name": self.name, "suggestions": list(self.suggestions)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MissingTable":
+        """Rebuild a ``MissingTable`` from ``to_dict`` output."""
+        return cls(data["name"], tuple(data["suggestions"]))
+
+
+class MissingColumn:
+    """
+    A column reference that matched no column of the tables it was checked
+    against.
+
+    ``table`` is set when the column was checked against a single table,
+    whose first ``len(available)`` columns (sorted) are listed in
+    ``available`` out of ``available_count``. ``tables`` holds the query's
+    FROM tables an unqualified reference was checked against; both are
+    empty when the column was looked up across the whole schema.
+    """
+
+    __slots__ = (
+        "column", "table", "tables", "available", "available_count", "suggestions",
+    )
+
+    def __init__(
+        self,
+        column: str,
+        *,
+        table: Optional[str] = None,
+        tables: tuple[str, ...] = (),
+        available: tuple[str, ...] = (),
+        available_count: int = 0,
+        suggestions: tuple[str, ...] = (),
+    ):
+        self.column = column
+        self.table = table
+        self.tables = tables
+        self.available = available
+        self.available_count = available_count
+        self.suggestions = suggestions
+
+    def __repr__(self) -> str:
+        return (
+            f"MissingColumn({self.column!r}, table={self.table!r}, "
+            f"suggestions={self.suggestions!r})"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "column": self.column,
+            "table": self.table,
+            "tables": list(self.tables),
+            "available": list(self.available),
+            "available_count": self.available_count,
+            "suggestions": list(self.suggestions),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MissingColumn":
+        """Rebuild a ``MissingColumn`` from ``to_dict`` output."""
+        return cls(
+            data["column"],
+            table=data["table"],
+            tables=tuple(data["tables"]),
+            available=tuple(data["available"]),
+            available_count=data["available_count"],
+            suggestions=tuple(data["suggestions"]),
+        )
+
+
+class ValidationResult:
+    """
+    Outcome of validating one query.
+
+    The message of a failed result is rendered from its structured fields on
+    first access and kept afterwards; success and error messages are fixed
+    strings. Results returned by the cached validators are shared between
+    callers and must be treated as read-only; their timings are those of
+    the call that computed them.
+
+    Args:
+        ok: Whether every referenced table and column exists.
+        message: Fixed message for successes and errors. ``None`` renders
+            the drift message from the other fields.
+        missing_tables: Tables that were not found.
+        available_tables: A sample of available table names: all of them
+            alphabetically when they fit the message limit, otherwise those
+            most similar to the missing tables first.
+        table_count: Total number of available tables.
+        missing_columns: Column references that were not found.
+        error: Parse or validation error message, if any.
+        parse_time: Seconds spent parsing the query.
+        check_time: Seconds spent checking references against the schema,
+            including suggestions.
+
+    Results requested with ``keep_ast=True`` also carry the parsed query
+    and the references extracted from it, so later stages need not parse
+    again. They are ``None`` otherwise:
+
+    - ``expression``: the parsed sqlglot expression.
+    - ``tables``: the normalized tables the query references, sorted.
+    - ``columns``: the deduplicated ``(table_or_None, column)`` references,
+      with aliases resolved to tables (column validators only).
+    """
+
+    __slots__ = (
+        "ok",
+        "missing_tables",
+        "available_tables",
+        "table_count",
+        "missing_columns",
+        "error",
+        "parse_time",
+        "check_time",
+        "expression",
+        "tables",
+        "columns",
+        "_message",
+    )
+
+    def __init__(
+        self,
+        ok: bool,
+        message: Optional[str] = None,
+        *,
+        missing_tables: tuple[MissingTable, ...] = (),
+        available_tables: tuple[str, ...] = (),
+        table_count: int = 0,
+        missing_columns: tuple[MissingColumn, ...] = (),
+        error: Optional[str] = None,
+        parse_time: float = 0.0,
+        check_time: float = 0.0,
+    ):
+        self.ok = ok
+        self.missing_tables = missing_tables
+        self.available_tables = available_tables
+        self.table_count = table_count
+        self.missing_columns = missing_columns
+        self.error = error
+        self.parse_time = parse_time
+        self.check_time = check_time
+        self.expression: Optional[Expression] = None
+        self.tables: Optional[tuple[str, ...]] = None
+        self.columns: Optional[tuple[tuple[Optional[str], str], ...]] = None
+        self._message = message
+
+    @classmethod
+    def failed(cls, error: str, *, parse_time: float = 0.0) -> "ValidationResult":
+        """Return the result for a query that could not be validated."""
+        return cls(False, error, error=error, parse_time=parse_time)
+
+    def __repr__(self) -> str:
+        return f"ValidationResult(ok={self.ok!r}, message={self.message!r})"
+
+    @property
+    def message(self) -> str:
+        """Human-readable message, rendered on first access."""
+        message = self._message
+        if message is None:
+            message = self._message = self._render()
+        return message
+
+    @property
+    def shareable(self) -> bool:
+        """
+        ``True`` if the result may be shared across a query fingerprint.
+
+        Parse errors quote the offending SQL, so they are not.
+        """
+        return self.error is None or not self.error.startswith("Invalid SQL syntax")
+
+    def as_tuple(self) -> tuple[bool, str]:
+        """Return the ``(success, message)`` tuple the validators return."""
+        return self.ok, self.message
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return a JSON-serializable representation.
+
+        The message is not included; read ``message`` if it is needed.
+        """
+        return {
+            "ok": self.ok,
+            "missing_tables": [t.to_dict() for t in self.missing_tables],
+            "available_tables": list(self.available_tables),
+            "table_count": self.table_count,
+            "missing_columns": [c.to_dict() for c in self.missing_columns],
+            "error": self.error,
+            "parse_time": self.parse_time,
+            "check_time": self.check_time,
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], message: Optional[str] = None
+    ) -> "ValidationResult":
+        """
+        Rebuild a result from ``to_dict`` output.
+
+        Args:
+            data: A dictionary returned by ``to_dict``.
+            message: The fixed message of a success or error, which
+                ``to_dict`` leaves out. ``None`` renders the drift message.
+        """
+        return cls(
+            data["ok"],
+            message,
+            missing_tables=tuple(
+                MissingTable.from_dict(t) for t in data["missing_tables"]
+            ),
+            available_tables=tuple(data["available_tables"]),
+            table_count=data["table_count"],
+            missing_columns=tuple(
+                MissingColumn.from_dict(c) for c in data["missing_columns"]
+            ),
+            error=data["error"],
+            parse_time=data["parse_time"],
+            check_time=data["check_time"],
+        )
+
+    def _render(self) -> str:
+        """Format the drift blocks."""
+        blocks: list[str] = []
+
+        if self.missing_tables:
+            parts: list[str] = []
+            for missing in self.missing_tables:
+                line = f"- Table '{missing.name}' not found"
+                if missing.suggestions:
+                    line += f". Did you mean: {', '.join(missing.suggestions)}"
+                parts.append(line)
+            parts.append(
+                "  Available tables: "
+                + _listing(self.available_tables, self.table_count)
+            )
+            blocks.append("Schema Drift Detected:\n" + "\n".join(parts))
+
+        if self.missing_columns:
+            parts = []
+            for missing in self.missing_columns:
+                line = f"- Column '{missing.column}' not found"
+                # Show which table it was checked against
+                if missing.table:
+                    line += f" in table '{missing.table}'"
+                    line += ". Available columns: " + _listing(
+                        missing.available, missing.available_count
+                    )
+                elif missing.tables:
+                    line += f" in tables: {', '.join(missing.tables)}"
+                if missing.suggestions:
+                    line += f". Did you mean: {', '.join(missing.suggestions)}"
+                parts.append(line)
+            blocks.append("Column Drift Detected:\n" + "\n".join(parts))
+
+        return "\n\n".join(blocks)
+
+
+def _listing(names: tuple[str, ...], total: int) -> str:
+    """Join a sample of names, noting how many were left out."""
+    text = ", ".join(names)
+    if total > len(names):
+        text += f", ... ({total - len(names):,} more)"
+    return text
@@ -0,0 +1,209 @@
+"""
+Streaming validation of query logs.
+
+``iter_validate`` reads a query log lazily -- JSON lines, CSV or plain SQL --
+and yields one result per statement, so memory stays flat no matter how large
+the log is. With ``workers > 1`` statements are validated in a process pool
+with a bounded number in flight; results are still yielded in log order, and
+the reader only advances as fast as the consumer pulls results.
+
+Usage:
+    >>> from sqldrift import SchemaValidator
+    >>> from sqldrift.stream import iter_validate
+    >>>
+    >>> validator = SchemaValidator(["users", "orders"])
+    >>> with open("queries.jsonl") as f:
+    ...     for record in iter_validate(f, validator):
+    ...         if not record.success:
+    ...             print(record.line, record.message)
+"""
+
+import csv
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+
+from sqldrift.batch import _init_worker, _shipped, _validate_chunk
+
+
+class LogRecord(NamedTuple):
+    """A single statement read from a query log."""
+
+    line: int  # 1-based line number where the statement starts
+    sql: str
+
+
+class LogResult(NamedTuple):
+    """Validation result for one statement of a query log."""
+
+    line: int  # 1-based line number where the statement starts
+    sql: str
+    success: bool
+    message: str
+
+
+def _detect_format(first_line: str) -> str:
+    """Guess the log format from its first non-blank line."""
+    stripped = first_line.lstrip()
+    if stripped.startswith("{"):
+        return "jsonl"
+    return "sql"
+
+
+def _chain_first(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    """Put back an item consumed while sniffing the format."""
+    yield first
+    yield from rest
+
+
+def iter_queries(
+    lines: Iterable[str],
+    *,
+    log_format: str = "auto",
+    field: str = "query",
+) -> Iterator[LogRecord]:
+    """
+    Lazily extract SQL statements from a query log.
+
+    Args:
+        lines: An iterable of text lines, e.g. an open file.
+        log_format: ``"jsonl"`` (one JSON object per line), ``"csv"`` (with a
+            header row), ``"sql"`` (statements terminated by ``;`` or a blank
+            line) or ``"auto"`` (``jsonl`` if the first non-blank line starts
+            with ``{``, otherwise ``sql``). Defaults to ``"auto"``.
+        field: JSON key or CSV column holding the SQL text.
+            Defaults to ``"query"``.
+
+    Yields:
+        ``LogRecord(line, sql)`` tuples. JSON lines that fail to decode or
+        lack ``field`` are skipped.
+    """
+    numbered = enumerate(lines, start=1)
+
+    if log_format == "auto":
+        for lineno, text in numbered:
+            if text.strip():
+                log_format = _detect_format(text)
+                numbered = _chain_first((lineno, text), numbered)
+                break
+        else:
+            return
+
+    if log_format == "jsonl":
+        for lineno, text in numbered:
+            if not text.strip():
+                continue
+            try:
+                sql = json.loads(text).get(field)
+            except (ValueError, AttributeError):
+                continue
+            if isinstance(sql, str):
+                yield LogRecord(lineno, sql)
+
+    elif log_format == "csv":
+        # csv.reader handles quoted fields spanning several lines; track the
+        # line each row starts on through the reader's own counter
+        reader = csv.reader(text for _, text in numbered)
+        header = next(reader, None)
+        if header is None or field not in header:
+            raise ValueError(f"CSV log has no {field!r} column")
+        index = header.index(field)
+        row_start = reader.line_num + 1
+        for row in reader:
+            if len(row) > index:
+                yield LogRecord(row_start, row[index])
+            row_start = reader.line_num + 1
+
+    elif log_format == "sql":
+        buffer: list[str] = []
+        start = 0
+        for lineno, text in numbered:
+            stripped = text.strip()
+            if not stripped:
+                if buffer:
+                    yield LogRecord(start, "\n".join(buffer))
+                    buffer = []
+                continue
+            if not buffer:
+                start = lineno
+            buffer.append(text.rstrip("\r\n"))
+            if stripped.endswith(";"):
+                yield LogRecord(start, "\n".join(buffer))
+                buffer = []
+        if buffer:
+            yield LogRecord(start, "\n".join(buffer))
+
+    else:
+        raise ValueError(f"Unknown log format: {log_format!r}")
+
+
+def iter_validate(
+    lines: Iterable[str],
+    validator: Any,
+    *,
+    dialect: Optional[str] = None,
+    log_format: str = "auto",
+    field: str = "query",
+    workers: int = 1,
+    chunksize: int = 64,
+    max_pending: Optional[int] = None,
+) -> Iterator[LogResult]:
+    """
+    Validate every statement of a query log, yielding results in order.
+
+    Args:
+        lines: An iterable of text lines, e.g. an open file.
+        validator: A ``SchemaValidator`` or ``ColumnValidator`` (or subclass).
+        dialect: Optional SQL dialect for parsing.
+        log_format: Log format, see ``iter_queries``. Defaults to ``"auto"``.
+        field: JSON key or CSV column holding the SQL text.
+        workers: Number of worker processes. ``1`` validates inline.
+        chunksize: Statements sent to a worker per task.
+        max_pending: Maximum number of chunks in flight when
+            ``workers > 1``. Reading pauses until the consumer drains
+            results, so memory is bounded by
+            ``max_pending * chunksize`` statements. Defaults to
+            ``2 * workers``.
+
+    Yields:
+        ``LogResult(line, sql, success, message)`` tuples.
+    """
+    records = iter_queries(lines, log_format=log_format, field=field)
+
+    if workers <= 1:
+        for record in records:
+            success, message = validator.validate(record.sql, dialect=dialect)
+            yield LogResult(record.line, record.sql, success, message)
+        return
+
+    if max_pending is None:
+        max_pending = 2 * workers
+
+    with _shipped(validator) as shipped, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(shipped,),
+    ) as pool:
+        pending: deque = deque()
+
+        def submit() -> bool:
+            chunk = list(islice(records, chunksize))
+            if not chunk:
+                return False
+            future = pool.submit(
+                _validate_chunk, [r.sql for r in chunk], dialect
+            )
+            pending.append((chunk, future))
+            return True
+
+        while len(pending) < max_pending and submit():
+            pass
+
+        while pending:
+            chunk, future = pending.popleft()
+            # Refill before blocking so workers stay busy while we yield
+            submit()
+            for record, (success, message) in zip(chunk, future.result()):
+                yield LogResult(record.line, record.sql, success, message)
@@ -0,0 +1,338 @@
+"""
+Trigram index for "did you mean" suggestions.
+
+Every name is split into overlapping three-character grams, padded so that
+prefixes and suffixes get grams of their own. An inverted index maps each
+gram to the names containing it. A lookup only visits names that share at
+least one gram with the query, so the cost grows with the number of
+plausible candidates rather than with the size of the schema.
+
+The same postings bound edit distance: one edit changes at most four
+grams, so a name within ``k`` edits of the query shares all but ``4k`` of
+its grams. Typo lookups count shared grams first and run the edit-distance
+computation only on the few names that pass.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import chain, filterfalse
+from typing import Iterable, Optional
+
+
+# Minimum similarity for a fuzzy match
+_THRESHOLD = 0.3
+
+
+def trigrams(name: str) -> set[str]:
+    """
+    Return the padded trigrams of a name.
+
+    Two spaces are prepended and one appended, so ``"abc"`` yields
+    ``{"  a", " ab", "abc", "bc "}``.
+    """
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Return the edit distance between two strings, capped at ``limit + 1``.
+
+    Insertions, deletions, substitutions and swaps of adjacent characters
+    each count as one edit (optimal string alignment distance). Rows of the
+    dynamic programme are abandoned as soon as every cell exceeds
+    ``limit``, so distant pairs cost little.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(a) - len(b) > limit:
+        return limit + 1
+    before: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if (
+                i > 1 and j > 1
+                and char_a == b[j - 2] and a[i - 2] == char_b
+            ):
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit and (i == len(a) or min(previous) > limit):
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def edit_budget(name: str) -> int:
+    """Return the number of typos tolerated in a name of this length."""
+    if len(name) <= 2:
+        return 0
+    return 1 if len(name) <= 6 else 2
+
+
+def match_score(
+    name: str, candidate: str, *, max_edits: int = 0
+) -> Optional[float]:
+    """
+    Score one candidate the way ``TrigramIndex.suggest`` ranks it.
+
+    Returns:
+        The larger of the trigram Jaccard similarity and, within
+        ``max_edits`` edits, ``1 - distance / length``; ``None`` if the
+        candidate is neither similar enough nor a substring or prefix
+        match.
+    """
+    grams = trigrams(name)
+    other = trigrams(candidate)
+    count = len(grams & other)
+    score = count / (len(grams) + len(other) - count)
+    if max_edits:
+        distance = edit_distance(name, candidate, max_edits)
+        if distance <= max_edits:
+            score = max(score, 1 - distance / max(len(name), len(candidate)))
+    if score >= _THRESHOLD or _is_related(name, candidate):
+        return score
+    return None
+
+
+def _is_related(name: str, candidate: str) -> bool:
+    """Return ``True`` for substring or three-character prefix matches."""
+    return (
+        name in candidate
+        or candidate in name
+        or (len(name) >= 3 and candidate[:3] == name[:3])
+    )
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index over a set of names.
+
+    An index is never mutated once built; ``updated`` derives a new one for
+    a changed set of names. Names should already be normalized the way
+    queries will be looked up (e.g. lower-cased).
+
+    Args:
+        names: The names to index. Duplicates are ignored.
+    """
+
+    __slots__ = ("names", "_keys", "_ids", "_sizes", "_postings")
+
+    def __init__(self, names: Iterable[str]):
+        self.names: list[str] = sorted(set(names))
+        # Postings hold ids that stay stable across ``updated``, so a derived
+        # index shares the lists of every gram its changes do not touch.
+        # Names removed since the last full build leave ``None`` behind.
+        self._keys: list[Optional[str]] = list(self.names)
+        self._ids: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        # Number of distinct grams per id, for the similarity denominator
+        self._sizes: list[int] = []
+        self._postings: dict[str, list[int]] = {}
+        for i, name in enumerate(self.names):
+            grams = trigrams(name)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def updated(
+        self, added: Iterable[str] = (), removed: Iterable[str] = ()
+    ) -> "TrigramIndex":
+        """
+        Return a copy of the index with names added and removed.
+
+        Only the postings of the grams of changed names are copied; the
+        rest are shared with this index, which is left untouched. The cost
+        grows with the size of the change and the postings it touches, plus
+        one copy of the name list, rather than with re-indexing every name.
+
+        Args:
+            added: Names to add. Names already indexed are ignored.
+            removed: Names to remove. Names not indexed are ignored.
+        """
+        ids = self._ids
+        added = {name for name in added if name not in ids}
+        removed = {name for name in removed if name in ids}
+        if not added and not removed:
+            return self
+        holes = len(self._keys) - len(ids) + len(removed)
+        if len(added) + len(removed) > len(ids) // 4 or holes > len(ids) // 2:
+            # A large change is re-indexed faster than patched, and a full
+            # build drops the ids of removed names
+            return TrigramIndex(chain(set(ids).difference(removed), added))
+
+        index = TrigramIndex(())
+        names = index.names = list(self.names)
+        keys = index._keys = list(self._keys)
+        ids = index._ids = dict(ids)
+        sizes = index._sizes = list(self._sizes)
+        postings = index._postings = dict(self._postings)
+
+        # Removed ids per gram, filtered out in one pass over each posting
+        gone: dict[str, set[int]] = {}
+        for name in removed:
+            i = ids.pop(name)
+            keys[i] = None
+            del names[bisect_left(names, name)]
+            for gram in trigrams(name):
+                gone.setdefault(gram, set()).add(i)
+        # Grams whose postings list this index owns and may edit
+        owned: set[str] = set()
+        for gram, dropped in gone.items():
+            posting = list(filterfalse(dropped.__contains__, postings[gram]))
+            if posting:
+                postings[gram] = posting
+                owned.add(gram)
+            else:
+                del postings[gram]
+
+        for name in added:
+            i = ids[name] = len(keys)
+            keys.append(name)
+            insort(names, name)
+            grams = trigrams(name)
+            sizes.append(len(grams))
+            for gram in grams:
+                if gram not in owned:
+                    owned.add(gram)
+                    postings[gram] = list(postings.get(gram, ()))
+                postings[gram].append(i)
+        return index
+
+    def suggest(
+        self, name: str, *, max_results: int = 5, max_edits: int = 0
+    ) -> list[str]:
+        """
+        Return indexed names similar to ``name``, best match first.
+
+        Names are scored by the Jaccard similarity of their trigram sets,
+        or by ``1 - distance / length`` when they are within ``max_edits``
+        edits of ``name``, whichever is higher. Ties are broken
+        alphabetically. Names scoring at least 0.3 come first; remaining
+        slots are filled with names that contain ``name`` (or are contained
+        in it) or share its first three characters. Names shorter than
+        three characters share no full trigram with the names containing
+        them, so for them the index is scanned until the slots are filled.
+
+        Args:
+            name: The normalized name to look up.
+            max_results: Maximum number of suggestions to return.
+            max_edits: Edit distance within which a name counts as a typo
+                of ``name``. ``0`` ranks by trigram similarity only.
+
+        Returns:
+            Up to ``max_results`` indexed names.
+        """
+        grams = trigrams(name)
+        postings = self._postings
+        # Shared gram count per candidate; Counter tallies in C
+        shared = Counter(chain.from_iterable(
+            postings[gram] for gram in grams if gram in postings
+        ))
+
+        sizes = self._sizes
+        size = len(grams)
+        scores: dict[int, float] = {}
+        # Min-heap of the best ``max_results`` scores so far
+        floor: list[float] = []
+
+        # A candidate sharing ``count`` grams scores at most ``count / size``.
+        # Only candidates that can reach the threshold are ranked, best
+        # bound first, stopping once no later one can beat the worst kept.
+        need = _THRESHOLD * size
+        bounded = sorted(
+            ((count, i) for i, count in shared.items() if count >= need),
+            reverse=True,
+        )
+        for count, i in bounded:
+            full = len(floor) == max_results
+            if full and count / size < floor[0]:
+                break
+            score = count / (size + sizes[i] - count)
+            if score < _THRESHOLD:
+                continue
+            scores[i] = score
+            if full:
+                heapq.heappushpop(floor, score)
+            else:
+                heapq.heappush(floor, score)
+
+        if max_edits:
+            self._add_typos(name, shared, size - 4 * max_edits, max_edits, scores)
+
+        best = self._best(scores.items(), max_results)
+        if len(best) < max_results:
+            best += self._best(
+                self._related(name, shared, size, scores),
+                max_results - len(best),
+            )
+        if len(best) < max_results and 0 < len(name) < 3:
+            # A name this short has no full trigram, so names containing it
+            # need not share any of its padded grams
+            best += self._scan(name, shared, max_results - len(best))
+        return best
+
+    def _scan(self, name: str, shared: Counter, n: int) -> list[str]:
+        """Return the alphabetically first ``n`` related names not in ``shared``."""
+        ids = self._ids
+        found: list[str] = []
+        for candidate in self.names:
+            if ids[candidate] not in shared and _is_related(name, candidate):
+                found.append(candidate)
+                if len(found) == n:
+                    break
+        return found
+
+    def _best(self, scored: Iterable[tuple[int, float]], n: int) -> list[str]:
+        """Return the names of the ``n`` best scored ids, ties alphabetical."""
+        keys = self._keys
+        best = heapq.nsmallest(n, scored, key=lambda item: (-item[1], keys[item[0]]))
+        return [keys[i] for i, _ in best]
+
+    def _add_typos(
+        self,
+        name: str,
+        shared: Counter,
+        need: int,
+        max_edits: int,
+        scores: dict[int, float],
+    ) -> None:
+        """Score names within ``max_edits`` edits of ``name`` into ``scores``."""
+        keys = self._keys
+        length = len(name)
+        for i, count in shared.items():
+            if count < need:
+                continue
+            candidate = keys[i]
+            if abs(len(candidate) - length) > max_edits:
+                continue
+            distance = edit_distance(name, candidate, max_edits)
+            if distance <= max_edits:
+                score = 1 - distance / max(length, len(candidate))
+                if score > scores.get(i, 0.0):
+                    scores[i] = score
+
+    def _related(
+        self,
+        name: str,
+        shared: Counter,
+        size: int,
+        scores: dict[int, float],
+    ) -> list[tuple[int, float]]:
+        """Score substring and prefix matches that were not ranked already."""
+        keys = self._keys
+        sizes = self._sizes
+        related: list[tuple[int, float]] = []
+        for i, count in shared.items():
+            if i not in scores and _is_related(name, keys[i]):
+                related.append((i, count / (size + sizes[i] - count)))
+        return related
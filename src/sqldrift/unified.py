@@ -0,0 +1,306 @@
+"""
+Single-parse table and column drift detection.
+
+``SchemaValidator`` and ``ColumnValidator`` each parse the query on their own,
+so running both over the same SQL pays for parsing twice. ``UnifiedValidator``
+parses once and feeds the same expression to both checks, returning table-level
+and column-level drift in a single result.
+
+Usage:
+    >>> from sqldrift import UnifiedValidator
+    >>>
+    >>> schema = {
+    ...     "users": {"columns": ["id", "name", "email"]},
+    ...     "orders": {"columns": ["id", "user_id", "total"]},
+    ... }
+    >>> validator = UnifiedValidator(schema)
+    >>> validator.validate("SELECT name FROM users")
+    (True, 'Query is safe to execute.')
+"""
+
+import copy
+import threading
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+import sqlglot
+from typing import Iterable, Mapping, Optional, Union
+
+from sqldrift.optimized import SchemaValidator
+from sqldrift.column_validator import ColumnValidator, SchemaDict
+from sqldrift.plan import ReferencePlan
+from sqldrift.query import Query, is_blank, parse_query
+from sqldrift.references import collect_references
+from sqldrift.result import DEFAULT_MESSAGE_LIMIT, ValidationResult
+
+
+class UnifiedValidator:
+    """
+    Validates SQL queries for both table-level and column-level drift.
+
+    The query is parsed once; the table check and the column check both
+    run on the resulting expression. The live table list is derived from
+    the keys of the column schema.
+
+    Args:
+        schema: Dictionary mapping table names to column definitions,
+            in the same format accepted by ``ColumnValidator``.
+        case_sensitive: If ``True``, table and column matching is
+            case-sensitive. Defaults to ``False``.
+        message_limit: Maximum number of available tables, and of available
+            columns per missing column, listed in a drift message.
+            Defaults to ``20``.
+
+    Examples:
+        >>> v = UnifiedValidator({"users": {"columns": ["id", "name"]}})
+        >>> v.validate("SELECT tier FROM orders")[0]
+        False
+    """
+
+    def __init__(
+        self,
+        schema: SchemaDict,
+        *,
+        case_sensitive: bool = False,
+        message_limit: int = DEFAULT_MESSAGE_LIMIT,
+    ):
+        self.case_sensitive = case_sensitive
+        self.table_validator = SchemaValidator(
+            list(schema),
+            case_sensitive=case_sensitive,
+            message_limit=message_limit,
+        )
+        self.column_validator = ColumnValidator(
+            schema,
+            case_sensitive=case_sensitive,
+            message_limit=message_limit,
+        )
+        # Both validators' snapshots, published together so a concurrent
+        # ``validate`` never pairs new tables with old columns
+        self._write_lock = threading.Lock()
+        self._publish()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_write_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._write_lock = threading.Lock()
+
+    def _publish(self) -> None:
+        """Expose the validators' current snapshots to ``validate``."""
+        self._state = (self.table_validator._state, self.column_validator._state)
+
+    def validate(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+    ) -> tuple[bool, str]:
+        """
+        Validate that all tables and columns referenced in a query exist.
+
+        Args:
+            sql_query: The SQL query string to validate, a parsed sqlglot
+                expression, which is validated without parsing again, or a
+                plan from ``sqldrift.compile``, which is checked without
+                parsing at all.
+            dialect: Optional SQL dialect for parsing.
+
+        Returns:
+            A ``(success, message)`` tuple:
+
+            - ``(True, "Query is safe to execute.")`` -- everything exists.
+            - ``(False, "Schema Drift Detected: ...")`` and/or
+              ``"Column Drift Detected: ..."`` blocks -- missing references.
+            - ``(False, "Invalid SQL syntax: ...")`` -- parse failure.
+        """
+        return self.validate_result(sql_query, dialect=dialect).as_tuple()
+
+    def validate_result(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+        keep_ast: bool = False,
+    ) -> ValidationResult:
+        """
+        Validate a query and return a structured result.
+
+        The result carries both the missing tables and the missing columns.
+
+        Args:
+            sql_query: The SQL query string to validate, a parsed sqlglot
+                expression or a compiled plan.
+            dialect: Optional SQL dialect for parsing.
+            keep_ast: If ``True``, the result also carries the parsed
+                ``expression``, the physical ``tables`` referenced (CTEs
+                excluded) and the ``columns`` referenced. Plans carry no
+                expression.
+
+        Returns:
+            A ``ValidationResult``.
+        """
+        if is_blank(sql_query):
+            return ValidationResult(True, "Query is safe to execute.")
+
+        table_state, column_state = self._state
+        start = time.perf_counter()
+        try:
+            if isinstance(sql_query, ReferencePlan):
+                if sql_query.tables is None:
+                    return ValidationResult.failed(sql_query.error)
+                expression = None
+                parsed = start
+                refs = sql_query.refs
+                referenced_tables = set(
+                    self.table_validator._normalize_tables(sql_query.tables)
+                )
+            else:
+                expression = parse_query(sql_query, dialect)
+                parsed = time.perf_counter()
+                refs = collect_references(expression)
+                referenced_tables = self.table_validator._referenced_tables(
+                    expression
+                )
+        except (sqlglot.errors.ParseError, sqlglot.errors.SqlglotError) as e:
+            return ValidationResult.failed(
+                f"Invalid SQL syntax: {e}", parse_time=time.perf_counter() - start
+            )
+        except Exception as e:
+            return ValidationResult.failed(
+                f"Unexpected error during validation: {e}",
+                parse_time=time.perf_counter() - start,
+            )
+
+        result = self.table_validator._table_drift(referenced_tables, table_state)
+        from_tables, columns = self.column_validator._resolve_refs(refs)
+        column_drift = self.column_validator._check_columns(
+            from_tables, columns, column_state
+        )
+        if result is None:
+            result = column_drift or ValidationResult(
+                True, "Query is safe to execute."
+            )
+        elif column_drift is not None:
+            # One result carrying both blocks
+            result.missing_columns = column_drift.missing_columns
+
+        result.parse_time = parsed - start
+        result.check_time = time.perf_counter() - parsed
+        if keep_ast:
+            result.expression = expression
+            result.tables = tuple(sorted(referenced_tables))
+            result.columns = tuple(columns)
+        return result
+
+    def is_valid(
+        self,
+        sql_query: Query,
+        *,
+        dialect: Optional[str] = None,
+    ) -> bool:
+        """
+        Return whether every table and column referenced in a query exists.
+
+        Parses once, stops at the first missing reference and computes no
+        diagnostics. See ``SchemaValidator.is_valid``.
+
+        Args:
+            sql_query: The SQL query string to check, a parsed sqlglot
+                expression or a compiled plan.
+            dialect: Optional SQL dialect for parsing.
+
+        Returns:
+            ``True`` if the query parses and all its references exist.
+        """
+        if is_blank(sql_query):
+            return True
+
+        table_state, column_state = self._state
+        tables = table_state.tables
+        if isinstance(sql_query, ReferencePlan):
+            if sql_query.tables is None or not all(
+                name in tables
+                for name in self.table_validator._normalize_tables(sql_query.tables)
+            ):
+                return False
+            refs = sql_query.refs
+        else:
+            try:
+                expression = parse_query(sql_query, dialect)
+                if not all(
+                    name in tables
+                    for name in self.table_validator._iter_referenced_tables(
+                        expression
+                    )
+                ):
+                    return False
+            except Exception:
+                return False
+            refs = collect_references(expression)
+        return self.column_validator._columns_exist(refs, column_state)
+
+    def update_schema(self, schema: SchemaDict) -> None:
+        """
+        Update both the table and column lookups with a new schema.
+
+        Args:
+            schema: New schema dictionary.
+        """
+        with self._write_lock:
+            self.table_validator.update_schema(list(schema))
+            self.column_validator.update_schema(schema)
+            self._publish()
+
+    def apply_changes(
+        self,
+        *,
+        added_tables: Optional[SchemaDict] = None,
+        dropped_tables: Iterable[str] = (),
+        added_columns: Optional[SchemaDict] = None,
+        dropped_columns: Optional[Mapping[str, Iterable[str]]] = None,
+        renamed: Optional[Mapping[Union[str, tuple[str, str]], str]] = None,
+    ) -> None:
+        """
+        Apply an incremental schema change to both lookups.
+
+        See ``ColumnValidator.apply_changes`` for the argument format.
+        """
+        added_tables = added_tables or {}
+        dropped_tables = list(dropped_tables)
+        renamed = renamed or {}
+        with self._write_lock:
+            self.table_validator.apply_changes(
+                added_tables=list(added_tables),
+                dropped_tables=dropped_tables,
+                renamed={
+                    old: new for old, new in renamed.items()
+                    if not isinstance(old, tuple)
+                },
+            )
+            self.column_validator.apply_changes(
+                added_tables=added_tables,
+                dropped_tables=dropped_tables,
+                added_columns=added_columns,
+                dropped_columns=dropped_columns,
+                renamed=renamed,
+            )
+            self._publish()
+
+    def _share(self) -> tuple["UnifiedValidator", list[SharedMemory]]:
+        """
+        Prepare a copy for shipping to worker processes, with the column
+        index in shared memory (see ``ColumnValidator._share``).
+        """
+        column_validator, blocks = self.column_validator._share()
+        shipped = copy.copy(self)
+        shipped.column_validator = column_validator
+        shipped._publish()
+        return shipped, blocks
+
+    def get_table_count(self) -> int:
+        """Return the number of tables in the schema."""
+        return len(self._state[0].tables)
@@ -1,17 +1,38 @@
 """
 Core validation function for detecting schema drift in SQL queries.
 
-This module provides a simple, stateless function for one-off query validation.
-For better performance with large schemas or repeated queries, use the
-class-based validators in sqldrift.optimized.
+This module provides a simple function for one-off query validation. Behind
+it, a small registry keeps the ``SchemaValidator`` built for each recently
+seen table list, so callers that pass the same tables on every call get
+class-level speed. For caching of query results, use the cached validators
+in sqldrift.optimized.
 """
 
-import sqlglot
-from sqlglot.optimizer.scope import build_scope
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+from sqldrift.optimized import SchemaValidator
+from sqldrift.query import Query
+
+
+# Number of distinct table lists whose validators are kept for reuse
+_REGISTRY_SIZE = 8
+
+# id of the caller's table list -> (that list, a copy of its contents,
+# validator), least recent first. The list itself is held so its id cannot
+# be reused by another object while the entry exists.
+_registry: OrderedDict[
+    int, tuple[Iterable[str], list[str], SchemaValidator]
+] = OrderedDict()
+_registry_lock = threading.Lock()
+
+# Prefix of the validators' errors that are not parse errors
+_UNEXPECTED = "Unexpected error during validation: "
 
 
 def validate_query(
-    sql_query: str,
+    sql_query: Query,
     live_tables: list[str],
     *,
     dialect: str | None = None,
@@ -24,7 +45,8 @@ def validate_query(
     of live tables.
 
     Args:
-        sql_query: The SQL query string to validate.
+        sql_query: The SQL query string to validate, a parsed sqlglot
+            expression, or a plan from ``sqldrift.compile``.
         live_tables: List of table names that currently exist in the schema.
             Supports schema-qualified names (e.g., ``"public.users"``); only
             the base table name is matched by default.
@@ -46,54 +68,54 @@ def validate_query(
         (False, "Schema Drift Detected: The following tables were not found: ['deleted_table']")
     """
     try:
-        expression = sqlglot.parse_one(sql_query, read=dialect)
-
-        # Normalize live tables: extract base name and lower-case
-        live_set = {t.split(".")[-1].lower().strip() for t in live_tables}
-
-        # Use build_scope to distinguish physical tables from CTEs/aliases
-        root_scope = build_scope(expression)
-
-        referenced_tables: set[str] = set()
-
-        for scope in root_scope.traverse():
-            for table in scope.tables:
-                # Skip CTEs defined in the query
-                if table.name in scope.cte_sources:
-                    continue
-
-                name = table.this.name.lower()
-                referenced_tables.add(name)
-
-        missing_tables = referenced_tables - live_set
-
-        if missing_tables:
-            parts: list[str] = []
-            available = sorted(live_set)
-
-            for table in sorted(missing_tables):
-                line = f"- Table '{table}' not found"
-
-                # Suggest similar tables
-                suggestions = [
-                    c for c in available
-                    if table in c or c in table
-                    or (len(table) >= 3 and table[:3] == c[:3])
-                ]
-                if suggestions:
-                    line += f". Did you mean: {', '.join(suggestions[:5])}"
-
-                parts.append(line)
-
-            parts.append(f"  Available tables: {', '.join(available)}")
-
-            detail_block = "\n".join(parts)
-            return (
-                False,
-                f"Schema Drift Detected:\n{detail_block}",
-            )
-
-        return True, "Query is safe to execute."
-
+        validator = _validator_for(live_tables)
     except Exception as e:
         return False, f"Invalid SQL syntax: {e}"
+    result = validator.validate_result(sql_query, dialect=dialect)
+    error = result.error
+    if error is not None and error.startswith(_UNEXPECTED):
+        # validate_query has always reported any failure to validate as a
+        # syntax error
+        return False, f"Invalid SQL syntax: {error[len(_UNEXPECTED):]}"
+    return result.as_tuple()
+
+
+def _validator_for(live_tables: Iterable[str]) -> SchemaValidator:
+    """
+    Return a ``SchemaValidator`` for a table list, reusing a recent one.
+
+    Validators are kept in a small LRU registry keyed by the identity of
+    the table list, so a caller passing the same list on every call pays
+    one element-wise comparison against the stored copy -- the strings are
+    the same objects, so each compares by identity -- instead of hashing
+    the list again. An equal copy of a recent list, or a list mutated since
+    it was seen, misses on identity; the few registered copies are then
+    compared before a new validator is built.
+    """
+    if not isinstance(live_tables, (list, tuple)):
+        live_tables = tuple(live_tables)
+    key = id(live_tables)
+    with _registry_lock:
+        entry = _registry.get(key)
+        # A tuple cannot have changed since it was registered
+        if entry is not None and entry[0] is live_tables and (
+            isinstance(live_tables, tuple) or entry[1] == live_tables
+        ):
+            _registry.move_to_end(key)
+            return entry[2]
+
+    tables = list(live_tables)
+    with _registry_lock:
+        validator = next(
+            (v for _, copy, v in reversed(_registry.values()) if copy == tables),
+            None,
+        )
+    if validator is None:
+        validator = SchemaValidator(tables)
+
+    with _registry_lock:
+        _registry[key] = (live_tables, tables, validator)
+        _registry.move_to_end(key)
+        while len(_registry) > _REGISTRY_SIZE:
+            _registry.popitem(last=False)
+    return validator
@@ -0,0 +1,95 @@
+"""Tests for the sqldrift command-line tool."""
+
+import io
+import json
+
+import pytest
+from sqldrift import cli
+from sqldrift.cli import main
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps({"users": {"columns": ["id", "name"]}}))
+    return str(path)
+
+
+def _records(out: str) -> list[dict]:
+    return [json.loads(line) for line in out.splitlines()]
+
+
+class TestCli:
+    """Tests for main()."""
+
+    def test_sql_files_and_directories(self, tmp_path, schema_file, capsys):
+        queries = tmp_path / "queries"
+        queries.mkdir()
+        (queries / "a.sql").write_text(
+            "SELECT id FROM users;\nSELECT tier\nFROM users;\n"
+        )
+        (queries / "b.sql").write_text("SELECT * FROM ghosts\n")
+
+        status = main(["--schema", schema_file, str(queries)])
+        captured = capsys.readouterr()
+
+        assert status == 1
+        records = _records(captured.out)
+        assert [(r["line"], r["success"]) for r in records] == [
+            (1, True),
+            (2, False),
+            (1, False),
+        ]
+        assert records[2]["source"].endswith("b.sql")
+        assert "3 statements, 2 failed" in captured.err
+
+    def test_stdin_log(self, schema_file, capsys, monkeypatch):
+        log = json.dumps({"query": "SELECT name FROM users"}) + "\n"
+        monkeypatch.setattr("sys.stdin", io.StringIO(log))
+
+        status = main(["-s", schema_file, "-j", "1", "-q"])
+        captured = capsys.readouterr()
+
+        assert status == 0
+        assert _records(captured.out)[0]["source"] == "<stdin>"
+        assert captured.err == ""
+
+    def test_short_stdin_log_validated_inline(self, schema_file, monkeypatch):
+        log = json.dumps({"query": "SELECT name FROM users"}) + "\n"
+        monkeypatch.setattr("sys.stdin", io.StringIO(log))
+        seen = []
+        real = cli.iter_validate
+
+        def spy(lines, validator, **kwargs):
+            seen.append(kwargs["workers"])
+            return real(lines, validator, **kwargs)
+
+        monkeypatch.setattr(cli, "iter_validate", spy)
+        assert main(["-s", schema_file, "-q"]) == 0
+        assert seen == [1]
+
+    def test_non_utf8_input_is_usage_error(self, tmp_path, schema_file, capsys):
+        sql = tmp_path / "latin1.sql"
+        sql.write_bytes("SELECT 'café' FROM users;\n".encode("latin-1"))
+        with pytest.raises(SystemExit) as exc:
+            main(["-s", schema_file, str(sql)])
+        assert exc.value.code == 2
+        assert "cannot read input" in capsys.readouterr().err
+
+    def test_table_list_schema_and_failures_only(self, tmp_path, capsys):
+        schema = tmp_path / "tables.json"
+        schema.write_text(json.dumps(["users"]))
+        sql = tmp_path / "q.sql"
+        sql.write_text("SELECT tier FROM users;\nSELECT * FROM ghosts;\n")
+
+        status = main(["-s", str(schema), "--failures-only", "-q", str(sql)])
+        records = _records(capsys.readouterr().out)
+
+        assert status == 1
+        assert len(records) == 1
+        assert "ghosts" in records[0]["message"]
+
+    def test_missing_schema_is_usage_error(self, tmp_path):
+        with pytest.raises(SystemExit) as exc:
+            main(["-s", str(tmp_path / "nope.json"), "x.sql"])
+        assert exc.value.code == 2
@@ -1,5 +1,9 @@
 """Tests for column-level schema drift detection."""
 
+import asyncio
+import pickle
+import threading
+
 import pytest
 from sqldrift.column_validator import ColumnValidator, CachedColumnValidator
 
@@ -217,6 +221,27 @@ class TestSchemaManagement:
     def test_get_column_info_missing(self):
         assert self.validator.get_column_info("users", "tier") is None
 
+    def test_get_column_info_position(self):
+        assert self.validator.get_column_info("users", "email")["position"] == 2
+        assert self.validator.get_column_info("USERS", "Email")["column"] == "email"
+
+    def test_get_columns_info(self):
+        infos = self.validator.get_columns_info(
+            [("users", "name"), ("orders", "total"), ("users", "tier")]
+        )
+        assert infos == [
+            {"table": "users", "column": "name", "position": 1, "type": "VARCHAR"},
+            {"table": "orders", "column": "total", "position": 2, "type": "DECIMAL"},
+            None,
+        ]
+
+    def test_get_column_info_after_drop_shifts_position(self):
+        v = ColumnValidator(SCHEMA)
+        v.apply_changes(dropped_columns={"users": ["name"]})
+        assert v.get_column_info("users", "email") == {
+            "table": "users", "column": "email", "position": 1, "type": "VARCHAR",
+        }
+
 
 # ---------------------------------------------------------------------------
 # Suggestions
@@ -239,6 +264,92 @@ class TestSuggestions:
         suggestions = self.validator.suggest_alternatives("zzzzzzz")
         assert suggestions == []
 
+    def test_suggest_abbreviation(self):
+        v = ColumnValidator({
+            "customers": {"columns": ["id", "customer_name", "email"]},
+        })
+        assert v.suggest_alternatives("cust_name") == ["customers.customer_name"]
+
+    def test_suggest_typo(self):
+        suggestions = self.validator.suggest_alternatives("emial")
+        assert suggestions[0] == "users.email"
+        assert self.validator.suggest_alternatives("ttal")[0] == "orders.total"
+
+    def test_scope_tables_ranked_first(self):
+        v = ColumnValidator({
+            "a": {"columns": ["order_total"]},
+            "b": {"columns": ["order_totals"]},
+        })
+        assert v.suggest_alternatives("order_totals_x") == [
+            "b.order_totals", "a.order_total",
+        ]
+        assert v.suggest_alternatives("order_totals_x", tables=["A"]) == [
+            "a.order_total", "b.order_totals",
+        ]
+
+    def test_max_results(self):
+        schema = {f"t{i}": {"columns": ["total"]} for i in range(10)}
+        v = ColumnValidator(schema)
+        assert len(v.suggest_alternatives("totl")) == 5
+        assert v.suggest_alternatives("totl", max_results=2) == ["t0.total", "t1.total"]
+
+    def test_message_suggests_from_tables_first(self):
+        ok, msg = self.validator.validate("SELECT nme FROM users")
+        assert not ok
+        assert "Did you mean: users.name" in msg
+
+    def test_index_follows_schema_changes(self):
+        v = ColumnValidator(SCHEMA)
+        assert v.suggest_alternatives("loyalty_tier") == []
+        v.apply_changes(added_columns={"users": {"columns": ["tier"]}})
+        assert v.suggest_alternatives("loyalty_tier") == ["users.tier"]
+
+
+# ---------------------------------------------------------------------------
+# is_valid (fail-fast)
+# ---------------------------------------------------------------------------
+class TestIsValid:
+    """Tests for the boolean fail-fast check."""
+
+    QUERIES = [
+        "SELECT id, name FROM users",
+        "SELECT u.name, o.total FROM users u JOIN orders o ON u.id = o.user_id",
+        "SELECT u.phone FROM users u",
+        "SELECT phone FROM users",
+        "SELECT name, total FROM users JOIN orders ON users.id = orders.user_id",
+        "SELECT title FROM users",
+        "SELECT x.anything FROM unknown_table x",
+        "SELECT price",
+        "SELECT nonexistent",
+        "SELECT * FROM users WHERE id IN (SELECT user_id FROM orders WHERE tax > 0)",
+        "",
+        "SELEC * FORM users",
+    ]
+
+    def test_agrees_with_validate(self):
+        validator = ColumnValidator(SCHEMA)
+        for q in self.QUERIES:
+            assert validator.is_valid(q) is validator.validate(q)[0], q
+
+    def test_skips_diagnostics(self):
+        validator = ColumnValidator(SCHEMA)
+        assert validator.is_valid("SELECT emial FROM users") is False
+        # The suggestion index is only built for diagnostics
+        assert validator._state._suggester is None
+
+    def test_case_insensitive(self):
+        validator = ColumnValidator(SCHEMA)
+        assert validator.is_valid("SELECT U.NAME FROM USERS U") is True
+
+    def test_cached(self):
+        validator = CachedColumnValidator(SCHEMA)
+        assert validator.is_valid("SELECT phone FROM users") is False
+        ok, msg = validator.validate("SELECT phone FROM users")
+        assert ok is False and "phone" in msg
+        assert validator.get_cache_info()["hits"] == 1
+        validator.apply_changes(added_columns={"users": {"columns": ["phone"]}})
+        assert validator.is_valid("SELECT phone FROM users") is True
+
 
 # ---------------------------------------------------------------------------
 # CachedColumnValidator
@@ -263,12 +374,35 @@ class TestCachedColumnValidator:
         assert info["misses"] == 1
         assert info["hit_rate"] == 0.5
 
+    def test_keyword_named_column_case_sensitive(self):
+        v = CachedColumnValidator(
+            {"t": {"columns": ["Date", "id"]}}, case_sensitive=True
+        )
+        assert v.validate("SELECT Date FROM t")[0] is True
+        assert v.validate("SELECT date FROM t")[0] is False
+
     def test_clear_cache(self):
         self.validator.validate("SELECT name FROM users")
         self.validator.clear_cache()
         info = self.validator.get_cache_info()
         assert info["size"] == 0
 
+    def test_literal_variants_share_entry(self):
+        self.validator.validate("SELECT name FROM users WHERE id = 17")
+        self.validator.validate("SELECT name FROM users WHERE id = 18")
+        self.validator.validate("SELECT name FROM users WHERE id = 18")
+        info = self.validator.get_cache_info()
+        assert info["misses"] == 1
+        assert info["fingerprint_hits"] == 1
+        assert info["exact_hits"] == 1
+        assert info["size"] == 1
+
+    def test_fingerprint_disabled(self):
+        v = CachedColumnValidator(SCHEMA, cache_size=64, fingerprint=False)
+        v.validate("SELECT name FROM users WHERE id = 17")
+        v.validate("SELECT name FROM users WHERE id = 18")
+        assert v.get_cache_info()["misses"] == 2
+
 
 # ---------------------------------------------------------------------------
 # Column Extraction
@@ -298,6 +432,19 @@ class TestColumnExtraction:
         # Alias 'u' should be resolved to 'users'
         assert any(t == "users" and c == "name" for t, c in cols)
 
+    def test_extract_matches_validate(self):
+        sql = (
+            "SELECT u.name, o.total, id FROM users u "
+            "JOIN orders o ON u.id = o.user_id WHERE o.total > 1 AND u.name = 'a'"
+        )
+        cols = self.validator.extract_columns(sql)
+        result = self.validator.validate_result(sql, keep_ast=True)
+        assert cols == list(result.columns)
+        assert cols == [
+            ("users", "name"), ("orders", "total"), (None, "id"),
+            ("users", "id"), ("orders", "user_id"),
+        ]
+
 
 # ---------------------------------------------------------------------------
 # SQL Dialects
@@ -381,6 +528,41 @@ class TestCTEs:
         assert ok is False
         assert "tier" in msg
 
+    def test_cte_shadowing_table_not_checked(self):
+        v = ColumnValidator({
+            "events": {"columns": ["id", "kind"]},
+            "raw_events": {"columns": ["id"]},
+        })
+        # The outer ``events`` is the CTE, which has no ``kind`` column
+        ok, msg = v.validate(
+            "WITH events AS (SELECT * FROM raw_events) SELECT kind FROM events"
+        )
+        assert ok is False
+        assert "raw_events" in msg
+        # A schema-qualified name is always the physical table
+        ok, _ = v.validate(
+            "WITH events AS (SELECT * FROM raw_events) SELECT kind FROM public.events"
+        )
+        assert ok is True
+
+    def test_cte_body_reads_shadowed_table(self):
+        # Inside its own body a non-recursive CTE's name is the real table
+        ok, msg = self.validator.validate(
+            "WITH users AS (SELECT total FROM users) SELECT id FROM users"
+        )
+        assert ok is False
+        assert "Column 'total' not found in table 'users'" in msg
+
+    def test_cte_scoped_to_its_subquery(self):
+        # The CTE named ``users`` is only visible inside the derived table;
+        # the sibling join reads the real table, which has no ``total``
+        ok, msg = self.validator.validate(
+            "SELECT total FROM (WITH users AS (SELECT 1 AS id) SELECT id FROM users) a "
+            "CROSS JOIN users"
+        )
+        assert ok is False
+        assert "total" in msg
+
 
 # ---------------------------------------------------------------------------
 # GROUP BY, ORDER BY, HAVING
@@ -559,3 +741,238 @@ class TestCachedSchemaUpdate:
         # Note: if cache is NOT cleared, this will incorrectly return False
         # This test documents the current behavior
         assert isinstance(ok, bool)
+
+    def test_update_schema_selective_invalidation(self):
+        validator = CachedColumnValidator(SCHEMA, cache_size=64)
+        validator.validate("SELECT name FROM users")
+        validator.validate("SELECT title FROM products")
+        validator.validate("SELECT tier FROM users")
+
+        new_schema = dict(SCHEMA)
+        new_schema["users"] = {"columns": ["id", "name", "email", "created_at", "tier"]}
+        validator.update_schema(new_schema)
+
+        # users changed (and the failure is schema-wide); products is untouched
+        info = validator.get_cache_info()
+        assert info["invalidations"] == 2
+        assert info["size"] == 1
+
+        ok, _ = validator.validate("SELECT tier FROM users")
+        assert ok is True
+        validator.validate("SELECT title FROM products")
+        assert validator.get_cache_info()["hits"] == 1
+
+    def test_global_fallback_invalidated_by_new_column(self):
+        validator = CachedColumnValidator(SCHEMA, cache_size=64)
+        ok, _ = validator.validate("SELECT price FROM unknown_table")
+        assert ok is True
+
+        new_schema = {k: v for k, v in SCHEMA.items() if k != "products"}
+        validator.update_schema(new_schema)
+
+        ok, _ = validator.validate("SELECT price FROM unknown_table")
+        assert ok is False
+
+
+# ---------------------------------------------------------------------------
+# Incremental schema changes
+# ---------------------------------------------------------------------------
+class TestApplyChanges:
+    """Test ColumnValidator.apply_changes against full rebuilds."""
+
+    DELTA = dict(
+        added_tables={"invoices": {"columns": ["id", "amount"]}},
+        dropped_tables=["products"],
+        added_columns={"users": {"columns": ["tier"], "types": ["VARCHAR"]}},
+        dropped_columns={"purchases": ["order_date"]},
+        renamed={("users", "name"): "full_name", "orders": "purchases"},
+    )
+
+    EXPECTED = {
+        "users": {
+            "columns": ["id", "full_name", "email", "created_at", "tier"],
+            "types": ["INTEGER", "VARCHAR", "VARCHAR", "TIMESTAMP", "VARCHAR"],
+        },
+        "purchases": {
+            "columns": ["id", "user_id", "total"],
+            "types": ["INTEGER", "INTEGER", "DECIMAL"],
+        },
+        "invoices": {"columns": ["id", "amount"]},
+    }
+
+    QUERIES = [
+        "SELECT name FROM users",
+        "SELECT full_name, tier FROM users",
+        "SELECT total FROM purchases",
+        "SELECT order_date FROM purchases",
+        "SELECT title FROM unknown_table",
+        "SELECT amount FROM invoices",
+        "SELECT o.total FROM orders o",
+    ]
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_matches_full_rebuild(self, compact):
+        v = ColumnValidator(SCHEMA, compact=compact)
+        v.apply_changes(**self.DELTA)
+        rebuilt = ColumnValidator(self.EXPECTED)
+        for query in self.QUERIES:
+            assert v.validate(query) == rebuilt.validate(query)
+        assert v.get_table_count() == 3
+        assert v.get_column_info("users", "tier") == {
+            "table": "users", "column": "tier", "position": 4, "type": "VARCHAR",
+        }
+        assert v.get_column_info("users", "full_name")["type"] == "VARCHAR"
+        assert v.suggest_alternatives("name") == ["users.full_name"]
+
+    def test_does_not_mutate_caller_schema(self):
+        schema = {"users": {"columns": ["id", "name"]}}
+        v = ColumnValidator(schema)
+        v.apply_changes(
+            added_columns={"users": {"columns": ["tier"]}},
+            dropped_tables=["users"],
+        )
+        assert schema == {"users": {"columns": ["id", "name"]}}
+
+    def test_replay_is_noop(self):
+        v = ColumnValidator(SCHEMA)
+        v.apply_changes(**self.DELTA)
+        v.apply_changes(**self.DELTA)
+        assert v.column_exists("users", "full_name")
+        assert v.column_exists("purchases", "total")
+        assert v.get_column_count("users") == 5
+
+    def test_column_added_without_types_to_typed_table(self):
+        v = ColumnValidator({"t": {"columns": ["a"]}})
+        v.apply_changes(added_columns={"t": {"columns": ["b", "c"], "types": ["INT"]}})
+        assert "type" not in v.get_column_info("t", "a")
+        assert v.get_column_info("t", "b")["type"] == "INT"
+        assert "type" not in v.get_column_info("t", "c")
+
+    def test_global_lookup_tracks_last_holder(self):
+        v = ColumnValidator(SCHEMA)
+        assert v.validate("SELECT price FROM unknown_table")[0] is True
+        v.apply_changes(dropped_columns={"products": ["price"]})
+        assert v.validate("SELECT price FROM unknown_table")[0] is False
+
+    def test_cached_evicts_only_affected_entries(self):
+        v = CachedColumnValidator(SCHEMA, cache_size=64)
+        v.validate("SELECT name FROM users")
+        v.validate("SELECT title FROM products")
+        v.validate("SELECT tier FROM users")
+
+        v.apply_changes(added_columns={"users": {"columns": ["tier"]}})
+        info = v.get_cache_info()
+        assert info["invalidations"] == 2
+        assert info["size"] == 1
+
+        assert v.validate("SELECT tier FROM users")[0] is True
+        v.validate("SELECT title FROM products")
+        assert v.get_cache_info()["hits"] == 1
+
+    def test_cached_unqualified_column_dropped_everywhere(self):
+        v = CachedColumnValidator(SCHEMA, cache_size=64)
+        assert v.validate("SELECT price FROM unknown_table")[0] is True
+        v.apply_changes(dropped_tables=["products"])
+        assert v.validate("SELECT price FROM unknown_table")[0] is False
+
+
+# ---------------------------------------------------------------------------
+# Concurrent schema updates
+# ---------------------------------------------------------------------------
+class TestSnapshots:
+    """Test that schema updates publish a new snapshot atomically."""
+
+    def test_apply_changes_leaves_old_snapshot_untouched(self):
+        v = ColumnValidator(SCHEMA)
+        old = v._state
+        users_columns = set(old.schema["users"])
+        v.apply_changes(
+            added_columns={"users": {"columns": ["tier"]}},
+            dropped_tables=["products"],
+        )
+        assert set(old.schema["users"]) == users_columns
+        assert "products" in old.schema
+        assert "tier" not in old.column_lookup
+        # Untouched tables share their column index with the old snapshot
+        assert v._state.schema["orders"] is old.schema["orders"]
+
+    def test_concurrent_readers_never_see_a_mixed_schema(self):
+        # hot.flag is checked against the table map and x_flag against the
+        # global column lookup, so a torn read fails on exactly one of them
+        query = "SELECT hot.flag, x_flag FROM nowhere"
+        with_flags = {"hot": {"columns": ["id", "flag", "x_flag"]}}
+        without_flags = {"hot": {"columns": ["id"]}}
+        allowed = {
+            ColumnValidator(with_flags).validate(query),
+            ColumnValidator(without_flags).validate(query),
+        }
+        v = ColumnValidator(with_flags)
+        stop = threading.Event()
+        results: list = []
+
+        def reader():
+            while not stop.is_set():
+                results.append(v.validate(query))
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for _ in range(50):
+            v.apply_changes(dropped_columns={"hot": ["flag", "x_flag"]})
+            v.update_schema(with_flags)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        assert results
+        assert set(results) <= allowed
+
+    def test_pickle_drops_write_lock(self):
+        v = CachedColumnValidator(SCHEMA)
+        clone = pickle.loads(pickle.dumps(v))
+        clone.apply_changes(added_columns={"users": {"columns": ["tier"]}})
+        assert clone.column_exists("users", "tier")
+        assert not v.column_exists("users", "tier")
+
+
+# ---------------------------------------------------------------------------
+# Batch validation
+# ---------------------------------------------------------------------------
+class TestValidateMany:
+    """Tests for ColumnValidator.validate_many."""
+
+    def test_results_in_input_order(self):
+        v = ColumnValidator(SCHEMA)
+        queries = [
+            "SELECT name FROM users WHERE id = 1",
+            "SELECT tier FROM users",
+            "SELECT name FROM users WHERE id = 2",
+            "",
+            "SELECT u.tier FROM users u",
+        ]
+        expected = [v.validate(q) for q in queries]
+        assert v.validate_many(queries) == expected
+        assert v.validate_many(queries, workers=2, chunksize=2) == expected
+
+    def test_case_sensitive_queries_not_merged(self):
+        v = ColumnValidator({"t": {"columns": ["Date", "id"]}}, case_sensitive=True)
+        results = v.validate_many(["SELECT Date FROM t", "SELECT date FROM t"])
+        assert [ok for ok, _ in results] == [True, False]
+
+
+# ---------------------------------------------------------------------------
+# Async validation
+# ---------------------------------------------------------------------------
+class TestAsyncValidation:
+    """Tests for CachedColumnValidator.avalidate_many."""
+
+    def test_avalidate_many_in_order(self):
+        v = CachedColumnValidator(SCHEMA, cache_size=64)
+        queries = [
+            "SELECT name FROM users",
+            "SELECT tier FROM users",
+            "SELECT name FROM users",
+        ]
+        results = asyncio.run(v.avalidate_many(queries))
+        assert [ok for ok, _ in results] == [True, False, True]
+        assert v.get_cache_info()["misses"] == 2
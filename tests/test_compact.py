@@ -0,0 +1,270 @@
+"""Tests for the compact interned schema backend."""
+
+import pickle
+
+import pytest
+from sqldrift import CachedColumnValidator, ColumnValidator, UnifiedValidator, batch
+from sqldrift.compact import CompactSchema
+
+
+SCHEMA = {
+    "Users": {
+        "columns": ["ID", "name", "email", "created_at"],
+        "types": ["INTEGER", "VARCHAR", "VARCHAR"],
+    },
+    "orders": {
+        "columns": ["id", "user_id", "total", "order_date"],
+        "types": ["INTEGER", "INTEGER", "DECIMAL", "DATE"],
+    },
+    "products": {"columns": ["id", "title", "price", "category"]},
+    "empty": {"columns": []},
+}
+
+QUERIES = [
+    "SELECT name FROM users",
+    "SELECT u.name, o.total FROM users u JOIN orders o ON u.id = o.user_id",
+    "SELECT tier FROM users",
+    "SELECT u.tier FROM users u",
+    "SELECT title FROM users",
+    "SELECT price FROM unknown_table",
+    "SELECT nothing_anywhere FROM unknown_table",
+    "SELECT * FROM empty",
+]
+
+
+class TestCompactSchema:
+    """Tests for CompactSchema lookups."""
+
+    def setup_method(self):
+        self.compact = CompactSchema.from_dict(SCHEMA, str.lower)
+
+    def test_table_map(self):
+        tables = self.compact.table_map()
+        assert "users" in tables
+        assert "Users" not in tables
+        assert "nope" not in tables
+        assert sorted(tables) == ["empty", "orders", "products", "users"]
+        assert set(tables["users"]) == {"id", "name", "email", "created_at"}
+        assert len(tables["empty"]) == 0
+        with pytest.raises(KeyError):
+            tables["nope"]
+
+    def test_column_lookup(self):
+        lookup = self.compact.column_lookup()
+        assert sorted(lookup["id"]) == ["orders", "products", "users"]
+        assert "title" in lookup
+        assert "tier" not in lookup
+
+    def test_column_info_keeps_original_case(self):
+        assert self.compact.column_info("users", "id") == {
+            "table": "Users",
+            "column": "ID",
+            "position": 0,
+            "type": "INTEGER",
+        }
+        assert self.compact.column_info("users", "created_at") == {
+            "table": "Users",
+            "column": "created_at",
+            "position": 3,
+        }
+        assert self.compact.column_info("users", "tier") is None
+
+    def test_non_ascii_names(self):
+        compact = CompactSchema.from_dict(
+            {"café": {"columns": ["naïve", "zeta", "äpfel"]}}, str.lower
+        )
+        assert "café" in compact.table_map()
+        assert "äpfel" in compact.table_map()["café"]
+
+
+class TestCompactColumnValidator:
+    """ColumnValidator(compact=True) behaves like the default backend."""
+
+    def setup_method(self):
+        self.default = ColumnValidator(SCHEMA)
+        self.compact = ColumnValidator(SCHEMA, compact=True)
+
+    def test_validate_matches_default(self):
+        for query in QUERIES:
+            assert self.compact.validate(query) == self.default.validate(query)
+
+    def test_introspection_matches_default(self):
+        for table, column in [("users", "id"), ("USERS", "Email"), ("orders", "x")]:
+            assert self.compact.column_exists(table, column) == (
+                self.default.column_exists(table, column)
+            )
+            assert self.compact.get_column_info(table, column) == (
+                self.default.get_column_info(table, column)
+            )
+        assert self.compact.get_table_count() == self.default.get_table_count()
+        assert self.compact.get_column_count("orders") == 4
+
+    def test_raw_schema_not_retained(self):
+        assert self.compact._state.raw is None
+
+    def test_update_schema_stays_compact(self):
+        self.compact.update_schema({"users": {"columns": ["id", "tier"]}})
+        assert self.compact.validate("SELECT tier FROM users")[0] is True
+        assert self.compact._state.raw is None
+
+    def test_cached_selective_invalidation(self):
+        v = CachedColumnValidator(SCHEMA, compact=True, cache_size=16)
+        v.validate("SELECT title FROM products")
+        v.validate("SELECT name FROM users")
+        v.update_schema({**SCHEMA, "users": {"columns": ["id", "name", "tier"]}})
+        assert v.get_cache_info()["size"] == 1
+
+
+class TestSnapshots:
+    """Tests for binary schema snapshots."""
+
+    @pytest.mark.parametrize("use_mmap", [True, False])
+    def test_round_trip(self, tmp_path, use_mmap):
+        path = str(tmp_path / "schema.snap")
+        default = ColumnValidator(SCHEMA)
+        default.save_snapshot(path)
+
+        loaded = ColumnValidator.from_snapshot(path, mmap=use_mmap)
+        assert loaded.compact is True
+        for query in QUERIES:
+            assert loaded.validate(query) == default.validate(query)
+        assert loaded.get_column_info("users", "id") == (
+            default.get_column_info("users", "id")
+        )
+        assert loaded.suggest_alternatives("name") == (
+            default.suggest_alternatives("name")
+        )
+
+    def test_case_sensitivity_preserved(self, tmp_path):
+        path = str(tmp_path / "schema.snap")
+        ColumnValidator(SCHEMA, case_sensitive=True, compact=True).save_snapshot(path)
+        loaded = ColumnValidator.from_snapshot(path)
+        assert loaded.case_sensitive is True
+        assert loaded.column_exists("Users", "ID") is True
+        assert loaded.column_exists("users", "id") is False
+
+    def test_fixed_options_checked(self, tmp_path):
+        path = str(tmp_path / "schema.snap")
+        ColumnValidator(SCHEMA, case_sensitive=True).save_snapshot(path)
+        loaded = ColumnValidator.from_snapshot(path, case_sensitive=True, compact=True)
+        assert loaded.case_sensitive is True
+        with pytest.raises(ValueError, match="case_sensitive=True"):
+            ColumnValidator.from_snapshot(path, case_sensitive=False)
+        with pytest.raises(ValueError, match="compact=True"):
+            CachedColumnValidator.from_snapshot(path, compact=False)
+
+    def test_cached_validator_from_snapshot(self, tmp_path):
+        path = str(tmp_path / "schema.snap")
+        ColumnValidator(SCHEMA).save_snapshot(path)
+        cached = CachedColumnValidator.from_snapshot(path, cache_size=8)
+        cached.validate("SELECT name FROM users")
+        cached.validate("SELECT name FROM users")
+        assert cached.get_cache_info()["hits"] == 1
+
+    def test_pickle_remaps_snapshot(self, tmp_path):
+        path = str(tmp_path / "schema.snap")
+        ColumnValidator(SCHEMA).save_snapshot(path)
+        loaded = ColumnValidator.from_snapshot(path)
+        clone = pickle.loads(pickle.dumps(loaded))
+        assert clone._state.compact._source[1] == (path, True)
+        assert clone.validate("SELECT tier FROM users") == (
+            loaded.validate("SELECT tier FROM users")
+        )
+
+    def test_pickle_in_memory(self):
+        v = ColumnValidator(SCHEMA, compact=True)
+        clone = pickle.loads(pickle.dumps(v))
+        assert clone.validate("SELECT name FROM users")[0] is True
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "not.snap"
+        path.write_bytes(b"definitely not a snapshot")
+        with pytest.raises(ValueError):
+            ColumnValidator.from_snapshot(str(path))
+
+    def test_validate_many_with_workers(self, tmp_path):
+        path = str(tmp_path / "schema.snap")
+        ColumnValidator(SCHEMA).save_snapshot(path)
+        loaded = ColumnValidator.from_snapshot(path)
+        assert loaded.validate_many(QUERIES, workers=2, chunksize=1) == [
+            loaded.validate(q) for q in QUERIES
+        ]
+
+
+class TestSharedMemory:
+    """Tests for sharing the compact index with worker processes."""
+
+    def test_share_and_attach(self):
+        compact = CompactSchema.from_dict(SCHEMA, str.lower)
+        block = compact.share(metadata={"case_sensitive": False})
+        try:
+            attached = CompactSchema.attach(block.name)
+            assert attached.metadata == {"case_sensitive": False}
+            assert attached.column_info("users", "id") == (
+                compact.column_info("users", "id")
+            )
+            assert sorted(attached.table_map()) == sorted(compact.table_map())
+            assert list(attached.iter_original_columns()) == (
+                list(compact.iter_original_columns())
+            )
+            del attached
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_iteration_follows_source_order(self):
+        compact = CompactSchema.from_dict(SCHEMA, str.lower)
+        expected = [
+            (table, column)
+            for table, info in SCHEMA.items()
+            for column in info["columns"]
+        ]
+        assert list(compact.iter_original_columns()) == expected
+        assert compact.to_dict().keys() == SCHEMA.keys()
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_shipped_validator_pickles_as_reference(self, compact):
+        v = ColumnValidator(SCHEMA, compact=compact)
+        with batch._shipped(v) as shipped:
+            payload = pickle.dumps(shipped)
+            assert len(payload) < len(pickle.dumps(ColumnValidator(SCHEMA)))
+            clone = pickle.loads(payload)
+            for query in QUERIES:
+                assert clone.validate(query) == v.validate(query)
+            name = shipped._state.compact._source[1][0]
+            del clone
+        with pytest.raises(FileNotFoundError):
+            CompactSchema.attach(name)
+
+    def test_shipped_disk_cached_validator_leaves_schema_behind(self, tmp_path):
+        v = CachedColumnValidator(SCHEMA, cache_path=str(tmp_path / "cache.db"))
+        v.validate(QUERIES[0])
+        with batch._shipped(v) as shipped:
+            payload = pickle.dumps(shipped)
+            assert len(payload) < len(pickle.dumps(ColumnValidator(SCHEMA)))
+            clone = pickle.loads(payload)
+            assert clone._cache.store.namespace()[0] is clone._state
+            assert clone.validate(QUERIES[0]) == v.validate(QUERIES[0])
+            assert clone.get_cache_info()["disk_hits"] == 1
+            del clone
+
+    def test_snapshot_backed_validator_is_shipped_as_is(self, tmp_path):
+        path = str(tmp_path / "schema.snap")
+        ColumnValidator(SCHEMA).save_snapshot(path)
+        v = ColumnValidator.from_snapshot(path)
+        with batch._shipped(v) as shipped:
+            assert shipped is v
+
+    @pytest.mark.parametrize(
+        "factory",
+        [
+            lambda: ColumnValidator(SCHEMA),
+            lambda: CachedColumnValidator(SCHEMA),
+            lambda: UnifiedValidator(SCHEMA),
+        ],
+    )
+    def test_validate_many_with_workers_matches_inline(self, factory):
+        v = factory()
+        assert batch.validate_many(v, QUERIES, workers=2, chunksize=1) == [
+            v.validate(q) for q in QUERIES
+        ]
@@ -0,0 +1,71 @@
+"""Tests for literal-insensitive query fingerprints."""
+
+from sqldrift.fingerprint import fingerprint
+
+
+class TestFingerprint:
+    """Tests for the fingerprint function."""
+
+    def test_literals_stripped(self):
+        assert fingerprint("SELECT * FROM users WHERE id = 17") == fingerprint(
+            "SELECT * FROM users WHERE id = 18"
+        )
+        assert fingerprint("SELECT * FROM users WHERE name = 'a'") == fingerprint(
+            "SELECT * FROM users WHERE name = 'bob'"
+        )
+
+    def test_whitespace_and_comments(self):
+        assert fingerprint("SELECT *\n  FROM users -- all of them") == fingerprint(
+            "SELECT * /* note */ FROM users"
+        )
+
+    def test_case_folded_only_when_case_insensitive(self):
+        # DATE is a keyword token but names a column here
+        assert fingerprint("SELECT Date FROM t") != fingerprint("SELECT date FROM t")
+        assert fingerprint(
+            "select Date from T", case_sensitive=False
+        ) == fingerprint("SELECT date FROM t", case_sensitive=False)
+
+    def test_identifiers_keep_case(self):
+        assert fingerprint("SELECT * FROM Users") != fingerprint(
+            "SELECT * FROM users"
+        )
+
+    def test_quoted_identifier_distinct_from_string(self):
+        assert fingerprint('SELECT "a" FROM t', "postgres") != fingerprint(
+            "SELECT 'a' FROM t", "postgres"
+        )
+
+    def test_number_and_string_placeholders_differ(self):
+        assert fingerprint("SELECT * FROM t LIMIT 5") != fingerprint(
+            "SELECT * FROM t LIMIT '5'"
+        )
+
+    def test_different_tables_differ(self):
+        assert fingerprint("SELECT * FROM users") != fingerprint(
+            "SELECT * FROM orders"
+        )
+
+    def test_untokenizable_returns_none(self):
+        assert fingerprint("SELECT 'unterminated") is None
+
+    def test_strings_kept_where_they_can_name_tables(self):
+        assert fingerprint("SELECT * FROM 'users'", "duckdb") != fingerprint(
+            "SELECT * FROM 'ghosts'", "duckdb"
+        )
+        assert fingerprint("SELECT * FROM a, 'b'") != fingerprint(
+            "SELECT * FROM a, 'c'"
+        )
+        assert fingerprint(
+            "SELECT * FROM t WHERE id IN (SELECT id FROM u, 'v')"
+        ) != fingerprint("SELECT * FROM t WHERE id IN (SELECT id FROM u, 'w')")
+
+    def test_strings_in_value_lists_stripped(self):
+        assert fingerprint("SELECT * FROM t WHERE a IN ('x', 'y')") == fingerprint(
+            "SELECT * FROM t WHERE a IN ('z', 'w')"
+        )
+
+    def test_quotes_unambiguous(self):
+        assert fingerprint("SELECT * FROM 'it\"s'") != fingerprint(
+            'SELECT * FROM "it\'s"'
+        )
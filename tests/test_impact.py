@@ -0,0 +1,169 @@
+"""Tests for the reverse dependency index."""
+
+import pytest
+import sqlglot
+from sqldrift import ColumnValidator, ImpactIndex, compile
+
+
+CORPUS = {
+    "names": "SELECT u.name FROM users u WHERE u.id = 1",
+    "totals": "SELECT o.total FROM orders o JOIN users u ON u.id = o.user_id",
+    "emails": "SELECT email FROM users",
+    "recent": "WITH r AS (SELECT * FROM orders) SELECT r.total FROM r",
+    "events": "SELECT kind FROM analytics.events",
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ImpactIndex(str(tmp_path / "impact.db"))
+    index.add_many(CORPUS.items())
+    yield index
+    index.close()
+
+
+def ids(hits):
+    return sorted(hit.query_id for hit in hits)
+
+
+class TestImpactOf:
+    """Tests for finding the queries a change breaks."""
+
+    def test_dropped_column(self, index):
+        hits = index.impact_of(dropped_columns={"users": ["name"]})
+        assert ids(hits) == ["names"]
+        assert hits[0].references == ("users.name",)
+        assert hits[0].sql == CORPUS["names"]
+
+    def test_unqualified_column(self, index):
+        assert ids(index.impact_of(dropped_columns={"users": ["email"]})) == ["emails"]
+
+    def test_column_through_cte(self, index):
+        hits = index.impact_of(dropped_columns={"orders": ["total"]})
+        assert ids(hits) == ["recent", "totals"]
+
+    def test_tables(self, index):
+        hits = index.impact_of(dropped_tables=["orders"], renamed_tables=["USERS"])
+        assert ids(hits) == ["emails", "names", "recent", "totals"]
+        by_id = {hit.query_id: hit.references for hit in hits}
+        assert by_id["totals"] == ("orders", "users")
+
+    def test_schema_qualified_names(self, index):
+        assert ids(index.impact_of(renamed_tables={"analytics.events": "e"})) == [
+            "events"
+        ]
+        assert ids(index.impact_of(renamed_columns={"events": ["Kind"]})) == [
+            "events"
+        ]
+
+    def test_unaffected(self, index):
+        assert index.impact_of(dropped_columns={"users": ["tier"]}) == []
+        assert index.impact_of() == []
+
+    def test_agrees_with_validator(self, index):
+        schema = {
+            "users": {"columns": ["id", "name", "email"]},
+            "orders": {"columns": ["id", "user_id", "total"]},
+        }
+        validator = ColumnValidator(schema)
+        validator.apply_changes(dropped_columns={"users": ["name", "email"]})
+        broken = [
+            query_id
+            for query_id, sql in CORPUS.items()
+            if query_id != "events" and not validator.is_valid(sql)
+        ]
+        hits = index.impact_of(dropped_columns={"users": ["name", "email"]})
+        assert ids(hits) == sorted(broken)
+
+
+class TestBuilding:
+    """Tests for adding queries to the index."""
+
+    def test_repeats_are_counted(self, tmp_path):
+        index = ImpactIndex(str(tmp_path / "impact.db"))
+        log = [
+            "SELECT name FROM users WHERE id = 1",
+            "select name from users where id = 2",
+            "SELECT total FROM orders",
+        ]
+        assert index.add_many(log) == 3
+        assert len(index) == 2
+        hit = index.impact_of(dropped_tables=["users"])[0]
+        assert hit.count == 2
+        assert hit.sql == log[0]
+
+    def test_repeats_not_parsed(self, tmp_path, monkeypatch):
+        index = ImpactIndex(str(tmp_path / "impact.db"))
+        index.add("SELECT name FROM users WHERE id = 1")
+        monkeypatch.setattr("sqldrift.impact.compile", None)
+        assert index.add("SELECT name FROM users WHERE id = 2")
+
+    def test_invalid_and_blank_skipped(self, tmp_path):
+        index = ImpactIndex(str(tmp_path / "impact.db"))
+        assert index.add_many(["SELECT FROM WHERE (", "  ", "SELECT 1"]) == 1
+        assert len(index) == 1
+
+    def test_unresolvable_rejected(self, tmp_path):
+        index = ImpactIndex(str(tmp_path / "impact.db"))
+        assert not index.add("SELEC")
+        assert len(index) == 0
+
+    def test_expression_and_plan_input(self, tmp_path):
+        index = ImpactIndex(str(tmp_path / "impact.db"))
+        assert index.add(sqlglot.parse_one("SELECT name FROM users"))
+        assert index.add(compile("SELECT total FROM orders"), query_id="report")
+        with pytest.raises(ValueError):
+            index.add(compile("SELECT 1"))
+        assert ids(index.impact_of(dropped_columns={"orders": ["total"]})) == [
+            "report"
+        ]
+
+    def test_discard(self, index):
+        assert index.discard("names")
+        assert not index.discard("names")
+        assert index.impact_of(dropped_columns={"users": ["name"]}) == []
+        assert len(index) == len(CORPUS) - 1
+
+    def test_clear(self, index):
+        index.clear()
+        assert len(index) == 0
+        assert index.impact_of(dropped_tables=["users"]) == []
+
+
+class TestPersistence:
+    """Tests for reopening an index file."""
+
+    def test_survives_restart(self, tmp_path):
+        path = str(tmp_path / "impact.db")
+        ImpactIndex(path).add_many(CORPUS.items())
+        assert ids(ImpactIndex(path).impact_of(dropped_tables=["orders"])) == [
+            "recent",
+            "totals",
+        ]
+
+    def test_case_sensitive_mismatch(self, tmp_path):
+        path = str(tmp_path / "impact.db")
+        ImpactIndex(path).close()
+        with pytest.raises(ValueError):
+            ImpactIndex(path, case_sensitive=True)
+
+    def test_case_sensitive(self, tmp_path):
+        index = ImpactIndex(str(tmp_path / "impact.db"), case_sensitive=True)
+        index.add("SELECT Name FROM Users")
+        assert index.impact_of(dropped_columns={"users": ["name"]}) == []
+        assert ids(index.impact_of(dropped_columns={"Users": ["Name"]})) == [
+            "SELECT Name FROM Users"
+        ]
+
+    def test_case_sensitive_queries_kept_apart(self, tmp_path):
+        index = ImpactIndex(str(tmp_path / "impact.db"), case_sensitive=True)
+        index.add_many(["SELECT * FROM Filter", "SELECT * FROM filter"])
+        assert len(index) == 2
+        hits = index.impact_of(dropped_tables=["Filter"])
+        assert [hit.sql for hit in hits] == ["SELECT * FROM Filter"]
+
+    def test_failed_batch_rolled_back(self, tmp_path):
+        index = ImpactIndex(str(tmp_path / "impact.db"))
+        with pytest.raises(ValueError):
+            index.add_many(["SELECT name FROM users", compile("SELECT 1")])
+        assert len(index) == 0
@@ -0,0 +1,205 @@
+"""Tests for the on-disk validation cache."""
+
+import pickle
+
+from sqldrift import CachedColumnValidator, CachedSchemaValidator
+from sqldrift import persistent
+from sqldrift.persistent import PersistentCache, schema_digest
+
+
+SCHEMA = {
+    "users": {"columns": ["id", "name", "email"]},
+    "orders": {"columns": ["id", "user_id", "total"]},
+}
+
+
+class TestSchemaDigest:
+    """Tests for the schema hash behind namespaces."""
+
+    def test_order_independent(self):
+        assert schema_digest(["a", "b"]) == schema_digest(["b", "a"])
+
+    def test_distinguishes_names(self):
+        assert schema_digest(["ab", "c"]) != schema_digest(["a", "bc"])
+
+
+class TestPersistentCache:
+    """Tests for results surviving restarts."""
+
+    def test_survives_restart(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        first = CachedColumnValidator(SCHEMA, cache_path=path)
+        expected = first.validate("SELECT nme FROM users WHERE id = 1")
+
+        second = CachedColumnValidator(SCHEMA, cache_path=path)
+        assert second.validate("SELECT nme FROM users WHERE id = 2") == expected
+        info = second.get_cache_info()
+        assert info["disk_hits"] == 1
+        assert info["misses"] == 1
+
+    def test_structured_result_round_trips(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        CachedColumnValidator(SCHEMA, cache_path=path).validate(
+            "SELECT nme FROM users"
+        )
+        result = CachedColumnValidator(SCHEMA, cache_path=path).validate_result(
+            "SELECT nme FROM users"
+        )
+        assert result.ok is False
+        assert result.missing_columns[0].suggestions == ("users.name",)
+
+    def test_schema_change_invalidates(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        CachedSchemaValidator(["users"], cache_path=path).validate(
+            "SELECT * FROM orders"
+        )
+
+        changed = CachedSchemaValidator(["users", "orders"], cache_path=path)
+        assert changed.validate("SELECT * FROM orders")[0] is True
+        assert changed.get_cache_info()["disk_hits"] == 0
+
+    def test_update_schema_switches_namespace(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        validator = CachedSchemaValidator(["users"], cache_path=path)
+        assert validator.validate("SELECT * FROM orders")[0] is False
+        validator.update_schema(["users", "orders"])
+        assert validator.validate("SELECT * FROM orders")[0] is True
+        validator.update_schema(["users"])
+        assert validator.validate("SELECT * FROM orders")[0] is False
+        # The first schema's entry is served again
+        assert validator.get_cache_info()["disk_hits"] == 1
+
+    def test_empty_table_changes_namespace(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        query = "SELECT a.id FROM audit a"
+        assert CachedColumnValidator(SCHEMA, cache_path=path).validate(query)[0]
+
+        changed = CachedColumnValidator(
+            {**SCHEMA, "audit": {"columns": []}}, cache_path=path
+        )
+        assert changed.validate(query)[0] is False
+        assert changed.get_cache_info()["disk_hits"] == 0
+
+    def test_dotted_names_change_namespace(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        query = "SELECT * FROM a"
+        CachedColumnValidator(
+            {"a.b": {"columns": ["c"]}}, cache_path=path
+        ).validate(query)
+        other = CachedColumnValidator({"a": {"columns": ["b.c"]}}, cache_path=path)
+        other.validate(query)
+        assert other.get_cache_info()["disk_hits"] == 0
+
+    def test_options_are_separate(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        CachedSchemaValidator(["Users"], cache_path=path).validate(
+            "SELECT * FROM users"
+        )
+        strict = CachedSchemaValidator(
+            ["Users"], case_sensitive=True, cache_path=path
+        )
+        assert strict.validate("SELECT * FROM users")[0] is False
+        assert strict.get_cache_info()["disk_hits"] == 0
+
+    def test_dialects_are_separate(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        CachedSchemaValidator(["users"], cache_path=path).validate(
+            "SELECT * FROM users"
+        )
+        other = CachedSchemaValidator(["users"], cache_path=path)
+        other.validate("SELECT * FROM users", dialect="postgres")
+        assert other.get_cache_info()["disk_hits"] == 0
+
+    def test_parse_errors_not_stored(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        validator = CachedSchemaValidator(["users"], cache_path=path)
+        validator.validate("SELECT FROM WHERE (")
+        assert len(validator._cache.store) == 0
+
+    def test_eviction(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(persistent, "_TRIM_EVERY", 4)
+        path = str(tmp_path / "cache.db")
+        validator = CachedSchemaValidator(
+            ["users"], cache_path=path, disk_cache_size=3
+        )
+        for i in range(8):
+            validator.validate(f"SELECT * FROM t{i}")
+        store = validator._cache.store
+        assert len(store) <= 4
+        store.trim()
+        assert len(store) == 3
+
+        # The most recently used entries are kept
+        fresh = CachedSchemaValidator(["users"], cache_path=path)
+        fresh.validate("SELECT * FROM t7")
+        assert fresh.get_cache_info()["disk_hits"] == 1
+
+    def test_pickled_validator_reopens_file(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        validator = CachedColumnValidator(SCHEMA, cache_path=path)
+        validator.validate("SELECT total FROM orders")
+
+        shipped = pickle.loads(pickle.dumps(validator))
+        assert shipped.validate("SELECT total FROM orders")[0] is True
+        assert shipped.get_cache_info()["disk_hits"] == 1
+
+        tables = CachedSchemaValidator(["users"], cache_path=path)
+        tables.validate("SELECT * FROM users")
+        shipped = pickle.loads(pickle.dumps(tables))
+        assert shipped._cache.store.namespace()[0] is shipped._state
+        assert shipped.validate("SELECT * FROM users")[0] is True
+        assert shipped.get_cache_info()["disk_hits"] == 1
+
+    def test_unreadable_file_degrades(self, tmp_path):
+        path = tmp_path / "cache.db"
+        path.write_bytes(b"not a database" * 100)
+        validator = CachedSchemaValidator(["users"], cache_path=str(path))
+        assert validator.validate("SELECT * FROM users")[0] is True
+        assert validator._cache.store.errors > 0
+
+    def test_incompatible_entry_recomputed(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        validator = CachedSchemaValidator(["users"], cache_path=path)
+        validator.validate("SELECT * FROM users")
+        store: PersistentCache = validator._cache.store
+        store._connect().execute("UPDATE results SET value = x'00'")
+
+        fresh = CachedSchemaValidator(["users"], cache_path=path)
+        assert fresh.validate("SELECT * FROM users")[0] is True
+        assert fresh._cache.store.errors == 1
+
+    def test_pickled_entry_never_loaded(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        validator = CachedSchemaValidator(["users"], cache_path=path)
+        validator.validate("SELECT * FROM users")
+
+        class Exploit:
+            def __reduce__(self):
+                return (exec, ("raise SystemExit('unpickled')",))
+
+        store: PersistentCache = validator._cache.store
+        store._connect().execute(
+            "UPDATE results SET value = ?", (pickle.dumps(Exploit()),)
+        )
+        fresh = CachedSchemaValidator(["users"], cache_path=path)
+        assert fresh.validate("SELECT * FROM users")[0] is True
+        assert fresh._cache.store.errors == 1
+
+    def test_drift_result_round_trips(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        schema = {"users": {"columns": ["id", "name"]}}
+        sql = "SELECT u.nme FROM users u JOIN ghosts g ON g.id = u.id"
+        first = CachedColumnValidator(schema, cache_path=path)
+        expected = first.validate(sql)
+        second = CachedColumnValidator(schema, cache_path=path)
+        assert second.validate(sql) == expected
+        assert second.get_cache_info()["disk_hits"] == 1
+
+    def test_case_sensitive_keys_survive_restart(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        schema = {"t": {"columns": ["Date", "id"]}}
+        CachedColumnValidator(schema, case_sensitive=True, cache_path=path).validate(
+            "SELECT Date FROM t"
+        )
+        fresh = CachedColumnValidator(schema, case_sensitive=True, cache_path=path)
+        assert fresh.validate("SELECT date FROM t")[0] is False
@@ -0,0 +1,156 @@
+"""Tests for compiled reference plans."""
+
+import pickle
+from unittest import mock
+
+import pytest
+import sqlglot
+from sqldrift import (
+    CachedColumnValidator,
+    CachedSchemaValidator,
+    ColumnValidator,
+    ReferencePlan,
+    SchemaValidator,
+    UnifiedValidator,
+    compile,
+    validate_query,
+)
+
+
+SCHEMA = {
+    "users": {"columns": ["id", "name", "email"]},
+    "orders": {"columns": ["id", "user_id", "total"]},
+    "public.events": {"columns": ["id", "kind"]},
+}
+
+QUERIES = [
+    "SELECT name FROM users",
+    "SELECT u.name, o.total FROM users u JOIN orders o ON u.id = o.user_id",
+    "SELECT tier FROM users",
+    "SELECT * FROM deleted_table",
+    "WITH recent AS (SELECT * FROM orders) SELECT total FROM recent",
+    "SELECT x FROM (SELECT name AS x FROM users) s WHERE s.x IN (SELECT email FROM users)",
+    "SELECT u.nme FROM users u JOIN invoices i ON i.user_id = u.id",
+    "SELECT * FROM public.events AS e",
+    "SELECT Name FROM USERS",
+    "SELECT FROM WHERE (",
+    "",
+    "SELEC",
+    ";",
+]
+
+VALIDATORS = [
+    lambda: SchemaValidator(list(SCHEMA)),
+    lambda: SchemaValidator(list(SCHEMA), preserve_schema=True),
+    lambda: SchemaValidator(list(SCHEMA), case_sensitive=True),
+    lambda: ColumnValidator(SCHEMA),
+    lambda: ColumnValidator(SCHEMA, case_sensitive=True),
+    lambda: ColumnValidator(SCHEMA, compact=True),
+    lambda: UnifiedValidator(SCHEMA),
+    lambda: CachedSchemaValidator(list(SCHEMA)),
+    lambda: CachedColumnValidator(SCHEMA),
+]
+
+
+class TestCompile:
+    """Tests for compile and the plan format."""
+
+    def test_references(self):
+        plan = compile(
+            "WITH r AS (SELECT id FROM orders) SELECT u.name, u.name FROM users u JOIN r ON 1 = 1"
+        )
+        assert set(plan.tables) == {("orders", "orders"), ("users", "users AS u")}
+        # Repeated references are stored once
+        assert plan.refs.columns == (("u", "name"), ("", "id"))
+        assert plan.refs.ctes == {"r"}
+        assert plan.error is None
+
+    def test_parse_error_recorded(self):
+        plan = compile("SELECT FROM WHERE (")
+        assert plan.tables is None
+        assert plan.refs is None
+        assert plan.error.startswith("Invalid SQL syntax")
+
+    def test_expression_and_plan_input(self):
+        expression = sqlglot.parse_one("SELECT name FROM users")
+        plan = compile(expression)
+        assert plan.tables == (("users", "users"),)
+        assert compile(plan) is plan
+
+    def test_dialect(self):
+        plan = compile("SELECT `name` FROM `users`", dialect="mysql")
+        assert plan.refs.columns == (("", "name"),)
+
+    def test_pickle_round_trip(self):
+        plan = compile(QUERIES[1])
+        shipped = pickle.loads(pickle.dumps(plan))
+        assert isinstance(shipped, ReferencePlan)
+        assert shipped.tables == plan.tables
+        assert shipped.refs.columns == plan.refs.columns
+
+    def test_compact(self):
+        sql = QUERIES[5]
+        assert len(pickle.dumps(compile(sql))) < len(
+            pickle.dumps(sqlglot.parse_one(sql))
+        ) / 4
+
+
+class TestCheckPlans:
+    """Tests for checking plans against validators."""
+
+    @pytest.mark.parametrize("make", VALIDATORS)
+    def test_same_result_as_sql(self, make):
+        validator = make()
+        for sql in QUERIES:
+            plan = compile(sql)
+            assert validator.validate(plan) == validator.validate(sql), sql
+            assert validator.is_valid(plan) == validator.is_valid(sql), sql
+
+    def test_validate_query(self):
+        for sql in QUERIES:
+            assert validate_query(compile(sql), list(SCHEMA)) == validate_query(
+                sql, list(SCHEMA)
+            )
+
+    def test_non_query_is_syntax_error(self):
+        for sql in ("SELEC", "1 + 1"):
+            expected = validate_query(sql, list(SCHEMA))
+            assert expected[1].startswith("Invalid SQL syntax")
+            assert validate_query(compile(sql), list(SCHEMA)) == expected
+            assert compile(sql).error == expected[1]
+
+    def test_extract_columns(self):
+        validator = ColumnValidator(SCHEMA)
+        for sql in QUERIES:
+            assert validator.extract_columns(compile(sql)) == validator.extract_columns(sql)
+
+    def test_no_parsing(self):
+        plans = [compile(sql) for sql in QUERIES]
+        validators = [make() for make in VALIDATORS]
+        with mock.patch("sqlglot.parse_one") as parse:
+            for validator in validators:
+                for plan in plans:
+                    validator.validate(plan)
+        parse.assert_not_called()
+
+    def test_recheck_after_schema_change(self):
+        validator = ColumnValidator(SCHEMA)
+        plan = compile("SELECT u.name FROM users u")
+        assert validator.is_valid(plan)
+        validator.apply_changes(renamed={("users", "name"): "full_name"})
+        result = validator.validate_result(plan)
+        assert not result.ok
+        assert result.missing_columns[0].suggestions == ("users.full_name",)
+
+    def test_result_references(self):
+        result = UnifiedValidator(SCHEMA).validate_result(
+            compile(QUERIES[1]), keep_ast=True
+        )
+        assert result.expression is None
+        assert result.tables == ("orders", "users")
+        assert ("users", "name") in result.columns
+
+    def test_cached_validator_skips_cache(self):
+        validator = CachedSchemaValidator(list(SCHEMA))
+        assert validator.validate(compile("SELECT * FROM users"))[0]
+        assert validator.get_cache_info()["size"] == 0
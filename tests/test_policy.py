@@ -0,0 +1,159 @@
+"""Tests for the cache eviction policies."""
+
+import pickle
+
+import pytest
+from sqldrift import CachedColumnValidator, CachedSchemaValidator
+from sqldrift.cache import ValidationCache
+from sqldrift.policy import LRUPolicy, TinyLFUPolicy, make_policy
+from sqldrift.result import ValidationResult
+
+
+OK = (ValidationResult(True, "Query is safe to execute."), None)
+
+
+def fill(cache, keys):
+    for key in keys:
+        cache.get_or_compute(key, None, lambda: OK)
+
+
+class TestLRUPolicy:
+    """Tests for least-recently-used eviction."""
+
+    def test_evicts_least_recent(self):
+        policy = LRUPolicy(2)
+        assert policy.admit("a") == []
+        assert policy.admit("b") == []
+        policy.touch("a")
+        assert policy.admit("c") == ["b"]
+
+    def test_unbounded(self):
+        policy = LRUPolicy(None)
+        assert all(policy.admit(i) == [] for i in range(1000))
+
+
+class TestTinyLFUPolicy:
+    """Tests for the W-TinyLFU admission filter."""
+
+    def test_requires_bound(self):
+        with pytest.raises(ValueError, match="bounded"):
+            TinyLFUPolicy(None)
+
+    def test_rejects_one_off_keys(self):
+        policy = TinyLFUPolicy(100)
+        for key in range(100):
+            policy.admit(key)
+        for _ in range(3):
+            for key in range(100):
+                policy.touch(key)
+        for i in range(500):
+            policy.admit(f"scan{i}")
+        # The scanned keys were turned away. The key sitting in the window
+        # when the scan started, and rarely one losing to a hash collision
+        # in the sketch, may be displaced
+        resident = {*policy._window, *policy._probation, *policy._protected}
+        assert len(resident & set(range(100))) >= 97
+        assert policy.rejections >= 497
+
+    def test_admits_frequent_keys(self):
+        policy = TinyLFUPolicy(100)
+        for key in range(100):
+            policy.admit(key)
+        # A newcomer seen often enough replaces a cold resident
+        evicted = []
+        for _ in range(5):
+            evicted += policy.admit("hot")
+        assert "hot" not in evicted
+        assert any(key != "hot" for key in evicted)
+
+    def test_discard(self):
+        policy = TinyLFUPolicy(10)
+        policy.admit("a")
+        policy.discard("a")
+        policy.discard("missing")
+        assert policy.admit("b") == []
+
+    def test_tiny_capacity(self):
+        policy = TinyLFUPolicy(1)
+        assert policy.admit("a") == []
+        assert policy.admit("b") == ["a"]
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError, match="Unknown cache policy"):
+            make_policy("fifo", 10)
+
+
+class TestScanResistance:
+    """Tests for ValidationCache with each policy."""
+
+    HOT = [f"SELECT * FROM hot_{i}" for i in range(50)]
+    SCAN = [f"SELECT * FROM scan_{i}" for i in range(500)]
+
+    def hot_hits_after_scan(self, policy):
+        cache = ValidationCache(100, use_fingerprint=False, policy=policy)
+        for _ in range(5):
+            fill(cache, self.HOT)
+        fill(cache, self.SCAN)
+        before = cache.exact_hits
+        fill(cache, self.HOT)
+        return cache.exact_hits - before
+
+    def test_lru_is_flushed(self):
+        assert self.hot_hits_after_scan("lru") == 0
+
+    def test_tinylfu_keeps_hot_entries(self):
+        assert self.hot_hits_after_scan("tinylfu") == len(self.HOT)
+
+    def test_rejected_queries_not_remembered(self):
+        cache = ValidationCache(100, use_fingerprint=False, policy="tinylfu")
+        for _ in range(5):
+            fill(cache, self.HOT)
+        fill(cache, self.SCAN)
+        assert len(cache._keys) <= 100
+        assert all(key in cache._entries for key in cache._keys.values())
+
+    def test_info(self):
+        cache = ValidationCache(10, policy="tinylfu")
+        fill(cache, [f"SELECT * FROM t{i}" for i in range(30)])
+        info = cache.info()
+        assert info["policy"] == "tinylfu"
+        assert info["admissions"] + info["rejections"] > 0
+        assert info["size"] <= 10
+
+    def test_invalidate(self):
+        cache = ValidationCache(10, use_fingerprint=False, policy="tinylfu")
+        cache.get_or_compute("q", None, lambda: (OK[0], (frozenset({"users"}), frozenset())))
+        assert cache.invalidate(tables=["users"]) == 1
+        fill(cache, [f"SELECT * FROM t{i}" for i in range(30)])
+        assert len(cache._entries) <= 10
+
+
+class TestCachedValidatorPolicy:
+    """Tests for selecting the policy on the cached validators."""
+
+    def test_schema_validator(self):
+        v = CachedSchemaValidator(["users"], cache_size=16, cache_policy="tinylfu")
+        assert v.validate("SELECT * FROM users")[0] is True
+        assert v.validate("SELECT * FROM users")[0] is True
+        info = v.get_cache_info()
+        assert info["policy"] == "tinylfu"
+        assert info["hits"] == 1
+
+    def test_column_validator(self):
+        v = CachedColumnValidator(
+            {"users": {"columns": ["id"]}}, cache_size=16, cache_policy="tinylfu"
+        )
+        assert v.validate("SELECT id FROM users")[0] is True
+        assert v.get_cache_info()["policy"] == "tinylfu"
+
+    def test_default_is_lru(self):
+        assert CachedSchemaValidator(["users"]).get_cache_info()["policy"] == "lru"
+
+    def test_pickle_keeps_policy(self):
+        v = CachedSchemaValidator(["users"], cache_policy="tinylfu")
+        shipped = pickle.loads(pickle.dumps(v))
+        assert shipped.get_cache_info()["policy"] == "tinylfu"
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            CachedSchemaValidator(["users"], cache_policy="mru")
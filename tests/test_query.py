@@ -0,0 +1,182 @@
+"""Tests for validating pre-parsed expressions and keeping the AST."""
+
+import pickle
+from unittest import mock
+
+import sqlglot
+from sqldrift import (
+    CachedColumnValidator,
+    CachedSchemaValidator,
+    ColumnValidator,
+    SchemaValidator,
+    UnifiedValidator,
+    validate_query,
+)
+from sqldrift.query import is_blank, parse_query
+
+
+SCHEMA = {
+    "users": {"columns": ["id", "name", "email"]},
+    "orders": {"columns": ["id", "user_id", "total"]},
+}
+
+JOIN = "SELECT u.name, o.total FROM users u JOIN orders o ON u.id = o.user_id"
+
+
+def count_parses():
+    return mock.patch("sqlglot.parse_one", wraps=sqlglot.parse_one)
+
+
+class TestParseQuery:
+    """Tests for the query helpers."""
+
+    def test_expression_passes_through(self):
+        expression = sqlglot.parse_one("SELECT 1")
+        assert parse_query(expression) is expression
+
+    def test_text_is_parsed(self):
+        expression = parse_query("SELECT a FROM `t`", "mysql")
+        assert expression.find(sqlglot.exp.Table).name == "t"
+
+    def test_is_blank(self):
+        assert is_blank("")
+        assert is_blank("  \n")
+        assert is_blank(None)
+        assert not is_blank("SELECT 1")
+        assert not is_blank(sqlglot.parse_one("SELECT 1"))
+
+
+class TestExpressionInput:
+    """Tests for passing sqlglot expressions to the validators."""
+
+    def test_schema_validator(self):
+        v = SchemaValidator(["users"])
+        users = sqlglot.parse_one("SELECT * FROM users")
+        orders = sqlglot.exp.select("*").from_("orders")
+        with count_parses() as parse:
+            assert v.validate(users)[0] is True
+            assert v.validate(orders)[0] is False
+            assert v.is_valid(users)
+            assert v.validate_result(orders).missing_tables[0].name == "orders"
+            assert parse.call_count == 0
+
+    def test_column_validator(self):
+        v = ColumnValidator(SCHEMA)
+        expression = sqlglot.parse_one(JOIN)
+        with count_parses() as parse:
+            assert v.validate(expression) == (True, "All columns exist.")
+            assert v.is_valid(expression)
+            assert v.extract_columns(expression) == [
+                ("users", "name"), ("orders", "total"),
+                ("users", "id"), ("orders", "user_id"),
+            ]
+            assert parse.call_count == 0
+
+    def test_unified_validator(self):
+        v = UnifiedValidator(SCHEMA)
+        with count_parses() as parse:
+            ok, msg = v.validate(sqlglot.parse_one("SELECT tier FROM users"))
+            assert parse.call_count == 1
+        assert ok is False
+        assert "tier" in msg
+        assert v.is_valid(sqlglot.parse_one(JOIN))
+
+    def test_validate_query(self):
+        expression = sqlglot.parse_one("SELECT * FROM users")
+        assert validate_query(expression, ["users"]) == (
+            True, "Query is safe to execute."
+        )
+
+    def test_expression_is_not_modified(self):
+        expression = sqlglot.parse_one(
+            "WITH t AS (SELECT id FROM users) SELECT t.id FROM t JOIN orders o ON o.id = t.id"
+        )
+        before = expression.sql()
+        UnifiedValidator(SCHEMA).validate(expression)
+        ColumnValidator(SCHEMA).extract_columns(expression)
+        assert expression.sql() == before
+
+    def test_cached_validators_skip_cache(self):
+        tables = CachedSchemaValidator(["users"])
+        columns = CachedColumnValidator(SCHEMA)
+        expression = sqlglot.parse_one("SELECT name FROM users")
+        for v in (tables, columns):
+            assert v.validate(expression)[0] is True
+            assert v.is_valid(expression)
+            assert v.get_cache_info()["misses"] == 0
+            assert v.get_cache_info()["size"] == 0
+
+
+class TestKeepAst:
+    """Tests for returning the parsed AST and references."""
+
+    def test_schema_validator(self):
+        result = SchemaValidator(["users", "orders"]).validate_result(
+            "WITH t AS (SELECT * FROM Orders) SELECT * FROM users JOIN t ON 1 = 1",
+            keep_ast=True,
+        )
+        assert result.ok
+        assert isinstance(result.expression, sqlglot.exp.Select)
+        assert result.tables == ("orders", "users")
+        assert result.columns is None
+
+    def test_not_kept_by_default(self):
+        result = SchemaValidator(["users"]).validate_result("SELECT * FROM users")
+        assert result.expression is None
+        assert result.tables is None
+
+    def test_kept_on_failure(self):
+        result = SchemaValidator(["users"]).validate_result(
+            "SELECT * FROM user", keep_ast=True
+        )
+        assert not result.ok
+        assert result.tables == ("user",)
+        assert result.expression is not None
+
+    def test_column_validator(self):
+        v = ColumnValidator(SCHEMA)
+        result = v.validate_result(JOIN, keep_ast=True)
+        assert result.ok
+        assert result.tables == ("orders", "users")
+        assert list(result.columns) == v.extract_columns(JOIN)
+        assert result.expression.sql() == sqlglot.parse_one(JOIN).sql()
+
+        failed = v.validate_result("SELECT tier FROM users", keep_ast=True)
+        assert not failed.ok
+        assert failed.columns == ((None, "tier"),)
+
+    def test_unified_validator(self):
+        result = UnifiedValidator(SCHEMA).validate_result(
+            "SELECT u.tier FROM users u JOIN gone g ON g.id = u.id", keep_ast=True
+        )
+        assert not result.ok
+        assert result.tables == ("gone", "users")
+        assert ("users", "tier") in result.columns
+        assert result.missing_tables[0].name == "gone"
+
+    def test_ast_reused_downstream(self):
+        result = ColumnValidator(SCHEMA).validate_result(JOIN, keep_ast=True)
+        with count_parses() as parse:
+            assert "users AS u" in result.expression.sql(dialect="postgres")
+            assert parse.call_count == 0
+
+    def test_parse_error(self):
+        result = SchemaValidator(["users"]).validate_result(
+            "SELECT FROM WHERE (", keep_ast=True
+        )
+        assert not result.ok
+        assert result.expression is None
+
+    def test_cached_validator_keep_ast(self):
+        v = CachedColumnValidator(SCHEMA)
+        v.validate("SELECT name FROM users")
+        result = v.validate_result("SELECT name FROM users", keep_ast=True)
+        assert result.columns == ((None, "name"),)
+        # The shared cached result is left untouched
+        assert v.validate_result("SELECT name FROM users").expression is None
+
+    def test_result_pickles(self):
+        result = ColumnValidator(SCHEMA).validate_result(JOIN, keep_ast=True)
+        shipped = pickle.loads(pickle.dumps(result))
+        assert shipped.columns == result.columns
+        assert shipped.expression == result.expression
@@ -0,0 +1,87 @@
+"""Tests for the single-pass reference walker."""
+
+import pytest
+import sqlglot
+from sqlglot import exp
+from sqldrift.references import collect_references
+
+
+QUERIES = [
+    "SELECT a, b FROM t",
+    "SELECT u.name, o.total FROM users u JOIN orders AS o ON u.id = o.user_id",
+    "WITH c AS (SELECT id FROM users) SELECT c.id FROM c JOIN orders o ON o.id = c.id",
+    "SELECT x FROM (SELECT y AS x FROM (SELECT y FROM deep WHERE z > 1) s1) s2",
+    "SELECT * FROM a WHERE a.id IN (SELECT b.a_id FROM b WHERE b.v = a.v)",
+    "SELECT s.col.field, a.b.c.d FROM t AS s",
+    "SELECT ROW_NUMBER() OVER (PARTITION BY a ORDER BY b) FROM t",
+    "SELECT x FROM db.sch.t1 JOIN LATERAL (SELECT y FROM t2 WHERE t2.k = t1.k) z ON TRUE",
+    "INSERT INTO t (a, b) SELECT c, d FROM s",
+    "UPDATE t SET a = (SELECT MAX(b) FROM s WHERE s.id = t.id)",
+    "SELECT a FROM t UNION ALL SELECT b FROM u ORDER BY 1",
+]
+
+
+class TestCollectReferences:
+    """Tests for collect_references."""
+
+    @pytest.mark.parametrize("sql", QUERIES)
+    def test_matches_find_all(self, sql):
+        expression = sqlglot.parse_one(sql)
+        refs = collect_references(expression)
+        assert [(t, a) for t, a, _, _ in refs.tables] == [
+            (t.name, t.alias) for t in expression.find_all(exp.Table)
+        ]
+        assert refs.columns == [
+            (c.table, c.name) for c in expression.find_all(exp.Column)
+        ]
+        assert refs.ctes == {c.alias for c in expression.find_all(exp.CTE)}
+
+    def test_qualified_tables(self):
+        refs = collect_references(
+            sqlglot.parse_one("SELECT * FROM c.s.t JOIN s.u ON 1 = 1 JOIN v ON 1 = 1")
+        )
+        assert [(name, qualified) for name, _, qualified, _ in refs.tables] == [
+            ("t", True), ("u", True), ("v", False),
+        ]
+
+    def test_ctes_visible_per_scope(self):
+        refs = collect_references(
+            sqlglot.parse_one(
+                "SELECT * FROM (WITH c AS (SELECT 1) SELECT * FROM c) s "
+                "JOIN c ON 1 = 1"
+            )
+        )
+        assert [(name, visible) for name, _, _, visible in refs.tables] == [
+            ("c", frozenset()), ("c", frozenset({"c"})),
+        ]
+
+    def test_cte_bodies_see_earlier_ctes(self):
+        refs = collect_references(
+            sqlglot.parse_one(
+                "WITH a AS (SELECT * FROM b), b AS (SELECT * FROM a) SELECT * FROM b"
+            )
+        )
+        assert [(name, visible) for name, _, _, visible in refs.tables] == [
+            ("b", frozenset({"a", "b"})), ("b", frozenset()), ("a", frozenset({"a"})),
+        ]
+        refs = collect_references(
+            sqlglot.parse_one("WITH RECURSIVE r AS (SELECT * FROM r) SELECT * FROM r")
+        )
+        assert [visible for _, _, _, visible in refs.tables] == [
+            frozenset({"r"}), frozenset({"r"}),
+        ]
+
+    def test_expression_not_modified(self):
+        expression = sqlglot.parse_one(QUERIES[2])
+        before = expression.sql()
+        collect_references(expression)
+        assert expression.sql() == before
+
+    def test_deep_nesting(self):
+        sql = "SELECT c FROM t"
+        for i in range(50):
+            sql = f"SELECT s{i}.c FROM ({sql}) AS s{i}"
+        refs = collect_references(sqlglot.parse_one(sql))
+        assert len(refs.columns) == 51
+        assert refs.columns[0] == ("s49", "c")
+        assert refs.tables[-1][0] == "t"
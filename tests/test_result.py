@@ -0,0 +1,186 @@
+"""Tests for structured, lazily rendered validation results."""
+
+from sqldrift import (
+    CachedSchemaValidator,
+    ColumnValidator,
+    SchemaValidator,
+    UnifiedValidator,
+    validate_query,
+)
+from sqldrift.result import MissingColumn, MissingTable, ValidationResult
+
+
+TABLES = [f"table_{i:05d}" for i in range(10_000)]
+
+
+class TestValidationResult:
+    """Tests for ValidationResult rendering."""
+
+    def test_message_rendered_lazily_once(self):
+        result = ValidationResult(
+            False,
+            missing_tables=(MissingTable("orders", ("order",)),),
+            available_tables=("order", "users"),
+            table_count=2,
+        )
+        assert result._message is None
+        message = result.message
+        assert message == (
+            "Schema Drift Detected:\n"
+            "- Table 'orders' not found. Did you mean: order\n"
+            "  Available tables: order, users"
+        )
+        assert result.message is message
+        assert result.as_tuple() == (False, message)
+
+    def test_truncated_listing(self):
+        result = ValidationResult(
+            False,
+            missing_columns=(MissingColumn(
+                "tier", table="users", available=("email", "id"),
+                available_count=4,
+            ),),
+        )
+        assert result.message == (
+            "Column Drift Detected:\n"
+            "- Column 'tier' not found in table 'users'. "
+            "Available columns: email, id, ... (2 more)"
+        )
+
+    def test_parse_errors_not_shareable(self):
+        assert not ValidationResult.failed("Invalid SQL syntax: x").shareable
+        assert ValidationResult.failed("Unexpected error during validation").shareable
+        assert ValidationResult(True, "ok").shareable
+
+
+class TestBoundedMessages:
+    """Drift messages list at most ``message_limit`` available names."""
+
+    def test_table_listing_bounded(self):
+        ok, msg = SchemaValidator(TABLES).validate("SELECT * FROM missing")
+        assert not ok
+        assert "table_00019, ... (9,980 more)" in msg
+        assert "table_00020" not in msg
+        assert len(msg) < 500
+
+    def test_message_limit_option(self):
+        v = SchemaValidator(TABLES, message_limit=2)
+        msg = v.validate("SELECT * FROM missing")[1]
+        assert msg.endswith("Available tables: table_00000, table_00001, ... (9,998 more)")
+
+    def test_listing_ranks_similar_tables_first(self):
+        v = SchemaValidator(TABLES + ["user_events"], message_limit=3)
+        result = v.validate_result("SELECT * FROM user_evnts")
+        assert result.available_tables == ("user_events", "table_00000", "table_00001")
+        assert result.missing_tables[0].suggestions == ("user_events",)
+
+    def test_small_schema_lists_everything(self):
+        ok, msg = SchemaValidator(["users", "orders"]).validate("SELECT * FROM x")
+        assert msg.endswith("Available tables: orders, users")
+
+    def test_small_schema_listed_alphabetically(self):
+        tables = ["users", "orders", "products"]
+        expected = (
+            False,
+            "Schema Drift Detected:\n- Table 'userz' not found. Did you mean: users\n"
+            "  Available tables: orders, products, users",
+        )
+        assert SchemaValidator(tables).validate("SELECT * FROM userz") == expected
+        assert validate_query("SELECT * FROM userz", tables) == expected
+
+    def test_column_listing_bounded(self):
+        schema = {"wide": {"columns": [f"c{i:03d}" for i in range(300)]}}
+        msg = ColumnValidator(schema, message_limit=3).validate(
+            "SELECT missing FROM wide"
+        )[1]
+        assert "Available columns: c000, c001, c002, ... (297 more)" in msg
+
+    def test_unified_and_function_bounded(self):
+        schema = {t: {"columns": ["id"]} for t in TABLES}
+        msg = UnifiedValidator(schema).validate("SELECT id FROM missing")[1]
+        assert "(9,980 more)" in msg
+        assert "(9,980 more)" in validate_query("SELECT * FROM missing", TABLES)[1]
+
+    def test_cache_holds_compact_results(self):
+        cached = CachedSchemaValidator(TABLES)
+        first = cached.validate("SELECT * FROM missing")
+        assert cached.validate("SELECT * FROM missing") == first
+        (entry,) = cached._cache._entries.values()
+        assert isinstance(entry, ValidationResult)
+        assert len(entry.available_tables) == 20
+
+
+class TestValidateResult:
+    """Tests for the structured ``validate_result`` API."""
+
+    SCHEMA = {
+        "users": {"columns": ["id", "name", "email"]},
+        "orders": {"columns": ["id", "user_id", "total"]},
+    }
+
+    def test_schema_validator(self):
+        v = SchemaValidator(["users", "orders"])
+        result = v.validate_result("SELECT * FROM user JOIN orders ON 1 = 1")
+        assert result.ok is False
+        assert [t.name for t in result.missing_tables] == ["user"]
+        assert result.missing_tables[0].suggestions == ("users",)
+        assert result.missing_columns == ()
+        assert result.error is None
+        assert result.parse_time > 0 and result.check_time > 0
+        assert result.as_tuple() == v.validate("SELECT * FROM user JOIN orders ON 1 = 1")
+
+    def test_success(self):
+        result = SchemaValidator(["users"]).validate_result("SELECT * FROM users")
+        assert result.ok is True
+        assert result.message == "Query is safe to execute."
+        assert result.missing_tables == ()
+
+    def test_column_context(self):
+        v = ColumnValidator(self.SCHEMA)
+        result = v.validate_result(
+            "SELECT u.nme, totl FROM users u JOIN orders o ON u.id = o.user_id"
+        )
+        assert not result.ok
+        qualified, unqualified = result.missing_columns
+        assert (qualified.column, qualified.table) == ("nme", "users")
+        assert qualified.suggestions[0] == "users.name"
+        assert unqualified.column == "totl"
+        assert unqualified.table is None
+        assert sorted(unqualified.tables) == ["orders", "users"]
+        assert unqualified.suggestions[0] == "orders.total"
+
+    def test_parse_error(self):
+        result = ColumnValidator(self.SCHEMA).validate_result("SELECT FROM WHERE (")
+        assert not result.ok
+        assert result.error.startswith("Invalid SQL syntax")
+        assert result.message == result.error
+
+    def test_unified_carries_both(self):
+        result = UnifiedValidator(self.SCHEMA).validate_result(
+            "SELECT u.tier FROM users u JOIN invoices i ON i.user_id = u.id"
+        )
+        assert [t.name for t in result.missing_tables] == ["invoices"]
+        assert [c.column for c in result.missing_columns] == ["tier"]
+        assert "Schema Drift Detected" in result.message
+        assert "Column Drift Detected" in result.message
+
+    def test_to_dict(self):
+        result = SchemaValidator(["users"]).validate_result("SELECT * FROM user")
+        data = result.to_dict()
+        assert data["ok"] is False
+        assert data["missing_tables"] == [{"name": "user", "suggestions": ["users"]}]
+        assert data["missing_columns"] == []
+
+    def test_from_dict_round_trip(self):
+        result = UnifiedValidator(self.SCHEMA).validate_result(
+            "SELECT u.tier FROM users u JOIN invoices i ON i.user_id = u.id"
+        )
+        rebuilt = ValidationResult.from_dict(result.to_dict())
+        assert rebuilt.as_tuple() == result.as_tuple()
+        assert rebuilt.to_dict() == result.to_dict()
+
+    def test_cached_returns_shared_result(self):
+        cached = CachedSchemaValidator(["users"])
+        first = cached.validate_result("SELECT * FROM user WHERE id = 1")
+        assert cached.validate_result("SELECT * FROM user WHERE id = 2") is first
+        assert cached.validate("SELECT * FROM user WHERE id = 3") == first.as_tuple()
@@ -0,0 +1,79 @@
+"""Tests for streaming query-log validation."""
+
+import io
+import json
+
+import pytest
+from sqldrift import ColumnValidator, SchemaValidator
+from sqldrift.stream import iter_queries, iter_validate
+
+
+SQL_LOG = """\
+SELECT * FROM users;
+SELECT *
+FROM orders;
+
+SELECT * FROM ghosts
+"""
+
+
+class TestIterQueries:
+    """Tests for log parsing."""
+
+    def test_plain_sql(self):
+        records = list(iter_queries(io.StringIO(SQL_LOG)))
+        assert [r.line for r in records] == [1, 2, 5]
+        assert records[1].sql == "SELECT *\nFROM orders;"
+
+    def test_jsonl(self):
+        lines = [
+            json.dumps({"query": "SELECT * FROM users", "user": "a"}),
+            "not json",
+            json.dumps({"other": 1}),
+            json.dumps({"query": "SELECT * FROM orders"}),
+        ]
+        records = list(iter_queries(lines))
+        assert [(r.line, r.sql) for r in records] == [
+            (1, "SELECT * FROM users"),
+            (4, "SELECT * FROM orders"),
+        ]
+
+    def test_csv_with_multiline_field(self):
+        log = 'ts,query\n1,"SELECT *\nFROM users"\n2,SELECT * FROM orders\n'
+        records = list(iter_queries(io.StringIO(log), log_format="csv"))
+        assert [r.line for r in records] == [2, 4]
+        assert records[0].sql == "SELECT *\nFROM users"
+
+    def test_csv_missing_column(self):
+        with pytest.raises(ValueError):
+            list(iter_queries(["a,b\n", "1,2\n"], log_format="csv"))
+
+    def test_is_lazy(self):
+        def lines():
+            yield "SELECT * FROM users;\n"
+            raise AssertionError("read past the first statement")
+
+        records = iter_queries(lines(), log_format="sql")
+        assert next(records).sql == "SELECT * FROM users;"
+
+
+class TestIterValidate:
+    """Tests for iter_validate."""
+
+    def test_inline(self):
+        v = SchemaValidator(["users", "orders"])
+        results = list(iter_validate(io.StringIO(SQL_LOG), v))
+        assert [r.success for r in results] == [True, True, False]
+        assert "ghosts" in results[2].message
+
+    def test_workers_preserve_order(self):
+        v = ColumnValidator({"users": {"columns": ["id", "name"]}})
+        lines = [
+            json.dumps({"query": f"SELECT {col} FROM users"})
+            for col in ["id", "tier", "name", "zip"] * 5
+        ]
+        results = list(
+            iter_validate(lines, v, workers=2, chunksize=3, max_pending=2)
+        )
+        assert [r.line for r in results] == list(range(1, 21))
+        assert [r.success for r in results] == [True, False, True, False] * 5
@@ -0,0 +1,163 @@
+"""Tests for the trigram suggestion index."""
+
+import pickle
+import random
+
+from sqldrift import ColumnValidator, SchemaValidator, validate_query
+from sqldrift.suggest import TrigramIndex, edit_distance, trigrams
+
+
+TABLES = [
+    "customer_orders", "customers", "order_items", "orders",
+    "user_sessions", "users", "audit_log",
+]
+
+
+class TestTrigramIndex:
+    """Tests for TrigramIndex.suggest."""
+
+    def setup_method(self):
+        self.index = TrigramIndex(TABLES)
+
+    def test_trigrams_are_padded(self):
+        assert trigrams("abc") == {"  a", " ab", "abc", "bc "}
+
+    def test_typo_ranks_closest_first(self):
+        assert self.index.suggest("custmer_orders")[0] == "customer_orders"
+        assert self.index.suggest("usr_sessions")[0] == "user_sessions"
+
+    def test_substring_and_prefix_matches(self):
+        suggestions = self.index.suggest("order")
+        assert "orders" in suggestions
+        assert "order_items" in suggestions
+        assert self.index.suggest("aud") == ["audit_log"]
+
+    def test_no_match(self):
+        assert self.index.suggest("zzzzzzz") == []
+        assert self.index.suggest("") == []
+
+    def test_max_results(self):
+        assert len(self.index.suggest("o", max_results=2)) <= 2
+        assert len(self.index.suggest("orders", max_results=2)) == 2
+
+    def test_edit_distance(self):
+        assert edit_distance("name", "name", 2) == 0
+        assert edit_distance("nme", "name", 2) == 1
+        assert edit_distance("emial", "email", 2) == 1
+        assert edit_distance("kitten", "sitting", 3) == 3
+        # Capped at limit + 1
+        assert edit_distance("kitten", "sitting", 1) == 2
+        assert edit_distance("a", "abcdef", 2) == 3
+
+    def test_typos_within_budget(self):
+        index = TrigramIndex(["user_id", "users", "usage"])
+        assert index.suggest("usre_id") == ["user_id"]
+        assert index.suggest("usre_id", max_edits=1)[0] == "user_id"
+        assert index.suggest("usgae") == []
+        assert index.suggest("usgae", max_edits=1) == ["usage"]
+
+    def test_ties_break_alphabetically(self):
+        index = TrigramIndex(["tbl_b", "tbl_a", "tbl_c"])
+        assert index.suggest("tbl_x") == ["tbl_a", "tbl_b", "tbl_c"]
+
+    def test_short_names_match_substrings(self):
+        index = TrigramIndex(["users", "orders", "sales", "ab", "data"])
+        assert index.suggest("a") == ["ab", "data", "sales"]
+        assert index.suggest("at", max_results=1) == ["data"]
+        schema = {
+            "users": {"columns": ["id", "name", "email"]},
+            "orders": {"columns": ["id", "total"]},
+        }
+        assert sorted(ColumnValidator(schema).suggest_alternatives("a")) == [
+            "orders.total", "users.email", "users.name",
+        ]
+
+    def test_updated_matches_rebuild(self):
+        rng = random.Random(7)
+        words = ["user", "order", "item", "event", "audit", "log", "sale"]
+        names = {
+            "_".join(rng.sample(words, 2)) + str(rng.randrange(50))
+            for _ in range(400)
+        }
+        base = TrigramIndex(names)
+        removed = set(rng.sample(sorted(names), 20))
+        added = {f"user_order{i}" for i in range(20)}
+        updated = base.updated(added, removed)
+        fresh = TrigramIndex((names - removed) | added)
+
+        assert updated.names == fresh.names
+        assert base.names == sorted(names)
+        for query in ["user_ordr", "audit_log1", "sale_item", "event"]:
+            assert updated.suggest(query, max_edits=1) == fresh.suggest(
+                query, max_edits=1
+            )
+            assert base.suggest(query) == TrigramIndex(names).suggest(query)
+
+
+class TestTableSuggestions:
+    """Table suggestions from the validators."""
+
+    def test_suggest_tables(self):
+        validator = SchemaValidator(TABLES)
+        assert validator.suggest_tables("Custmer_Orders")[0] == "customer_orders"
+        assert validator.suggest_tables("public.usrs")[0] == "users"
+        assert validator.suggest_tables("zzzzzzz") == []
+
+    def test_index_follows_schema_changes(self):
+        validator = SchemaValidator(TABLES)
+        assert validator.suggest_tables("invoices") == []
+        validator.apply_changes(added_tables=["invoice"])
+        assert validator.suggest_tables("invoices") == ["invoice"]
+        validator.update_schema(["invoice_lines"])
+        assert validator.suggest_tables("invoices") == ["invoice_lines"]
+
+    def test_index_carried_through_changes(self, monkeypatch):
+        validator = SchemaValidator(TABLES)
+        validator.suggest_tables("users")
+
+        def rebuild(names):
+            raise AssertionError("index rebuilt")
+
+        monkeypatch.setattr("sqldrift.optimized.TrigramIndex", rebuild)
+        validator.apply_changes(added_tables=["invoice"], dropped_tables=["users"])
+        assert validator.suggest_tables("invoices") == ["invoice"]
+        assert "users" not in validator.suggest_tables("usrs")
+        validator.update_schema(TABLES)
+        assert validator.suggest_tables("invoices") == []
+        assert validator.suggest_tables("usrs")[0] == "users"
+
+    def test_column_index_carried_through_changes(self, monkeypatch):
+        schema = {
+            "users": {"columns": ["id", "name", "email"]},
+            "orders": {"columns": ["id", "total"]},
+        }
+        for compact in (False, True):
+            validator = ColumnValidator(schema, compact=compact)
+            validator.suggest_alternatives("nme")
+
+            def rebuild(names):
+                raise AssertionError("index rebuilt")
+
+            monkeypatch.setattr("sqldrift.column_validator.TrigramIndex", rebuild)
+            validator.apply_changes(
+                added_columns={"orders": {"columns": ["email_sent"]}},
+                dropped_columns={"users": ["email"]},
+            )
+            assert validator.suggest_alternatives("email") == ["orders.email_sent"]
+            validator.update_schema(schema)
+            assert validator.suggest_alternatives("emial")[0] == "users.email"
+            monkeypatch.undo()
+
+    def test_drift_message_suggestions(self):
+        success, msg = SchemaValidator(TABLES).validate("SELECT * FROM custmer_orders")
+        assert not success
+        assert "Did you mean: customer_orders" in msg
+        assert validate_query("SELECT * FROM custmer_orders", TABLES) == (success, msg)
+
+    def test_pickle_drops_index(self):
+        validator = SchemaValidator(TABLES)
+        validator.suggest_tables("users")
+        assert validator._state._index is not None
+        clone = pickle.loads(pickle.dumps(validator))
+        assert clone._state._index is None
+        assert clone.suggest_tables("usrs") == validator.suggest_tables("usrs")
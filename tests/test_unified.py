@@ -0,0 +1,105 @@
+"""Tests for the single-parse UnifiedValidator."""
+
+from unittest import mock
+
+import sqlglot
+from sqldrift import UnifiedValidator
+
+
+SCHEMA = {
+    "users": {
+        "columns": ["id", "name", "email"],
+        "types": ["INTEGER", "VARCHAR", "VARCHAR"],
+    },
+    "orders": {
+        "columns": ["id", "user_id", "total"],
+        "types": ["INTEGER", "INTEGER", "DECIMAL"],
+    },
+}
+
+
+class TestUnifiedValidator:
+    """Tests for combined table and column validation."""
+
+    def setup_method(self):
+        self.validator = UnifiedValidator(SCHEMA)
+
+    def test_valid_query(self):
+        ok, msg = self.validator.validate(
+            "SELECT u.name, o.total FROM users u JOIN orders o ON u.id = o.user_id"
+        )
+        assert ok is True
+        assert msg == "Query is safe to execute."
+
+    def test_missing_table(self):
+        ok, msg = self.validator.validate("SELECT * FROM products")
+        assert ok is False
+        assert "Schema Drift Detected" in msg
+        assert "products" in msg
+
+    def test_missing_column(self):
+        ok, msg = self.validator.validate("SELECT tier FROM users")
+        assert ok is False
+        assert "Column Drift Detected" in msg
+        assert "Schema Drift Detected" not in msg
+
+    def test_table_and_column_drift_together(self):
+        ok, msg = self.validator.validate(
+            "SELECT u.tier FROM users u JOIN products p ON p.id = u.id"
+        )
+        assert ok is False
+        assert "Schema Drift Detected" in msg
+        assert "Column Drift Detected" in msg
+
+    def test_cte_not_flagged(self):
+        ok, _ = self.validator.validate(
+            "WITH recent AS (SELECT id FROM orders) SELECT id FROM recent"
+        )
+        assert ok is True
+
+    def test_invalid_sql(self):
+        ok, msg = self.validator.validate("SELECT FROM WHERE (")
+        assert ok is False
+        assert "Invalid SQL syntax" in msg
+
+    def test_parses_once(self):
+        with mock.patch(
+            "sqldrift.unified.sqlglot.parse_one", wraps=sqlglot.parse_one
+        ) as parse_one:
+            self.validator.validate("SELECT name FROM users")
+        assert parse_one.call_count == 1
+
+    def test_update_schema(self):
+        ok, _ = self.validator.validate("SELECT sku FROM products")
+        assert ok is False
+        self.validator.update_schema({"products": {"columns": ["id", "sku"]}})
+        ok, _ = self.validator.validate("SELECT sku FROM products")
+        assert ok is True
+        assert self.validator.get_table_count() == 1
+
+    def test_apply_changes(self):
+        self.validator.apply_changes(
+            added_tables={"invoices": {"columns": ["id", "amount"]}},
+            renamed={("users", "name"): "full_name"},
+        )
+        assert self.validator.validate("SELECT amount FROM invoices")[0] is True
+        assert self.validator.validate("SELECT full_name FROM users")[0] is True
+        ok, message = self.validator.validate("SELECT name FROM users")
+        assert ok is False
+        assert "Schema Drift" not in message
+
+    def test_is_valid(self):
+        for q in [
+            "SELECT name FROM users",
+            "SELECT * FROM products",
+            "SELECT tier FROM users",
+            "SELECT FROM WHERE (",
+        ]:
+            assert self.validator.is_valid(q) is self.validator.validate(q)[0], q
+
+    def test_is_valid_parses_once(self):
+        with mock.patch(
+            "sqldrift.unified.sqlglot.parse_one", wraps=sqlglot.parse_one
+        ) as parse_one:
+            assert self.validator.is_valid("SELECT name FROM users") is True
+        assert parse_one.call_count == 1
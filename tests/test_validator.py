@@ -1,7 +1,12 @@
 """Tests for sqldrift validators."""
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from sqldrift import validate_query, SchemaValidator, CachedSchemaValidator
+from sqldrift import validate_query, SchemaValidator, CachedSchemaValidator, compile
+from sqldrift import validator as validator_module
 
 
 # ---------------------------------------------------------------------------
@@ -75,6 +80,70 @@ class TestValidateQuery:
         assert success is True
 
 
+class TestValidatorRegistry:
+    """Tests for the validators reused behind validate_query."""
+
+    def setup_method(self):
+        validator_module._registry.clear()
+
+    def test_equal_lists_share_a_validator(self):
+        first = validator_module._validator_for(["users", "orders"])
+        assert validator_module._validator_for(["users", "orders"]) is first
+        assert validator_module._validator_for(("users", "orders")) is first
+
+    def test_mutated_list_is_revalidated(self):
+        tables = ["users"]
+        assert validate_query("SELECT * FROM orders", tables)[0] is False
+        tables.append("orders")
+        assert validate_query("SELECT * FROM orders", tables)[0] is True
+
+    def test_bounded(self):
+        for i in range(validator_module._REGISTRY_SIZE * 3):
+            validate_query("SELECT * FROM users", ["users", f"t{i}"])
+        assert len(validator_module._registry) == validator_module._REGISTRY_SIZE
+
+    def test_matches_uncached_messages(self):
+        tables = ["public.users", "orders", " Products "]
+        for query in [
+            "SELECT * FROM products",
+            "SELECT * FROM user",
+            "SELECT * FROM public.users JOIN ordr ON 1 = 1",
+        ]:
+            assert validate_query(query, tables) == SchemaValidator(
+                tables
+            ).validate(query)
+
+    def test_same_list_not_rebuilt(self, monkeypatch):
+        tables = ["users", "orders"]
+        first = validator_module._validator_for(tables)
+
+        def rebuild(tables):
+            raise AssertionError("validator rebuilt")
+
+        monkeypatch.setattr(validator_module, "SchemaValidator", rebuild)
+        assert validator_module._validator_for(tables) is first
+        assert validator_module._validator_for(list(tables)) is first
+
+    def test_plans_match_strings(self):
+        tables = ["users"]
+        for query in ["SELECT * FROM users", "SELECT * FROM ordr", "SELEC"]:
+            assert validate_query(compile(query), tables) == validate_query(
+                query, tables
+            )
+
+    def test_unexpected_error_message(self):
+        # Errors other than parse errors keep the function's historic wording
+        success, msg = validate_query(123, ["users"])
+        assert success is False
+        assert msg.startswith("Invalid SQL syntax: ")
+        assert "Unexpected error" not in msg
+
+    def test_bad_table_list(self):
+        success, msg = validate_query("SELECT * FROM users", [None])
+        assert success is False
+        assert "Invalid SQL syntax" in msg
+
+
 # ---------------------------------------------------------------------------
 # SchemaValidator (class-based)
 # ---------------------------------------------------------------------------
@@ -131,6 +200,56 @@ class TestSchemaValidator:
         assert success is True
 
 
+# ---------------------------------------------------------------------------
+# is_valid (fail-fast)
+# ---------------------------------------------------------------------------
+
+class TestIsValid:
+    """Tests for the boolean fail-fast check."""
+
+    QUERIES = [
+        "SELECT * FROM users",
+        "SELECT * FROM users u JOIN orders o ON u.id = o.user_id",
+        "SELECT * FROM products",
+        "SELECT * FROM users JOIN products ON 1 = 1",
+        "WITH recent AS (SELECT * FROM orders) SELECT * FROM recent",
+        "SELECT * FROM users WHERE id IN (SELECT user_id FROM refunds)",
+        "SELEC * FORM users",
+    ]
+
+    def test_agrees_with_validate(self):
+        v = SchemaValidator(["users", "orders"])
+        for q in self.QUERIES:
+            assert v.is_valid(q) is v.validate(q)[0], q
+
+    def test_skips_diagnostics(self):
+        v = SchemaValidator(["users", "orders"])
+        assert v.is_valid("SELECT * FROM user") is False
+        # The suggestion index is only built for diagnostics
+        assert v._state._index is None
+
+    def test_invalid_sql(self):
+        v = SchemaValidator(["users"])
+        assert v.is_valid("SELEC * FORM users") is False
+        assert v.is_valid("") is False
+
+    def test_follows_schema_updates(self):
+        v = SchemaValidator(["users"])
+        assert v.is_valid("SELECT * FROM orders") is False
+        v.apply_changes(added_tables=["orders"])
+        assert v.is_valid("SELECT * FROM orders") is True
+
+    def test_cached(self):
+        v = CachedSchemaValidator(["users"])
+        assert v.is_valid("SELECT * FROM orders") is False
+        # The diagnostics computed on the miss serve the follow-up call
+        ok, msg = v.validate("SELECT * FROM orders")
+        assert ok is False and "orders" in msg
+        assert v.get_cache_info()["hits"] == 1
+        v.apply_changes(added_tables=["orders"])
+        assert v.is_valid("SELECT * FROM orders") is True
+
+
 # ---------------------------------------------------------------------------
 # CachedSchemaValidator
 # ---------------------------------------------------------------------------
@@ -158,3 +277,198 @@ class TestCachedSchemaValidator:
         v.clear_cache()
         info = v.get_cache_info()
         assert info["size"] == 0
+
+    def test_fingerprint_hits(self):
+        v = CachedSchemaValidator(["users"], cache_size=16)
+        v.validate("SELECT * FROM users WHERE id = 1")
+        v.validate("select * from users where id = 2 -- retry")
+        info = v.get_cache_info()
+        assert info["fingerprint_hits"] == 1
+        assert info["exact_hits"] == 0
+        assert info["hits"] == 1
+
+    def test_keyword_named_table_case_sensitive(self):
+        v = CachedSchemaValidator(["Filter"], case_sensitive=True)
+        assert v.validate("SELECT * FROM Filter")[0] is True
+        assert v.validate("SELECT * FROM filter")[0] is False
+
+    def test_string_table_not_shared(self):
+        v = CachedSchemaValidator(["users"])
+        assert v.validate("SELECT * FROM 'users'", dialect="duckdb")[0] is True
+        assert v.validate("SELECT * FROM 'ghosts'", dialect="duckdb")[0] is False
+
+    def test_syntax_errors_not_shared(self):
+        v = CachedSchemaValidator(["users"], cache_size=16)
+        _, msg1 = v.validate("SELECT * FROM users WHERE (id = 1")
+        _, msg2 = v.validate("SELECT * FROM users WHERE (id = 2")
+        assert msg1.startswith("Invalid SQL syntax")
+        assert v.get_cache_info()["misses"] == 2
+
+    def test_update_schema_evicts_only_affected_entries(self):
+        v = CachedSchemaValidator(["users", "orders", "products"], cache_size=16)
+        v.validate("SELECT * FROM users")
+        v.validate("SELECT * FROM orders")
+        v.validate("SELECT * FROM invoices")  # failure: schema-wide dependency
+
+        v.update_schema(["users", "products", "invoices"])  # drop orders, add invoices
+        info = v.get_cache_info()
+        assert info["invalidations"] == 2
+        assert info["size"] == 1
+
+        assert v.validate("SELECT * FROM users")[0] is True
+        assert v.validate("SELECT * FROM orders")[0] is False
+        assert v.validate("SELECT * FROM invoices")[0] is True
+        assert v.get_cache_info()["hits"] == 1
+
+    def test_update_schema_unchanged_keeps_cache(self):
+        v = CachedSchemaValidator(["users"], cache_size=16)
+        v.validate("SELECT * FROM missing")
+        v.update_schema(["users"])
+        assert v.get_cache_info()["size"] == 1
+
+
+# ---------------------------------------------------------------------------
+# Incremental schema changes
+# ---------------------------------------------------------------------------
+
+class TestApplyChanges:
+    """Tests for SchemaValidator.apply_changes."""
+
+    def test_add_drop_rename(self):
+        v = SchemaValidator(["users", "orders", "products"])
+        v.apply_changes(
+            added_tables=["Invoices"],
+            dropped_tables=["products"],
+            renamed={"orders": "purchases"},
+        )
+        assert v.get_table_count() == 3
+        assert v.table_exists("invoices")
+        assert v.table_exists("purchases")
+        assert not v.table_exists("orders")
+        assert not v.table_exists("products")
+        assert v.validate("SELECT * FROM invoices JOIN purchases ON 1 = 1")[0] is True
+
+    def test_replay_is_noop(self):
+        v = SchemaValidator(["users"])
+        for _ in range(2):
+            v.apply_changes(added_tables=["orders"], dropped_tables=["users"])
+        assert v.get_table_count() == 1
+        assert v.table_exists("orders")
+
+    def test_base_name_shared_across_schemas(self):
+        v = SchemaValidator(["a.users", "b.users"])
+        v.apply_changes(dropped_tables=["a.users"])
+        assert v.table_exists("users")
+        v.apply_changes(dropped_tables=["b.users"])
+        assert not v.table_exists("users")
+
+    def test_preserve_schema(self):
+        v = SchemaValidator(["public.users"], preserve_schema=True)
+        v.apply_changes(renamed={"public.users": "archive.users"})
+        assert v.table_exists("archive.users")
+        assert not v.table_exists("public.users")
+
+    def test_publishes_new_snapshot(self):
+        v = SchemaValidator(["users", "orders"])
+        old = v._state
+        v.apply_changes(added_tables=["invoices"], dropped_tables=["orders"])
+        assert old.tables == {"users", "orders"}
+        assert v._state.tables == {"users", "invoices"}
+
+    def test_cached_evicts_only_affected_entries(self):
+        v = CachedSchemaValidator(["users", "orders", "products"], cache_size=16)
+        v.validate("SELECT * FROM users")
+        v.validate("SELECT * FROM orders")
+        v.validate("SELECT * FROM invoices")
+
+        v.apply_changes(dropped_tables=["orders"], added_tables=["invoices"])
+        info = v.get_cache_info()
+        assert info["invalidations"] == 2
+        assert info["size"] == 1
+        assert v.validate("SELECT * FROM invoices")[0] is True
+
+    def test_cached_noop_keeps_cache(self):
+        v = CachedSchemaValidator(["users"], cache_size=16)
+        v.validate("SELECT * FROM missing")
+        v.apply_changes(added_tables=["users"], dropped_tables=["missing"])
+        assert v.get_cache_info()["size"] == 1
+
+
+# ---------------------------------------------------------------------------
+# Batch validation
+# ---------------------------------------------------------------------------
+
+class TestValidateMany:
+    """Tests for SchemaValidator.validate_many."""
+
+    QUERIES = [
+        "SELECT * FROM users WHERE id = 1",
+        "SELECT * FROM orders",
+        "SELECT * FROM users WHERE id = 2",
+        "SELECT * FROM ghosts",
+        "SELECT * FROM users WHERE id = 1",
+    ]
+
+    def test_matches_validate_in_order(self):
+        v = SchemaValidator(["users", "orders"])
+        expected = [v.validate(q) for q in self.QUERIES]
+        assert v.validate_many(self.QUERIES) == expected
+
+    def test_deduplicates_fingerprints(self):
+        v = CachedSchemaValidator(["users", "orders"], cache_size=16)
+        v.validate_many(self.QUERIES)
+        assert v.get_cache_info()["misses"] == 3
+
+    def test_process_pool(self):
+        v = CachedSchemaValidator(["users", "orders"], cache_size=16)
+        expected = [v.validate(q) for q in self.QUERIES]
+        assert v.validate_many(self.QUERIES, workers=2, chunksize=1) == expected
+
+    def test_syntax_errors_validated_individually(self):
+        v = SchemaValidator(["users"])
+        queries = [
+            "SELECT * FROM users WHERE (id = 1",
+            "SELECT * FROM users WHERE (id = 2",
+        ]
+        assert v.validate_many(queries) == [v.validate(q) for q in queries]
+
+
+# ---------------------------------------------------------------------------
+# Async validation
+# ---------------------------------------------------------------------------
+
+class TestAsyncValidation:
+    """Tests for CachedSchemaValidator.avalidate / avalidate_many."""
+
+    def test_avalidate_matches_validate(self):
+        v = CachedSchemaValidator(["users"], cache_size=16)
+        result = asyncio.run(v.avalidate("SELECT * FROM ghosts"))
+        assert result == SchemaValidator(["users"]).validate("SELECT * FROM ghosts")
+
+    def test_concurrent_identical_requests_coalesce(self):
+        class SlowValidator(CachedSchemaValidator):
+            def _validate_internal(self, sql_query, dialect=None):
+                time.sleep(0.05)
+                return super()._validate_internal(sql_query, dialect)
+
+        v = SlowValidator(["users", "orders"], cache_size=16)
+        queries = ["SELECT * FROM users"] * 5 + ["SELECT * FROM orders"]
+        results = asyncio.run(v.avalidate_many(queries))
+        assert all(ok for ok, _ in results)
+        info = v.get_cache_info()
+        assert info["misses"] == 2
+        assert info["coalesced"] == 4
+
+    def test_results_shared_with_sync_cache(self):
+        v = CachedSchemaValidator(["users"], cache_size=16)
+        asyncio.run(v.avalidate("SELECT * FROM users"))
+        v.validate("SELECT * FROM users")
+        assert v.get_cache_info()["exact_hits"] == 1
+
+    def test_custom_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            v = CachedSchemaValidator(["users"], cache_size=16, executor=pool)
+            results = asyncio.run(
+                v.avalidate_many(["SELECT * FROM users", "SELECT * FROM x"])
+            )
+        assert [ok for ok, _ in results] == [True, False]